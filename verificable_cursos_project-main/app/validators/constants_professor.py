@@ -1,3 +1,5 @@
+from datetime import time
+
 from pydantic import EmailStr, constr
 
 MIN_NAME_LEN = 1
@@ -7,3 +9,14 @@ NameType = constr(
     strip_whitespace=True, min_length=MIN_NAME_LEN, max_length=MAX_NAME_LEN
 )
 EmailType = EmailStr
+
+# Days a professor can mark as unavailable, with their labels
+UNAVAILABILITY_DAYS = {
+    "Monday": "Lunes",
+    "Tuesday": "Martes",
+    "Wednesday": "Miércoles",
+    "Thursday": "Jueves",
+    "Friday": "Viernes",
+}
+UNAVAILABILITY_START = time(9, 0)
+UNAVAILABILITY_END = time(18, 0)
@@ -1,8 +1,14 @@
-from typing import Optional
+from datetime import time
+from typing import Literal, Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 
-from app.validators.constants_professor import EmailType, NameType
+from app.validators.constants_professor import (
+    UNAVAILABILITY_END,
+    UNAVAILABILITY_START,
+    EmailType,
+    NameType,
+)
 from db import DatabaseConnection
 
 
@@ -27,3 +33,20 @@ class ProfessorSchema(BaseModel):
         if exists:
             raise ValueError(f'El correo "{v}" ya está en uso')
         return v
+
+
+class ProfessorUnavailabilitySchema(BaseModel):
+    dia: Literal["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+    inicio: time
+    fin: time
+
+    @model_validator(mode="after")
+    def within_the_day(cls, m):
+        if m.inicio >= m.fin:
+            raise ValueError("La hora de inicio debe ser anterior a la de término")
+        if m.inicio < UNAVAILABILITY_START or m.fin > UNAVAILABILITY_END:
+            raise ValueError(
+                f"El horario debe estar entre {UNAVAILABILITY_START:%H:%M} y "
+                f"{UNAVAILABILITY_END:%H:%M}"
+            )
+        return m
@@ -0,0 +1,218 @@
+"""Scheduler benchmark on synthetic terms.
+
+Run from the project root, for example:
+
+    python -m benchmarks.scheduler_benchmark --sections 10000 --students 50000
+
+Every phase of a SchedulingManager run (load, feasibility, prepare,
+ordering, placement, improvement, persist, export) is timed against an
+in-memory SQLite stand-in of the database, with the queries issued and the
+sections placed so far."""
+
+import argparse
+import json
+import os
+import resource
+import tempfile
+import time as clock
+import tracemalloc
+from dataclasses import asdict
+from typing import Callable
+
+from benchmarks.synthetic_term import LocalDatabase, TermSpec, generate_term
+from services.schedule_feasibility import check_feasibility
+from services.schedule_local_search import LocalSearch
+from services.scheduling_manager import SchedulingManager
+
+
+def _max_rss_mb() -> float:
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class PhaseRecorder:
+    def __init__(
+        self, database: LocalDatabase, total_sections: int, trace_memory: bool
+    ):
+        self.database = database
+        self.total_sections = total_sections
+        self.trace_memory = trace_memory
+        self.phases: list[dict] = []
+
+    def run(self, name: str, step: Callable, placed: Callable[[], int]):
+        queries = self.database.queries
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        started = clock.perf_counter()
+        result = step()
+        elapsed = clock.perf_counter() - started
+
+        phase = {
+            "phase": name,
+            "seconds": round(elapsed, 4),
+            "queries": self.database.queries - queries,
+            "placed": placed(),
+            "max_rss_mb": round(_max_rss_mb(), 1),
+        }
+        phase["placement_rate"] = (
+            round(phase["placed"] / self.total_sections, 4)
+            if self.total_sections
+            else 0
+        )
+        if self.trace_memory:
+            phase["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 1)
+        self.phases.append(phase)
+        return result
+
+
+def run_benchmark(
+    spec: TermSpec,
+    strategy: str = "greedy",
+    improve_seconds: float = 0,
+    export: bool = True,
+    trace_memory: bool = False,
+) -> dict:
+    started = clock.perf_counter()
+    database = generate_term(spec)
+    generate_seconds = clock.perf_counter() - started
+
+    if trace_memory:
+        tracemalloc.start()
+    manager = SchedulingManager(database)
+    recorder = PhaseRecorder(database, spec.sections, trace_memory)
+
+    def in_memory() -> int:
+        return len(manager.section_schedule)
+
+    def stored() -> int:
+        manager.cur.execute("SELECT COUNT(*) as count FROM classroom_schedule")
+        database.queries -= 1
+        return manager.cur.fetchone()["count"]
+
+    try:
+        recorder.run("load", manager.load_snapshot, in_memory)
+        issues = recorder.run(
+            "feasibility", lambda: check_feasibility(manager), in_memory
+        )
+        sections = recorder.run(
+            "prepare",
+            lambda: manager.prepare_sections(with_flexibility=strategy == "greedy"),
+            in_memory,
+        )
+        recorder.run(
+            "ordering", lambda: manager.order_sections(sections, strategy), in_memory
+        )
+        recorder.run(
+            "placement", lambda: manager.place_sections(sections, strategy), in_memory
+        )
+        if improve_seconds > 0:
+            recorder.run(
+                "improvement",
+                lambda: LocalSearch(manager).run(improve_seconds),
+                in_memory,
+            )
+        recorder.run("persist", manager.persist_schedule, stored)
+        if export:
+            with tempfile.TemporaryDirectory() as directory:
+                recorder.run(
+                    "export",
+                    lambda: manager.export_to_excel(
+                        os.path.join(directory, "horario.xlsx")
+                    ),
+                    stored,
+                )
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+
+    return {
+        "spec": asdict(spec),
+        "strategy": strategy,
+        "generate_seconds": round(generate_seconds, 4),
+        "student_conflicts": manager.student_conflicts,
+        "wasted_seats": manager.wasted_seats,
+        "blocking_issues": sum(1 for issue in issues if issue["blocking"]),
+        "phases": recorder.phases,
+    }
+
+
+def format_report(report: dict) -> str:
+    spec = report["spec"]
+    lines = [
+        f"{spec['sections']} sections, {spec['students']} students, "
+        f"{spec['rooms']} rooms, {spec['professors']} professors, "
+        f"overlap {spec['overlap']}, strategy {report['strategy']}",
+        f"{'phase':<12}{'seconds':>10}{'queries':>9}{'placed':>9}{'rate':>8}{'rss MB':>9}",
+    ]
+    for phase in report["phases"]:
+        lines.append(
+            f"{phase['phase']:<12}{phase['seconds']:>10.3f}{phase['queries']:>9}"
+            f"{phase['placed']:>9}{phase['placement_rate']:>8.1%}{phase['max_rss_mb']:>9.1f}"
+            + (f"  peak {phase['peak_mb']} MB" if "peak_mb" in phase else "")
+        )
+    lines.append(
+        f"student conflicts {report['student_conflicts']}, "
+        f"wasted seats {report['wasted_seats']}, "
+        f"blocking issues {report['blocking_issues']}"
+    )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    defaults = TermSpec()
+    parser.add_argument("--sections", type=int, default=defaults.sections)
+    parser.add_argument("--students", type=int, default=defaults.students)
+    parser.add_argument(
+        "--students-per-section", type=int, default=defaults.students_per_section
+    )
+    parser.add_argument("--overlap", type=float, default=defaults.overlap)
+    parser.add_argument("--rooms", type=int, default=defaults.rooms)
+    parser.add_argument("--professors", type=int, default=defaults.professors)
+    parser.add_argument("--faculties", type=int, default=defaults.faculties)
+    parser.add_argument("--terms", type=int, default=defaults.terms)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument(
+        "--strategy", choices=SchedulingManager.STRATEGIES, default="greedy"
+    )
+    parser.add_argument("--improve-seconds", type=float, default=0)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--no-export", action="store_true")
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="per-phase Python peak memory with tracemalloc (slows the run)",
+    )
+    parser.add_argument("--json", help="write the reports to this file")
+    args = parser.parse_args(argv)
+
+    spec = TermSpec(
+        sections=args.sections,
+        students=args.students,
+        students_per_section=args.students_per_section,
+        overlap=args.overlap,
+        rooms=args.rooms,
+        professors=args.professors,
+        faculties=args.faculties,
+        terms=args.terms,
+        seed=args.seed,
+    )
+    reports = []
+    for _ in range(args.repeat):
+        report = run_benchmark(
+            spec,
+            strategy=args.strategy,
+            improve_seconds=args.improve_seconds,
+            export=not args.no_export,
+            trace_memory=args.trace_memory,
+        )
+        print(format_report(report))
+        reports.append(report)
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(reports, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
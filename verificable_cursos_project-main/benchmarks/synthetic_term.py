@@ -0,0 +1,265 @@
+import random
+import sqlite3
+from dataclasses import dataclass
+from datetime import time
+
+SCHEMA = """
+    CREATE TABLE course (
+        id INTEGER PRIMARY KEY,
+        code TEXT,
+        description TEXT,
+        credits INTEGER
+    );
+    CREATE TABLE course_instance (
+        id INTEGER PRIMARY KEY,
+        course_id INTEGER,
+        semester TEXT,
+        year INTEGER
+    );
+    CREATE TABLE section (
+        id INTEGER PRIMARY KEY,
+        course_instance_id INTEGER,
+        section_number TEXT
+    );
+    CREATE TABLE professor (
+        id INTEGER PRIMARY KEY,
+        name TEXT,
+        email TEXT
+    );
+    CREATE TABLE professor_assignment (
+        id INTEGER PRIMARY KEY,
+        professor_id INTEGER,
+        course_instance_id INTEGER,
+        section_id INTEGER
+    );
+    CREATE TABLE student_assignment (
+        id INTEGER PRIMARY KEY,
+        student_id INTEGER,
+        course_instance_id INTEGER,
+        section_id INTEGER
+    );
+    CREATE TABLE classroom (
+        id INTEGER PRIMARY KEY,
+        name TEXT,
+        capacity INTEGER
+    );
+    CREATE TABLE classroom_schedule (
+        id INTEGER PRIMARY KEY,
+        classroom_id INTEGER,
+        section_id INTEGER,
+        day_of_week TEXT,
+        start_time TEXT,
+        end_time TEXT,
+        year INTEGER,
+        semester TEXT,
+        UNIQUE (classroom_id, year, semester, day_of_week, start_time, end_time)
+    );
+    CREATE TABLE professor_unavailability (
+        id INTEGER PRIMARY KEY,
+        professor_id INTEGER,
+        day_of_week TEXT,
+        start_time TEXT,
+        end_time TEXT
+    );
+    CREATE TABLE schedule_run (
+        id INTEGER PRIMARY KEY,
+        fingerprint TEXT NOT NULL,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE schedule_input_version (
+        id INTEGER PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0
+    );
+    INSERT INTO schedule_input_version (id, version) VALUES (1, 0);
+    CREATE INDEX student_assignment_section ON student_assignment (section_id);
+    CREATE INDEX student_assignment_student ON student_assignment (student_id);
+    CREATE INDEX professor_assignment_section ON professor_assignment (section_id);
+"""
+
+sqlite3.register_adapter(time, lambda value: value.isoformat())
+
+
+@dataclass
+class TermSpec:
+    """Shape of a synthetic term.
+
+    `overlap` is the share of a student's sections drawn from their own
+    cohort (a block of related sections, like one career year) instead of
+    the whole catalogue: higher values mean denser student overlap between
+    a few sections, as in a real curriculum. `faculties` splits sections,
+    professors and students into that many groups sharing only rooms.
+    `terms` spreads the sections over that many consecutive semesters,
+    starting with 2025-01."""
+
+    sections: int = 500
+    students: int = 3000
+    students_per_section: int = 30
+    overlap: float = 0.7
+    rooms: int = 40
+    professors: int = 120
+    faculties: int = 1
+    terms: int = 1
+    seed: int = 0
+
+    @property
+    def sections_per_student(self) -> int:
+        enrollments = self.sections * self.students_per_section
+        return max(1, min(self.sections, round(enrollments / self.students)))
+
+
+class CountingCursor:
+    """sqlite3 cursor with the mysql-connector surface the managers use:
+    %s placeholders, rows as dicts and a shared query counter."""
+
+    def __init__(self, database: "LocalDatabase"):
+        self.database = database
+        self.cursor = database.conn.cursor()
+
+    @staticmethod
+    def _sql(query: str) -> str:
+        return query.replace("%s", "?")
+
+    def _row(self, row):
+        if row is None:
+            return None
+        return {column[0]: value for column, value in zip(self.cursor.description, row)}
+
+    def execute(self, query: str, params=()):
+        self.database.queries += 1
+        self.cursor.execute(self._sql(query), tuple(params))
+
+    def executemany(self, query: str, rows):
+        self.database.queries += 1
+        self.cursor.executemany(self._sql(query), [tuple(row) for row in rows])
+
+    def fetchone(self):
+        return self._row(self.cursor.fetchone())
+
+    def fetchmany(self, size: int = 1):
+        return [self._row(row) for row in self.cursor.fetchmany(size)]
+
+    def fetchall(self):
+        return [self._row(row) for row in self.cursor.fetchall()]
+
+    @property
+    def rowcount(self) -> int:
+        return self.cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self.cursor.lastrowid
+
+    def close(self):
+        self.cursor.close()
+
+
+class LocalDatabase:
+    """In-memory stand-in for DatabaseConnection holding the tables the
+    scheduler reads and writes."""
+
+    def __init__(self, path: str = ":memory:"):
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+        self.queries = 0
+
+    def connect(self) -> CountingCursor:
+        return CountingCursor(self)
+
+    def commit(self):
+        return self.conn.commit()
+
+    def rollback(self):
+        return self.conn.rollback()
+
+    def close(self):
+        return self.conn.close()
+
+
+def _faculty_bounds(total: int, faculties: int, faculty: int) -> tuple[int, int]:
+    """First and last 1-based id of `faculty`'s share of `total` items."""
+    return total * faculty // faculties + 1, total * (faculty + 1) // faculties
+
+
+def _faculty_range(total: int, spec: TermSpec, section: int) -> tuple[int, int]:
+    faculty = (section - 1) * spec.faculties // spec.sections
+    return _faculty_bounds(total, spec.faculties, faculty)
+
+
+def _section_term(spec: TermSpec, section: int) -> tuple[str, int]:
+    """Semester and year of `section`'s course instance."""
+    term = (section - 1) * spec.terms // spec.sections
+    return f"{term % 2 + 1:02d}", 2025 + term // 2
+
+
+def generate_term(spec: TermSpec, database: LocalDatabase = None) -> LocalDatabase:
+    database = database or LocalDatabase()
+    rng = random.Random(spec.seed)
+    conn = database.conn
+
+    base = max(10, spec.students_per_section)
+    capacities = [base // 2, base, base * 3 // 2, base * 2, base * 3]
+    conn.executemany(
+        "INSERT INTO classroom (id, name, capacity) VALUES (?, ?, ?)",
+        [
+            (room, f"Sala {room}", rng.choice(capacities))
+            for room in range(1, spec.rooms + 1)
+        ],
+    )
+    conn.executemany(
+        "INSERT INTO professor (id, name, email) VALUES (?, ?, ?)",
+        [
+            (professor, f"Profesor {professor}", f"profesor{professor}@example.com")
+            for professor in range(1, spec.professors + 1)
+        ],
+    )
+
+    courses = []
+    sections = []
+    assignments = []
+    for section in range(1, spec.sections + 1):
+        courses.append(
+            (section, f"SYN{section:05d}", f"Curso {section}", rng.choice([2, 3]))
+        )
+        sections.append((section, section, "1"))
+        first, last = _faculty_range(spec.professors, spec, section)
+        assignments.append((rng.randint(first, last), section, section))
+    conn.executemany(
+        "INSERT INTO course (id, code, description, credits) VALUES (?, ?, ?, ?)",
+        courses,
+    )
+    conn.executemany(
+        "INSERT INTO course_instance (id, course_id, semester, year) VALUES (?, ?, ?, ?)",
+        [(section, section, *_section_term(spec, section)) for section, *_ in courses],
+    )
+    conn.executemany(
+        "INSERT INTO section (id, course_instance_id, section_number) VALUES (?, ?, ?)",
+        sections,
+    )
+    conn.executemany(
+        "INSERT INTO professor_assignment (professor_id, course_instance_id, section_id) VALUES (?, ?, ?)",
+        assignments,
+    )
+
+    enrollments = []
+    for student in range(1, spec.students + 1):
+        # A student of faculty f only takes sections of faculty f
+        faculty = student % spec.faculties
+        low, high = _faculty_bounds(spec.sections, spec.faculties, faculty)
+        faculty_sections = high - low + 1
+        per_student = min(faculty_sections, spec.sections_per_student)
+        cohort_size = min(faculty_sections, per_student * 4)
+        cohorts = max(1, faculty_sections // cohort_size)
+        first = low + (student // spec.faculties % cohorts) * cohort_size
+        chosen = set()
+        while len(chosen) < per_student:
+            if rng.random() < spec.overlap:
+                chosen.add(rng.randint(first, first + cohort_size - 1))
+            else:
+                chosen.add(rng.randint(low, high))
+        enrollments.extend((student, section, section) for section in chosen)
+    conn.executemany(
+        "INSERT INTO student_assignment (student_id, course_instance_id, section_id) VALUES (?, ?, ?)",
+        enrollments,
+    )
+    conn.commit()
+    return database
@@ -6,21 +6,35 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+def _open_connection():
+    return mysql.connector.connect(
+        host=os.getenv("MYSQL_HOST"),
+        port=os.getenv("MYSQL_PORT"),
+        user=os.getenv("MYSQL_USER"),
+        password=os.getenv("MYSQL_PASSWORD"),
+        database=os.getenv("MYSQL_DATABASE"),
+    )
+
+
 class DatabaseConnection:
     _instance = None
 
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super(DatabaseConnection, cls).__new__(cls) # Aca el error documentado
-            cls._instance.conn = mysql.connector.connect(
-                host=os.getenv("MYSQL_HOST"),
-                port=os.getenv("MYSQL_PORT"),
-                user=os.getenv("MYSQL_USER"),
-                password=os.getenv("MYSQL_PASSWORD"),
-                database=os.getenv("MYSQL_DATABASE"),
-            )
+            cls._instance = super(DatabaseConnection, cls).__new__(
+                cls
+            ) # Aca el error documentado
+            cls._instance.conn = _open_connection()
         return cls._instance
 
+    @classmethod
+    def dedicated(cls) -> "DatabaseConnection":
+        """Connection of its own, outside the shared instance, for work that
+        runs in another thread or outlives the request. Close it when done."""
+        instance = super(DatabaseConnection, cls).__new__(cls)
+        instance.conn = _open_connection()
+        return instance
+
     def connect(self):
         return self.conn.cursor(dictionary=True)
 
@@ -29,3 +43,6 @@ class DatabaseConnection:
 
     def rollback(self):
         return self.conn.rollback()
+
+    def close(self):
+        return self.conn.close()
@@ -116,10 +116,38 @@ CREATE TABLE classroom_schedule (
   day_of_week ENUM('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday') NOT NULL,
   start_time TIME NOT NULL,
   end_time TIME NOT NULL,
+  year INT NOT NULL,
+  semester ENUM('01', '02') NOT NULL,
   FOREIGN KEY (classroom_id) REFERENCES classroom(id) ON DELETE CASCADE,
   FOREIGN KEY (section_id) REFERENCES section(id) ON DELETE CASCADE,
   CHECK (start_time >= '09:00:00' AND end_time <= '18:00:00'),
   CHECK (start_time < end_time),
   CHECK ((start_time >= '14:00:00') OR (end_time <= '13:00:00')),
-  UNIQUE (classroom_id, day_of_week, start_time, end_time)
+  UNIQUE (classroom_id, year, semester, day_of_week, start_time, end_time),
+  INDEX (year, semester)
 );
+
+CREATE TABLE professor_unavailability (
+  id INT AUTO_INCREMENT PRIMARY KEY,
+  professor_id INT NOT NULL,
+  day_of_week ENUM('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday') NOT NULL,
+  start_time TIME NOT NULL,
+  end_time TIME NOT NULL,
+  FOREIGN KEY (professor_id) REFERENCES professor(id) ON DELETE CASCADE,
+  CHECK (start_time >= '09:00:00' AND end_time <= '18:00:00'),
+  CHECK (start_time < end_time),
+  UNIQUE (professor_id, day_of_week, start_time, end_time)
+);
+
+CREATE TABLE schedule_run (
+  id INT AUTO_INCREMENT PRIMARY KEY,
+  fingerprint CHAR(64) NOT NULL,
+  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE schedule_input_version (
+  id INT PRIMARY KEY,
+  version BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO schedule_input_version (id, version) VALUES (1, 0);
@@ -9,6 +9,7 @@ from routes.evaluations import evaluations_bp
 from routes.grades import grades_bp
 from routes.home import home_bp
 from routes.professors import professors_bp
+from routes.schedule import schedule_bp
 from routes.sections import sections_bp
 from routes.students import students_bp
 
@@ -33,6 +34,7 @@ app.register_blueprint(evaluations_bp)
 app.register_blueprint(sections_bp)
 app.register_blueprint(evaluation_instances_bp)
 app.register_blueprint(grades_bp)
+app.register_blueprint(schedule_bp)
 app.config["SECRET_KEY"] = os.getenv("FLASK_SECRET_KEY")
 
 if __name__ == "__main__":
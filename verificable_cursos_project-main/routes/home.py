@@ -5,6 +5,7 @@ from flask import (
     Blueprint,
     current_app,
     flash,
+    jsonify,
     make_response,
     redirect,
     render_template,
@@ -15,12 +16,21 @@ from flask import (
 
 from db import DatabaseConnection
 from populate_db import PopulateDB
-from services.scheduling_manager import SchedulingManager
-from settings import HOME_PAGE
+from services.schedule_export import ScheduleExportCache
+from services.schedule_jobs import schedule_jobs
+from services.schedule_report import recent_reports
+from services.schedule_snapshot import TERMS_SQL, parse_term, term_label
+from settings import HOME_PAGE, SCHEDULE_MAX_IMPROVE_SECONDS, SCHEDULE_MAX_RUNS
 
 home_bp = Blueprint("home", __name__)
 
 
+def schedule_exports() -> ScheduleExportCache:
+    return ScheduleExportCache(
+        os.path.join(current_app.root_path, "static", "schedules")
+    )
+
+
 @home_bp.route("/", methods=["GET"])
 def index_professor():
     db = DatabaseConnection()
@@ -28,58 +38,80 @@ def index_professor():
     cur.execute("SELECT COUNT(*) as count FROM classroom_schedule")
     result = cur.fetchone()
     schedule_empty = result["count"] == 0
-    return render_template(HOME_PAGE, schedule_empty=schedule_empty)
+    cur.execute(TERMS_SQL)
+    terms = [term_label((row["year"], row["semester"])) for row in cur.fetchall()]
+    job = schedule_jobs.current()
+    return render_template(
+        HOME_PAGE,
+        schedule_empty=schedule_empty,
+        terms=terms,
+        max_runs=SCHEDULE_MAX_RUNS,
+        max_improve_seconds=SCHEDULE_MAX_IMPROVE_SECONDS,
+        job=job.to_dict() if job else None,
+    )
 
 
 @home_bp.route("/create_schedule", methods=["POST"])
 def create_schedule(): # Aca el error documentado
+    runs = request.form.get("runs", 1, type=int)
+    improve_seconds = request.form.get("improve_seconds", 0, type=float)
+    term = request.form.get("term")
     try:
-        scheduler = SchedulingManager()
-        scheduler.clear_schedule()
-
-        if not scheduler.generate_schedule():
-            flash(
-                "Error al generar el horario: No se pudieron programar todas las secciones",
-                "danger",
-            )
-            return redirect(url_for("home.index_professor"))
+        term = parse_term(term) if term else None
+    except ValueError as e:
+        flash(f"Error: {e}", "danger")
+        return redirect(url_for("home.index_professor"))
+    params = {
+        "strategy": request.form.get("strategy", "greedy"),
+        # The form limits are only a hint, a crafted POST skips them
+        "runs": min(max(runs, 1), SCHEDULE_MAX_RUNS),
+        "improve_seconds": min(max(improve_seconds, 0), SCHEDULE_MAX_IMPROVE_SECONDS),
+        "profile": "profile" in request.form,
+        "warm_start": "warm_start" in request.form,
+        "term": term,
+    }
+    schedule_jobs.submit(params, schedule_exports())
+    flash("Generación de horario en curso", "info")
+    return redirect(url_for("home.index_professor"))
 
-        excel_path = os.path.join(current_app.root_path, "static", "schedule.xlsx")
-        os.makedirs(os.path.dirname(excel_path), exist_ok=True)
-        scheduler.export_to_excel(excel_path)
 
-        if not os.path.exists(excel_path):
-            flash("Error: No se pudo generar el archivo Excel", "danger")
-            return redirect(url_for("home.index_professor"))
+@home_bp.route("/schedule_status", defaults={"job_id": None})
+@home_bp.route("/schedule_status/<job_id>")
+def schedule_status(job_id):
+    job = schedule_jobs.get(job_id) if job_id else schedule_jobs.current()
+    if not job:
+        return jsonify({"status": "error", "message": "Trabajo no encontrado"}), 404
+    return jsonify(job.to_dict())
 
-        scheduler.db.commit()
-        flash("Horario creado exitosamente", "success")
-        return redirect(url_for("home.index_professor"))
 
-    except Exception as e:
-        flash(f"Error al crear el horario: {str(e)}", "danger")
-        return redirect(url_for("home.index_professor"))
+@home_bp.route("/schedule_reports")
+def schedule_reports():
+    reports = [report.to_dict() for report in reversed(recent_reports())]
+    return jsonify(reports)
 
 
 @home_bp.route("/download_schedule")
 def download_schedule():
     try:
-        excel_path = os.path.join(current_app.root_path, "static", "schedule.xlsx")
-        if not os.path.exists(excel_path):
+        exports = schedule_exports()
+        digest = exports.current()
+        if not digest:
             flash("Error: Archivo no encontrado", "danger")
             return redirect(url_for("home.index_professor"))
 
+        # The file name is the content hash, so it doubles as a strong ETag:
+        # revalidations answer 304 and resumed downloads get 206 ranges.
         response = make_response(
             send_file(
-                excel_path,
+                exports.path(digest),
                 mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                 as_attachment=True,
                 download_name="horario.xlsx",
+                conditional=True,
+                etag=digest,
             )
         )
-        response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
-        response.headers["Pragma"] = "no-cache"
-        response.headers["Expires"] = "0"
+        response.headers["Cache-Control"] = "no-cache"
         return response
     except Exception as e:
         flash(f"Error al descargar el archivo: {str(e)}", "danger")
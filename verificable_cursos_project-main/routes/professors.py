@@ -1,6 +1,8 @@
-from flask import Blueprint, redirect, render_template, request, url_for
+from flask import Blueprint, flash, redirect, render_template, request, url_for
+from pydantic import ValidationError
 
-from app.validators.professor import ProfessorSchema
+from app.validators.constants_professor import UNAVAILABILITY_DAYS
+from app.validators.professor import ProfessorSchema, ProfessorUnavailabilitySchema
 from decorators.courses_decorators import validate_with
 from http_errors import HTTP_BAD_REQUEST
 from services.professor_manager import ProfessorManager
@@ -50,7 +52,45 @@ def professor_detail(professor_id):
     professor = mgr.get_professor_by_id(professor_id)
     if not professor:
         return render_template(ERROR_PAGE, error="Profesor no encontrado"), 404
-    return render_template(DETAIL_PROFESSOR_PAGE, professor=professor)
+    return render_template(
+        DETAIL_PROFESSOR_PAGE,
+        professor=professor,
+        unavailability=mgr.get_unavailability(professor_id),
+        days=UNAVAILABILITY_DAYS,
+    )
+
+
+@professors_bp.route("/<int:professor_id>/unavailability", methods=["POST"])
+def add_unavailability(professor_id):
+    try:
+        window = ProfessorUnavailabilitySchema(
+            dia=request.form.get("dia"),
+            inicio=request.form.get("inicio"),
+            fin=request.form.get("fin"),
+        )
+    except ValidationError as e:
+        flash(
+            "; ".join(
+                error["msg"].removeprefix("Value error, ") for error in e.errors()
+            ),
+            "danger",
+        )
+    else:
+        res = mgr.add_unavailability(
+            professor_id, window.dia, window.inicio, window.fin
+        )
+        if res["status"] != "ok":
+            flash(res["message"], "danger")
+    return redirect(url_for("professors.professor_detail", professor_id=professor_id))
+
+
+@professors_bp.route(
+    "/<int:professor_id>/unavailability/<int:unavailability_id>/delete",
+    methods=["POST"],
+)
+def delete_unavailability(professor_id, unavailability_id):
+    mgr.delete_unavailability(professor_id, unavailability_id)
+    return redirect(url_for("professors.professor_detail", professor_id=professor_id))
 
 
 @professors_bp.route("/<int:professor_id>/edit", methods=["GET", "POST"])
@@ -0,0 +1,68 @@
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+
+from db import DatabaseConnection
+from services.schedule_calendar import schedule_index, to_ics
+from services.schedule_export import (
+    DATA_EXPORT_SQL,
+    STREAM_FORMATS,
+    iter_schedule_rows,
+)
+from services.schedule_snapshot import parse_term, term_label
+from settings import SCHEDULE_TERM_WEEKS
+
+schedule_bp = Blueprint("schedule", __name__, url_prefix="/schedule")
+
+FEED_OWNERS = {"students": "student_id", "professors": "professor_id"}
+
+
+@schedule_bp.route("/export.<fmt>")
+def export_schedule(fmt: str):
+    if fmt not in STREAM_FORMATS:
+        return jsonify({"status": "error", "message": "Formato no soportado"}), 404
+
+    # Rows are fetched in batches while the response is being sent, the
+    # timetable is never held whole in memory. The unbuffered cursor keeps
+    # its connection busy until the last row, so the stream gets one of its
+    # own, closed with the response even when the client disconnects early
+    writer, mimetype = STREAM_FORMATS[fmt]
+    database = DatabaseConnection.dedicated()
+    rows = iter_schedule_rows(database.connect(), sql=DATA_EXPORT_SQL)
+    response = Response(stream_with_context(writer(rows)), mimetype=mimetype)
+    response.call_on_close(database.close)
+    response.headers["Content-Disposition"] = f"attachment; filename=horario.{fmt}"
+    return response
+
+
+@schedule_bp.route("/<owner>/<int:owner_id>.<fmt>")
+def personal_schedule(owner: str, owner_id: int, fmt: str):
+    if owner not in FEED_OWNERS or fmt not in ("ics", "json"):
+        return jsonify({"status": "error", "message": "Calendario no encontrado"}), 404
+
+    index = schedule_index.get(DatabaseConnection().connect())
+    # One term per feed, the current one unless ?term=2025-01 asks otherwise
+    term = index.latest_term()
+    if "term" in request.args:
+        try:
+            term = parse_term(request.args["term"])
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+    if owner == "students":
+        records = index.for_student(owner_id, term)
+    else:
+        records = index.for_professor(owner_id, term)
+    label = term_label(term) if term else None
+
+    if fmt == "json":
+        response = jsonify(
+            {FEED_OWNERS[owner]: owner_id, "term": label, "sections": records}
+        )
+    else:
+        response = Response(
+            to_ics(records, f"Horario {owner_id}", SCHEDULE_TERM_WEEKS),
+            mimetype="text/calendar",
+        )
+    # Events start on the term's first day of classes, so feeds, dates
+    # included, only change when the index is rebuilt
+    response.set_etag(f"{index.version}-{owner}-{owner_id}-{label}-{fmt}")
+    response.headers["Cache-Control"] = "no-cache"
+    return response.make_conditional(request)
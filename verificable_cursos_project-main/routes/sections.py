@@ -6,6 +6,7 @@ from http_errors import HTTP_BAD_REQUEST
 from services.courses_instances_manager import CourseInstanceManager
 from services.courses_manager import CourseManager
 from services.professor_manager import ProfessorManager
+from services.scheduling_manager import SchedulingManager
 from services.section_manager import SectionManager
 from services.student_manager import StudentManager
 from settings import ERROR_PAGE, STATUS_ERROR
@@ -23,6 +24,22 @@ professor_mrg = ProfessorManager()
 student_mrg = StudentManager()
 
 
+def place_in_schedule(section_id: int):
+    """Keep, move or drop the section's stored timetable row and tell the
+    user when it did not simply stay where it was."""
+    res = SchedulingManager().place_section(section_id)
+    if res["status"] == STATUS_ERROR:
+        flash(f"No se pudo actualizar el horario: {res['message']}", "danger")
+    elif section_id in res["unscheduled"]:
+        flash(
+            "La sección quedó fuera del horario: su bloque ya no es válido y no "
+            "hay otro disponible",
+            "warning",
+        )
+    elif section_id in res["moved"]:
+        flash("La sección quedó en un nuevo bloque del horario", "info")
+
+
 @sections_bp.route("/create", methods=["GET", "POST"])
 @validate_with(
     schema=SectionSchema,
@@ -213,8 +230,32 @@ def delete_section(course_id: int, instance_id: int, section_id: int):
     )
 
 
+@sections_bp.route("/<int:section_id>/unschedule", methods=["POST"])
+def unschedule_section(course_id: int, instance_id: int, section_id: int):
+    section = section_mgr.get_section_by_id(section_id)
+    if not section or section["course_instance_id"] != instance_id:
+        return render_template(ERROR_PAGE, error="Sección no encontrada"), 404
+
+    res = SchedulingManager().remove_section(section_id)
+    if res["status"] == STATUS_ERROR:
+        flash(f"No se pudo actualizar el horario: {res['message']}", "danger")
+    else:
+        flash("La sección fue quitada del horario", "info")
+
+    return redirect(
+        url_for(
+            "sections.detail_section",
+            course_id=course_id,
+            instance_id=instance_id,
+            section_id=section_id,
+        )
+    )
+
+
 @sections_bp.route("/<int:section_id>/assign-professor", methods=["GET", "POST"])
-def assign_professor(course_id: int, instance_id: int, section_id: int): # aca el error documentado
+def assign_professor(
+    course_id: int, instance_id: int, section_id: int
+): # aca el error documentado
     course = course_mgr.get_course_by_id(course_id)
     if not course:
         return (
@@ -276,6 +317,8 @@ def assign_professor(course_id: int, instance_id: int, section_id: int): # aca e
                 HTTP_BAD_REQUEST,
             )
 
+        # Keep the stored timetable valid without regenerating it
+        place_in_schedule(section_id)
         return redirect(
             url_for(
                 "sections.detail_section",
@@ -295,7 +338,9 @@ def assign_professor(course_id: int, instance_id: int, section_id: int): # aca e
 
 
 @sections_bp.route("/<int:section_id>/assign_student", methods=["GET", "POST"])
-def assign_student(course_id: int, instance_id: int, section_id: int): # aca el error documentado
+def assign_student(
+    course_id: int, instance_id: int, section_id: int
+): # aca el error documentado
     course = course_mgr.get_course_by_id(course_id)
     if not course:
         return (
@@ -357,6 +402,8 @@ def assign_student(course_id: int, instance_id: int, section_id: int): # aca el
                 HTTP_BAD_REQUEST,
             )
 
+        # Keep the stored timetable valid without regenerating it
+        place_in_schedule(section_id)
         return redirect(
             url_for(
                 "sections.detail_section",
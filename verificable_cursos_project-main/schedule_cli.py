@@ -0,0 +1,211 @@
+"""Offline schedule solver.
+
+Solves a term stored as a JSON snapshot, without database or web server,
+and writes the timetable and the run report as JSON:
+
+    python schedule_cli.py solve term.json --output horario.json
+
+With --warm-start the timetable of an earlier result is kept wherever it
+is still valid, to replay a change against it.
+
+A snapshot of the configured database, to replay or profile a real term:
+
+    python schedule_cli.py dump term.json --term 2025-01
+
+The snapshot holds `sections` (section_id, credits, professor_id),
+`enrollments` (section_id, student_id), `classrooms` (id, capacity) and
+optionally `professors` (id, name) and the hours they cannot teach in
+`unavailability` (professor_id, day_of_week, start_time, end_time)."""
+
+import argparse
+import json
+import sys
+from typing import Optional
+
+from services.schedule_report import RunReport
+from services.schedule_snapshot import ScheduleSnapshot, as_time, parse_term
+from services.schedule_solver import ScheduleSolver
+from services.schedule_term import merge_term_results, solve_term, solve_terms
+
+
+def timetable(assignments: dict[int, dict]) -> list[dict]:
+    rows = [
+        {
+            "section_id": section_id,
+            "classroom_id": entry["classroom_id"],
+            "professor_id": entry["professor_id"],
+            "day_of_week": entry["day"],
+            "start_time": entry["start_time"].strftime("%H:%M"),
+            "end_time": entry["end_time"].strftime("%H:%M"),
+        }
+        for section_id, entry in assignments.items()
+    ]
+    rows.sort(
+        key=lambda row: (
+            ScheduleSolver.DAYS.index(row["day_of_week"]),
+            row["start_time"],
+            row["section_id"],
+        )
+    )
+    return rows
+
+
+def previous_assignments(result: dict) -> dict[int, dict]:
+    """The timetable of an earlier solve result, as a warm start."""
+    return {
+        row["section_id"]: {
+            "classroom_id": row["classroom_id"],
+            "professor_id": row["professor_id"],
+            "day": row["day_of_week"],
+            "start_time": as_time(row["start_time"]),
+            "end_time": as_time(row["end_time"]),
+        }
+        for row in result["timetable"]
+    }
+
+
+def solve_snapshot(
+    data: dict,
+    strategy: str = "greedy",
+    runs: int = 1,
+    seed: int = 0,
+    improve_seconds: float = 0,
+    profile: bool = False,
+    previous: Optional[dict[int, dict]] = None,
+) -> dict:
+    """Solve the snapshot in `data` and return the timetable with its run
+    report, both JSON-ready. A snapshot of several terms is solved one term
+    at a time, like the scheduler does."""
+    report = RunReport(
+        {
+            "strategy": strategy,
+            "runs": runs,
+            "seed": seed,
+            "improve_seconds": improve_seconds,
+            "warm_start": previous is not None,
+        }
+    )
+    with report.phase("load"):
+        snapshot = ScheduleSnapshot.from_dict(data)
+    terms = snapshot.sections_by_term()
+    report.start_capture(profile=profile)
+    try:
+        if len(terms) > 1:
+            with report.phase("placement") as entry:
+                results = solve_terms(
+                    {
+                        term: snapshot.subset(section_ids)
+                        for term, section_ids in terms.items()
+                    },
+                    strategy,
+                    runs,
+                    seed,
+                    improve_seconds,
+                    previous,
+                )
+                entry["terms"] = len(results)
+            assignments, success = merge_term_results(report, results)
+        else:
+            solver = ScheduleSolver(snapshot)
+            solver.run_report = report
+            success = solve_term(
+                solver, report, strategy, runs, seed, improve_seconds, previous
+            )
+            assignments = solver.section_schedule
+    finally:
+        report.stop_capture()
+    report.finish(success, report.error)
+    return {"timetable": timetable(assignments), "report": report.to_dict()}
+
+
+def solve(args) -> int:
+    try:
+        with open(args.snapshot) as file:
+            data = json.load(file)
+        previous = None
+        if args.warm_start:
+            with open(args.warm_start) as file:
+                previous = previous_assignments(json.load(file))
+        result = solve_snapshot(
+            data,
+            strategy=args.strategy,
+            runs=args.runs,
+            seed=args.seed,
+            improve_seconds=args.improve_seconds,
+            profile=args.profile,
+            previous=previous,
+        )
+    except (OSError, ValueError) as e:
+        # json.JSONDecodeError is a ValueError
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    output = open(args.output, "w") if args.output else sys.stdout
+    try:
+        json.dump(result, output, indent=2, ensure_ascii=False)
+        output.write("\n")
+    finally:
+        if args.output:
+            output.close()
+    report = result["report"]
+    print(
+        f"{len(result['timetable'])} sections placed, "
+        f"{len(report['unscheduled'])} unscheduled in {report['seconds']:.3f}s"
+        + (f": {report['error']}" if report["error"] else ""),
+        file=sys.stderr,
+    )
+    return 0 if report["success"] else 1
+
+
+def dump(args) -> int:
+    # Only this command needs the database
+    from services.scheduling_manager import SchedulingManager
+
+    term = parse_term(args.term) if args.term else None
+    data = SchedulingManager().dump_snapshot(term)
+    with open(args.snapshot, "w") as file:
+        json.dump(data, file, ensure_ascii=False)
+    print(
+        f"{len(data['sections'])} sections, {len(data['enrollments'])} "
+        f"enrollments, {len(data['classrooms'])} classrooms",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    solve_parser = commands.add_parser("solve", help="solve a JSON snapshot")
+    solve_parser.add_argument("snapshot")
+    solve_parser.add_argument(
+        "--output", "-o", help="result file, standard output by default"
+    )
+    solve_parser.add_argument(
+        "--strategy", choices=ScheduleSolver.STRATEGIES, default="greedy"
+    )
+    solve_parser.add_argument("--runs", type=int, default=1)
+    solve_parser.add_argument("--seed", type=int, default=0)
+    solve_parser.add_argument("--improve-seconds", type=float, default=0)
+    solve_parser.add_argument(
+        "--profile", action="store_true", help="add cProfile output to the report"
+    )
+    solve_parser.add_argument(
+        "--warm-start", help="earlier result whose timetable is kept where valid"
+    )
+    solve_parser.set_defaults(run=solve)
+
+    dump_parser = commands.add_parser(
+        "dump", help="write the configured database's term as a snapshot"
+    )
+    dump_parser.add_argument("snapshot")
+    dump_parser.add_argument("--term", help="only this term, like 2025-01")
+    dump_parser.set_defaults(run=dump)
+
+    args = parser.parse_args(argv)
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
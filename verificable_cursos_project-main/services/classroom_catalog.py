@@ -0,0 +1,88 @@
+import threading
+from bisect import bisect_left
+from typing import Optional
+from weakref import WeakKeyDictionary
+
+import numpy as np
+
+
+class ClassroomCatalog:
+    """Classrooms kept in ascending capacity order.
+
+    The rooms able to hold a section are always a suffix of the arrays, found
+    with one bisect, and their fit scores are computed over that slice in a
+    single numpy step."""
+
+    def __init__(self, classrooms: list[dict]):
+        self.classrooms = sorted(
+            classrooms, key=lambda room: (room["capacity"], room["id"])
+        )
+        self._capacity_list = [room["capacity"] for room in self.classrooms]
+        self.ids = np.array([room["id"] for room in self.classrooms], dtype=np.int64)
+        self.capacities = np.array(self._capacity_list, dtype=np.int64)
+        self.position: dict[int, int] = {
+            room["id"]: index for index, room in enumerate(self.classrooms)
+        }
+
+    def __len__(self) -> int:
+        return len(self.classrooms)
+
+    def first_fitting(self, student_count: int) -> int:
+        return bisect_left(self._capacity_list, student_count)
+
+    def count_fitting(self, student_count: int) -> int:
+        return len(self.classrooms) - self.first_fitting(student_count)
+
+    def ids_fitting(self, student_count: int) -> list[int]:
+        return self.ids[self.first_fitting(student_count) :].tolist()
+
+    def rank(self, student_count: int, credits: int, usage: np.ndarray) -> list[dict]:
+        """Rooms that fit `student_count`, best fit first: seats left over
+        (counted twice for 2-credit sections, which prefer smaller rooms)
+        plus the bookings each room already has in `usage`."""
+        start = self.first_fitting(student_count)
+        if start == len(self.classrooms):
+            return []
+        capacities = self.capacities[start:]
+        fit_scores = (capacities - student_count) * (2 if credits == 2 else 1)
+        fit_scores += usage[start:]
+        order = np.argsort(fit_scores, kind="stable")
+        return [
+            {"id": room_id, "capacity": capacity, "fit_score": fit_score}
+            for room_id, capacity, fit_score in zip(
+                self.ids[start:][order].tolist(),
+                capacities[order].tolist(),
+                fit_scores[order].tolist(),
+            )
+        ]
+
+
+class ClassroomCatalogCache:
+    """Catalog per database connection, reused across runs until a room is
+    added."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._catalogs: WeakKeyDictionary = WeakKeyDictionary()
+        # Bumped by invalidate so a load racing with it is not cached
+        self._generation = 0
+
+    def get(self, database, cur, sql: str) -> ClassroomCatalog:
+        with self._lock:
+            catalog: Optional[ClassroomCatalog] = self._catalogs.get(database)
+            generation = self._generation
+        if catalog is None:
+            cur.execute(sql)
+            catalog = ClassroomCatalog(cur.fetchall())
+            with self._lock:
+                if generation == self._generation:
+                    self._catalogs[database] = catalog
+        return catalog
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._catalogs.clear()
+
+
+classroom_catalogs = ClassroomCatalogCache()
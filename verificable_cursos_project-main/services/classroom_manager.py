@@ -1,6 +1,7 @@
 from typing import List, Optional
 
 from db import DatabaseConnection
+from services.classroom_catalog import classroom_catalogs
 
 
 class ClassroomManager:
@@ -15,6 +16,7 @@ class ClassroomManager:
                 (name, capacity),
             )
             self.db.commit()
+            classroom_catalogs.invalidate()
             return {"status": "ok", "id": self.cur.lastrowid}
         except Exception as e:
             self.db.rollback()
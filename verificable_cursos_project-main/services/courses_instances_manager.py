@@ -1,6 +1,7 @@
 from mysql.connector import IntegrityError
 
 from db import DatabaseConnection
+from services.schedule_fingerprint import bump_input_version
 
 
 class CourseInstanceManager:
@@ -56,6 +57,8 @@ class CourseInstanceManager:
         if not self.cur.fetchone():
             return {"status": "error", "message": "Instancia no encontrada"}
 
+        # Moves every section of the instance to another term
+        bump_input_version(self.cur)
         return self._execute(
             """
             UPDATE course_instance
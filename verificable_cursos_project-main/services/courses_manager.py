@@ -3,6 +3,7 @@ import json
 from mysql.connector import IntegrityError
 
 from db import DatabaseConnection
+from services.schedule_fingerprint import bump_input_version
 from settings import STATUS_ERROR
 
 
@@ -119,6 +120,7 @@ class CourseManager:
         credits: int,
     ) -> dict:
         req_json = json.dumps(requisites, ensure_ascii=False)
+        bump_input_version(self.cur)
         return self._execute(
             """
             UPDATE course
@@ -183,6 +185,7 @@ class CourseManager:
         return self.cur.fetchone()
 
     def update_section(self, section_id: int, section_number: str) -> dict:
+        bump_input_version(self.cur)
         return self._execute(
             "UPDATE section SET section_number = %s WHERE id = %s",
             (section_number, section_id),
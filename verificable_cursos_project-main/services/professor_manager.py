@@ -1,6 +1,8 @@
 from mysql.connector import IntegrityError
 
 from db import DatabaseConnection
+from services.schedule_calendar import schedule_index
+from services.schedule_fingerprint import bump_input_version
 
 
 class ProfessorManager:
@@ -45,6 +47,7 @@ class ProfessorManager:
         return self.cur.fetchone()
 
     def update_professor(self, professor_id: int, name: str, email: str):
+        bump_input_version(self.cur)
         return self._execute(
             "UPDATE professor SET name = %s, email = %s WHERE id = %s",
             (name, email, professor_id),
@@ -52,7 +55,42 @@ class ProfessorManager:
         )
 
     def delete_professor(self, professor_id: int):
-        return self._execute(
+        result = self._execute(
             "DELETE FROM professor WHERE id = %s",
             (professor_id,),
         )
+        if result["status"] == "ok":
+            schedule_index.invalidate()
+        return result
+
+    def get_unavailability(self, professor_id: int) -> list[dict]:
+        self.cur.execute(
+            """
+            SELECT id, day_of_week, start_time, end_time
+            FROM professor_unavailability
+            WHERE professor_id = %s
+            ORDER BY day_of_week, start_time
+            """,
+            (professor_id,),
+        )
+        return self.cur.fetchall()
+
+    def add_unavailability(
+        self, professor_id: int, day_of_week: str, start_time, end_time
+    ):
+        return self._execute(
+            """
+            INSERT INTO professor_unavailability
+                (professor_id, day_of_week, start_time, end_time)
+            VALUES (%s, %s, %s, %s)
+            """,
+            (professor_id, day_of_week, start_time, end_time),
+            duplicate_message="Este horario ya está marcado como no disponible.",
+            return_id=True,
+        )
+
+    def delete_unavailability(self, professor_id: int, unavailability_id: int):
+        return self._execute(
+            "DELETE FROM professor_unavailability WHERE id = %s AND professor_id = %s",
+            (unavailability_id, professor_id),
+        )
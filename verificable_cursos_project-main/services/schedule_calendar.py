@@ -0,0 +1,162 @@
+import threading
+import uuid
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+from services.schedule_export import DATA_EXPORT_SQL, export_record
+from services.schedule_occupancy import DAYS
+from services.schedule_snapshot import ENROLLMENTS_SQL, Term
+from settings import SCHEDULE_TERM_STARTS
+
+ICS_DAYS = {
+    "Monday": "MO",
+    "Tuesday": "TU",
+    "Wednesday": "WE",
+    "Thursday": "TH",
+    "Friday": "FR",
+}
+
+
+class ScheduleIndex:
+    """Stored timetable indexed by student and by professor.
+
+    Built with two bulk queries, after which every personal feed is a couple
+    of dict lookups instead of a multi-join query per request."""
+
+    def __init__(self, entries: list[dict], enrollments: list[dict]):
+        self.version = uuid.uuid4().hex
+        self.by_section: dict[int, dict] = {
+            row["section_id"]: export_record(row) for row in entries
+        }
+        self.by_professor: dict[int, list[int]] = defaultdict(list)
+        for record in self.by_section.values():
+            self.by_professor[record["professor_id"]].append(record["section_id"])
+        self.by_student: dict[int, list[int]] = defaultdict(list)
+        for row in enrollments:
+            if row["section_id"] in self.by_section:
+                self.by_student[row["student_id"]].append(row["section_id"])
+
+    @classmethod
+    def load(cls, cur) -> "ScheduleIndex":
+        cur.execute(DATA_EXPORT_SQL)
+        entries = cur.fetchall()
+        cur.execute(ENROLLMENTS_SQL.format(where=""))
+        enrollments = cur.fetchall()
+        return cls(entries, enrollments)
+
+    def latest_term(self) -> Optional[Term]:
+        """The current term: the latest one with stored sections."""
+        return max(
+            (
+                (record["year"], record["semester"])
+                for record in self.by_section.values()
+            ),
+            default=None,
+        )
+
+    def _records(self, section_ids: list[int], term: Optional[Term]) -> list[dict]:
+        records = [self.by_section[section_id] for section_id in section_ids]
+        if term is not None:
+            records = [
+                record
+                for record in records
+                if (record["year"], record["semester"]) == term
+            ]
+        records.sort(
+            key=lambda record: (DAYS.index(record["day_of_week"]), record["start_time"])
+        )
+        return records
+
+    def for_student(self, student_id: int, term: Optional[Term] = None) -> list[dict]:
+        return self._records(self.by_student.get(student_id, []), term)
+
+    def for_professor(
+        self, professor_id: int, term: Optional[Term] = None
+    ) -> list[dict]:
+        return self._records(self.by_professor.get(professor_id, []), term)
+
+
+class ScheduleIndexCache:
+    """Process-wide ScheduleIndex, rebuilt on first use after the stored
+    timetable or its enrollments change."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._index: Optional[ScheduleIndex] = None
+        # Bumped by invalidate so a build racing with it is not cached
+        self._generation = 0
+
+    def get(self, cur) -> ScheduleIndex:
+        with self._lock:
+            index = self._index
+            generation = self._generation
+        if index is None:
+            index = ScheduleIndex.load(cur)
+            with self._lock:
+                if generation == self._generation:
+                    self._index = index
+        return index
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._index = None
+
+
+schedule_index = ScheduleIndexCache()
+
+
+def _ics_text(value) -> str:
+    text = str(value)
+    for char in ("\\", ";", ","):
+        text = text.replace(char, f"\\{char}")
+    return text.replace("\n", "\\n")
+
+
+def _ics_datetime(day: date, hour_minute: str) -> str:
+    hour, minute = map(int, hour_minute.split(":"))
+    return f"{day:%Y%m%d}T{hour:02d}{minute:02d}00"
+
+
+def term_start(term: Term) -> date:
+    """First day of classes of `term`."""
+    year, semester = term
+    month, day = SCHEDULE_TERM_STARTS[semester]
+    return date(year, month, day)
+
+
+def to_ics(records: list[dict], name: str, weeks: int) -> str:
+    """Weekly recurring events for `records`, from the first matching
+    weekday on or after the start of each record's term, in floating local
+    time."""
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//Cursos//Horario//ES",
+        "CALSCALE:GREGORIAN",
+        f"X-WR-CALNAME:{_ics_text(name)}",
+    ]
+    for record in records:
+        start = term_start((record["year"], record["semester"]))
+        weekday = DAYS.index(record["day_of_week"])
+        first_day = start + timedelta(days=(weekday - start.weekday()) % 7)
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:section-{record['section_id']}@cursos",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART:{_ics_datetime(first_day, record['start_time'])}",
+            f"DTEND:{_ics_datetime(first_day, record['end_time'])}",
+            f"RRULE:FREQ=WEEKLY;BYDAY={ICS_DAYS[record['day_of_week']]};COUNT={weeks}",
+            "SUMMARY:"
+            + _ics_text(
+                f"{record['course_code']} - {record['course_name']} "
+                f"(Sección {record['section_number']})"
+            ),
+            f"LOCATION:{_ics_text(record['classroom'])}",
+            f"DESCRIPTION:{_ics_text('Profesor: ' + str(record['professor']))}",
+            "END:VEVENT",
+        ]
+    lines.append("END:VCALENDAR")
+    return "\r\n".join(lines) + "\r\n"
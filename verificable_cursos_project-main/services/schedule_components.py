@@ -0,0 +1,228 @@
+import operator
+import os
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from typing import Callable, Optional
+
+from services.schedule_feasibility import BLOCK_HOURS
+from services.schedule_occupancy import DAYS, slot_mask
+from services.schedule_snapshot import ScheduleSnapshot
+from services.schedule_solver import ScheduleSolver
+
+# Morning and afternoon blocks, the unit rooms are shared out in when
+# there are fewer rooms than components
+ROOM_BLOCKS = [
+    (ScheduleSolver.START_TIME, ScheduleSolver.LUNCH_START),
+    (ScheduleSolver.LUNCH_END, ScheduleSolver.END_TIME),
+]
+WEEK_BLOCKS = [
+    slot_mask(day, start_time, end_time)
+    for day in DAYS
+    for start_time, end_time in ROOM_BLOCKS
+]
+WEEK_MASK = reduce(operator.or_, WEEK_BLOCKS)
+
+# Below this many sections starting a process pool costs more than it saves
+PARALLEL_MIN_SECTIONS = 500
+
+# Full snapshot of the worker process, installed once by the pool
+# initializer like in schedule_multistart.
+_snapshot: Optional[ScheduleSnapshot] = None
+
+
+def _init_worker(snapshot: ScheduleSnapshot):
+    global _snapshot
+    _snapshot = snapshot
+
+
+def conflict_components(snapshot: ScheduleSnapshot) -> list[list[int]]:
+    """Section ids grouped into the connected components of the conflict
+    graph, largest first. Sections of different components share no
+    student and no professor, so only rooms tie them together."""
+    parent = {row["section_id"]: row["section_id"] for row in snapshot.sections}
+
+    def find(section_id: int) -> int:
+        while parent[section_id] != section_id:
+            parent[section_id] = parent[parent[section_id]]
+            section_id = parent[section_id]
+        return section_id
+
+    def union(section_id: int, other_id: int):
+        root, other_root = find(section_id), find(other_id)
+        if root != other_root:
+            parent[other_root] = root
+
+    first_by_professor: dict[int, int] = {}
+    for row in snapshot.sections:
+        first = first_by_professor.setdefault(row["professor_id"], row["section_id"])
+        union(first, row["section_id"])
+    for section_ids in snapshot.sections_by_student.values():
+        known = [section_id for section_id in section_ids if section_id in parent]
+        for section_id in known[1:]:
+            union(known[0], section_id)
+
+    groups: dict[int, list[int]] = defaultdict(list)
+    for section_id in parent:
+        groups[find(section_id)].append(section_id)
+    return sorted(groups.values(), key=len, reverse=True)
+
+
+def allocate_rooms(
+    snapshot: ScheduleSnapshot, components: list[list[int]]
+) -> list[dict[int, int]]:
+    """Share the rooms out among `components`, so they can be solved apart
+    without ever booking the same room twice.
+
+    With at least as many rooms as components each room goes to a single
+    component, which keeps its whole week; otherwise rooms are split into
+    half-day blocks. Sections are packed largest first into the smallest
+    fitting room, in a share their component already owns when it has
+    hours left, otherwise in a free one. The shares left over go to the
+    components already using that room, or round robin to all of them.
+    Returns for every component the cells it owns, as a room id: week mask
+    dict."""
+    catalog = snapshot.catalog
+    shares = [WEEK_MASK] if len(catalog) >= len(components) else WEEK_BLOCKS
+    component_of = {
+        section_id: index
+        for index, section_ids in enumerate(components)
+        for section_id in section_ids
+    }
+    owner: list[list[Optional[int]]] = [
+        [None] * len(shares) for _ in range(len(catalog))
+    ]
+    # Every cell of a mask is one hour
+    hours_left = [[share.bit_count() for share in shares] for _ in range(len(catalog))]
+
+    demand = sorted(
+        (
+            (
+                len(snapshot.get_students(row["section_id"])),
+                row["credits"],
+                row["section_id"],
+            )
+            for row in snapshot.sections
+            if row["credits"] <= BLOCK_HOURS
+        ),
+        reverse=True,
+    )
+    for position, (student_count, credits, section_id) in enumerate(demand):
+        component = component_of[section_id]
+        # Rotating the first share spreads a component over the week
+        order = [(position + offset) % len(shares) for offset in range(len(shares))]
+        for room in range(catalog.first_fitting(student_count), len(catalog)):
+            share = next(
+                (
+                    share
+                    for share in order
+                    if owner[room][share] == component
+                    and hours_left[room][share] >= credits
+                ),
+                None,
+            )
+            if share is None:
+                share = next(
+                    (share for share in order if owner[room][share] is None), None
+                )
+            if share is not None:
+                owner[room][share] = component
+                hours_left[room][share] -= credits
+                break
+
+    owned: list[dict[int, int]] = [defaultdict(int) for _ in components]
+    everyone = list(range(len(components)))
+    spare = 0
+    for room, owners in enumerate(owner):
+        users = list(dict.fromkeys(user for user in owners if user is not None))
+        users = users or everyone
+        for share, component in enumerate(owners):
+            if component is None:
+                component = users[spare % len(users)]
+                spare += 1
+            owned[component][catalog.classrooms[room]["id"]] |= shares[share]
+    return [dict(rooms) for rooms in owned]
+
+
+def _solve_component(strategy: str, section_ids: list[int], rooms: dict[int, int]):
+    solver = ScheduleSolver(_snapshot.subset(section_ids, list(rooms)))
+    solver.closed_rooms = {
+        classroom_id: WEEK_MASK & ~mask for classroom_id, mask in rooms.items()
+    }
+    unscheduled = solver.solve(strategy)
+    return {
+        "assignments": solver.section_schedule,
+        "unscheduled": [section["section_id"] for section in unscheduled],
+        "counters": dict(solver.counters),
+    }
+
+
+def solve_components(
+    snapshot: ScheduleSnapshot,
+    strategy: str = "greedy",
+    workers: Optional[int] = None,
+    progress: Optional[Callable[[str, int, int], None]] = None,
+    components: Optional[list[list[int]]] = None,
+) -> dict:
+    """Solve every connected component on its own share of the rooms,
+    across a process pool for large terms, then merge the results.
+
+    Sections a component could not place get a final pass over the merged
+    timetable, where every room cell left unused is open to them. Returns
+    the same fields as solve_multistart plus the component count."""
+    global _snapshot
+    components = components or conflict_components(snapshot)
+    rooms = allocate_rooms(snapshot, components)
+    workers = min(len(components), workers or os.cpu_count() or 1)
+
+    tasks = [
+        (strategy, section_ids, owned)
+        for section_ids, owned in zip(components, rooms)
+        if owned
+    ]
+    results = []
+    if workers > 1 and len(snapshot.sections) >= PARALLEL_MIN_SECTIONS:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(snapshot,)
+        ) as pool:
+            for result in pool.map(_solve_component, *zip(*tasks)):
+                results.append(result)
+                if progress:
+                    progress("components", len(results), len(tasks))
+    else:
+        _snapshot = snapshot
+        try:
+            for task in tasks:
+                results.append(_solve_component(*task))
+                if progress:
+                    progress("components", len(results), len(tasks))
+        finally:
+            _snapshot = None
+
+    assignments: dict[int, dict] = {}
+    counters = Counter()
+    for result in results:
+        assignments.update(result["assignments"])
+        counters.update(result["counters"])
+
+    solver = ScheduleSolver(snapshot)
+    solver.load_assignments(assignments)
+    unscheduled = []
+    if len(assignments) < len(snapshot.credits):
+        leftover = [
+            section
+            for section in solver.prepare_sections(
+                with_flexibility=strategy == "greedy"
+            )
+            if section["section_id"] not in assignments
+        ]
+        solver.order_sections(leftover, strategy)
+        unscheduled = solver.place_sections(leftover, strategy)
+        counters.update(solver.counters)
+    return {
+        "key": solver.result_key(),
+        "assignments": solver.section_schedule,
+        "unscheduled": [section["section_id"] for section in unscheduled],
+        "counters": counters,
+        "components": len(components),
+    }
@@ -0,0 +1,298 @@
+import csv
+import hashlib
+import io
+import json
+import os
+import tempfile
+from itertools import chain
+from typing import Iterable, Iterator, Optional
+
+import xlsxwriter
+
+from services.schedule_snapshot import as_time, term_label
+
+EXPORT_SQL = """
+    SELECT
+        c.code,
+        c.description as course_name,
+        s.section_number,
+        cr.name as classroom,
+        cs.day_of_week,
+        cs.start_time,
+        cs.end_time,
+        p.name as professor,
+        cs.year,
+        cs.semester
+    FROM classroom_schedule cs
+    JOIN section s ON cs.section_id = s.id
+    JOIN course_instance ci ON s.course_instance_id = ci.id
+    JOIN course c ON ci.course_id = c.id
+    JOIN classroom cr ON cs.classroom_id = cr.id
+    JOIN professor_assignment pa ON s.id = pa.section_id
+    JOIN professor p ON pa.professor_id = p.id
+    ORDER BY cs.year, cs.semester, cs.day_of_week, cs.start_time
+"""
+
+# Same join with the ids and raw fields integrations need
+DATA_EXPORT_SQL = """
+    SELECT
+        cs.section_id,
+        c.code as course_code,
+        c.description as course_name,
+        s.section_number,
+        cs.classroom_id,
+        cr.name as classroom,
+        pa.professor_id,
+        p.name as professor,
+        cs.day_of_week,
+        cs.start_time,
+        cs.end_time,
+        cs.year,
+        cs.semester
+    FROM classroom_schedule cs
+    JOIN section s ON cs.section_id = s.id
+    JOIN course_instance ci ON s.course_instance_id = ci.id
+    JOIN course c ON ci.course_id = c.id
+    JOIN classroom cr ON cs.classroom_id = cr.id
+    JOIN professor_assignment pa ON s.id = pa.section_id
+    JOIN professor p ON pa.professor_id = p.id
+    ORDER BY cs.year, cs.semester, cs.day_of_week, cs.start_time, cs.section_id
+"""
+
+EXPORT_FIELDS = [
+    "section_id",
+    "course_code",
+    "course_name",
+    "section_number",
+    "classroom_id",
+    "classroom",
+    "professor_id",
+    "professor",
+    "day_of_week",
+    "start_time",
+    "end_time",
+    "year",
+    "semester",
+]
+
+# Header and column width of every exported column
+EXCEL_COLUMNS = [
+    ("Term", 10),
+    ("Day", 12),
+    ("Time", 20),
+    ("Course", 50),  # Wide enough for the full course name
+    ("Classroom", 15),
+    ("Professor", 25),
+]
+
+FETCH_SIZE = 1000
+
+
+def iter_schedule_rows(
+    cur, size: int = FETCH_SIZE, sql: str = EXPORT_SQL
+) -> Iterator[dict]:
+    """Stream the stored timetable in batches of `size` rows, so with an
+    unbuffered cursor only one batch is held in memory."""
+    cur.execute(sql)
+    while True:
+        rows = cur.fetchmany(size)
+        if not rows:
+            return
+        yield from rows
+
+
+def excel_values(row: dict) -> list[str]:
+    return [
+        term_label((row["year"], row["semester"])),
+        row["day_of_week"],
+        f"{row['start_time']} - {row['end_time']}",
+        f"{row['code']} - {row['course_name']} (Sección {row['section_number']})",
+        row["classroom"],
+        row["professor"],
+    ]
+
+
+def write_excel(rows: Iterable[dict], filename: str) -> int:
+    """Write `rows` to an xlsx file in xlsxwriter constant_memory mode:
+    every row is written once, with its format, and flushed to disk before
+    the next one.
+
+    Returns the number of rows written. Nothing is created when there are
+    none."""
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return 0
+
+    workbook = xlsxwriter.Workbook(filename, {"constant_memory": True})
+    try:
+        worksheet = workbook.add_worksheet("Horario")
+        header_format = workbook.add_format(
+            {
+                "bold": True,
+                "text_wrap": True,
+                "valign": "top",
+                "fg_color": "#D7E4BC",
+                "border": 1,
+            }
+        )
+        cell_format = workbook.add_format(
+            {"text_wrap": True, "valign": "top", "border": 1}
+        )
+
+        for col_num, (header, width) in enumerate(EXCEL_COLUMNS):
+            worksheet.set_column(col_num, col_num, width)
+        worksheet.set_row(0, 30)
+        worksheet.write_row(
+            0, 0, [header for header, _ in EXCEL_COLUMNS], header_format
+        )
+
+        for count, row in enumerate(chain([first], rows), 1):
+            worksheet.set_row(count, 45)
+            worksheet.write_row(count, 0, excel_values(row), cell_format)
+        return count
+    finally:
+        workbook.close()
+
+
+def export_record(row: dict) -> dict:
+    record = {field: row[field] for field in EXPORT_FIELDS}
+    record["start_time"] = as_time(row["start_time"]).strftime("%H:%M")
+    record["end_time"] = as_time(row["end_time"]).strftime("%H:%M")
+    return record
+
+
+def iter_csv(rows: Iterable[dict]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(export_record(row))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # Header only, for an empty timetable
+    yield buffer.getvalue()
+
+
+def iter_ndjson(rows: Iterable[dict]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(export_record(row), ensure_ascii=False) + "\n"
+
+
+def iter_json(rows: Iterable[dict]) -> Iterator[str]:
+    separator = "[\n"
+    for row in rows:
+        yield separator + json.dumps(export_record(row), ensure_ascii=False)
+        separator = ",\n"
+    yield "[]\n" if separator == "[\n" else "\n]\n"
+
+
+# Format name: (row writer, mimetype)
+STREAM_FORMATS = {
+    "csv": (iter_csv, "text/csv"),
+    "json": (iter_json, "application/json"),
+    "ndjson": (iter_ndjson, "application/x-ndjson"),
+}
+
+
+# Part of every digest, bump it when the layout of the workbook changes
+EXPORT_VERSION = "2"
+KEPT_EXPORTS = 5
+
+
+def _hash_rows(rows: Iterable[dict], digest) -> Iterator[dict]:
+    for row in rows:
+        digest.update("\x1f".join(map(str, excel_values(row))).encode())
+        digest.update(b"\n")
+        yield row
+
+
+def _new_digest():
+    digest = hashlib.sha256()
+    digest.update(f"schedule-export-{EXPORT_VERSION}\n".encode())
+    return digest
+
+
+class ScheduleExportCache:
+    """Excel exports stored by a hash of the timetable they contain.
+
+    An unchanged timetable reuses its file, and the digest doubles as the
+    ETag of the download. A `current` pointer file names the latest one."""
+
+    POINTER = "current"
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def path(self, digest: str) -> str:
+        return os.path.join(self.directory, f"{digest}.xlsx")
+
+    def current(self) -> Optional[str]:
+        try:
+            with open(os.path.join(self.directory, self.POINTER)) as file:
+                digest = file.read().strip()
+        except FileNotFoundError:
+            return None
+        return digest if digest and os.path.exists(self.path(digest)) else None
+
+    def export(self, cur) -> tuple[Optional[str], bool]:
+        """Make sure the stored timetable has an export.
+
+        Returns its digest (None for an empty timetable) and whether an
+        existing file was reused."""
+        os.makedirs(self.directory, exist_ok=True)
+        digest = _new_digest()
+        count = sum(1 for _ in _hash_rows(iter_schedule_rows(cur), digest))
+        if not count:
+            self._point_to(None)
+            return None, False
+        if os.path.exists(self.path(digest.hexdigest())):
+            # Fresh mtime so pruning keeps the exports in use
+            os.utime(self.path(digest.hexdigest()))
+            self._point_to(digest.hexdigest())
+            return digest.hexdigest(), True
+
+        # Hash again while writing, the file is named after what it holds
+        digest = _new_digest()
+        handle, temp_path = tempfile.mkstemp(
+            prefix=".", suffix=".xlsx", dir=self.directory
+        )
+        os.close(handle)
+        try:
+            if not write_excel(_hash_rows(iter_schedule_rows(cur), digest), temp_path):
+                self._point_to(None)
+                return None, False
+            os.replace(temp_path, self.path(digest.hexdigest()))
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        self._point_to(digest.hexdigest())
+        self._prune(digest.hexdigest())
+        return digest.hexdigest(), False
+
+    def _point_to(self, digest: Optional[str]):
+        pointer = os.path.join(self.directory, self.POINTER)
+        if digest is None:
+            if os.path.exists(pointer):
+                os.remove(pointer)
+            return
+        temp_pointer = f"{pointer}.tmp"
+        with open(temp_pointer, "w") as file:
+            file.write(digest)
+        os.replace(temp_pointer, pointer)
+
+    def _prune(self, keep: str):
+        exports = sorted(
+            (
+                entry
+                for entry in os.scandir(self.directory)
+                if entry.name.endswith(".xlsx")
+                and not entry.name.startswith(".")
+                and entry.name != f"{keep}.xlsx"
+            ),
+            key=lambda entry: entry.stat().st_mtime,
+            reverse=True,
+        )
+        for entry in exports[KEPT_EXPORTS - 1 :]:
+            os.remove(entry.path)
@@ -0,0 +1,175 @@
+import math
+from collections import defaultdict
+
+from services.schedule_occupancy import slot_mask
+from services.schedule_solver import ScheduleSolver
+
+# Every weekday splits into a morning and an afternoon block around lunch,
+# each BLOCK_HOURS long. A section can never span two blocks.
+BLOCK_HOURS = 4
+
+
+def block_need(credits: int) -> float:
+    """Lower bound of the blocks a section uses: one longer than half a
+    block leaves no room for another such section, two of exactly half a
+    block can share one, shorter ones may fill the leftovers."""
+    if credits * 2 > BLOCK_HOURS:
+        return 1
+    if credits * 2 == BLOCK_HOURS:
+        return 0.5
+    return 0
+
+
+def teaching_blocks(solver: ScheduleSolver) -> list[int]:
+    """Occupancy masks of the morning and afternoon block of every day."""
+    return [
+        slot_mask(day, start_time, end_time)
+        for day in solver.DAYS
+        for start_time, end_time in (
+            (solver.START_TIME, solver.LUNCH_START),
+            (solver.LUNCH_END, solver.END_TIME),
+        )
+    ]
+
+
+def _issue(entity: str, entity_id, reason: str, message: str, blocking: bool) -> dict:
+    return {
+        "entity": entity,
+        "id": entity_id,
+        "reason": reason,
+        "message": message,
+        "blocking": blocking,
+    }
+
+
+def check_feasibility(solver: ScheduleSolver) -> list[dict]:
+    """Necessary conditions for placing every section, checked in linear
+    time before the search.
+
+    Returns one issue per offending section, professor, room capacity tier
+    or student. Blocking issues make a complete timetable impossible;
+    student overloads only mean unavoidable student conflicts, which the
+    solver tolerates."""
+    snapshot = solver._get_snapshot()
+    catalog = snapshot.catalog
+    weekly_blocks = len(solver.DAYS) * 2
+    weekly_hours = weekly_blocks * BLOCK_HOURS
+    issues = []
+    slot_counts: dict[int, int] = {}
+    blocked = snapshot.professor_blocked
+    # Candidate slots outside every professor's unavailable hours, by credits
+    open_slots: dict[tuple[int, int], int] = {}
+
+    professor_load = defaultdict(lambda: [0, 0.0])
+    sizes = []
+    for section in snapshot.sections:
+        section_id, credits = section["section_id"], section["credits"]
+        student_count = len(snapshot.get_students(section_id))
+        if credits not in slot_counts:
+            slot_counts[credits] = len(solver.candidate_slots(credits))
+        if not slot_counts[credits]:
+            issues.append(
+                _issue(
+                    "section",
+                    section_id,
+                    "no_slot",
+                    f"La sección {section_id} tiene {credits} créditos y no cabe "
+                    "en ningún bloque horario",
+                    True,
+                )
+            )
+        if not catalog.count_fitting(student_count):
+            issues.append(
+                _issue(
+                    "section",
+                    section_id,
+                    "no_classroom",
+                    f"La sección {section_id} tiene {student_count} alumnos y "
+                    "ninguna sala tiene capacidad suficiente",
+                    True,
+                )
+            )
+        professor_id = section["professor_id"]
+        if slot_counts[credits] and blocked.get(professor_id):
+            if (professor_id, credits) not in open_slots:
+                open_slots[professor_id, credits] = sum(
+                    1
+                    for slot in solver.candidate_slots(credits)
+                    if not blocked[professor_id] & slot[3]
+                )
+            if not open_slots[professor_id, credits]:
+                issues.append(
+                    _issue(
+                        "section",
+                        section_id,
+                        "professor_unavailable",
+                        f"El profesor {professor_id} no tiene horas disponibles "
+                        f"para los {credits} créditos de la sección {section_id}",
+                        True,
+                    )
+                )
+        load = professor_load[professor_id]
+        load[0] += credits
+        load[1] += block_need(credits)
+        sizes.append((student_count, block_need(credits)))
+
+    week = teaching_blocks(solver)
+    for professor_id, (hours, blocks) in professor_load.items():
+        # Unavailable hours leave fewer hours, and whole blocks, to teach in
+        free = [block & ~blocked.get(professor_id, 0) for block in week]
+        free_hours = sum(block.bit_count() for block in free)
+        free_blocks = sum(1 for block in free if block)
+        if hours > free_hours or math.ceil(blocks) > free_blocks:
+            issues.append(
+                _issue(
+                    "professor",
+                    professor_id,
+                    "professor_overload",
+                    f"El profesor {professor_id} dicta {hours} horas que ocupan "
+                    f"al menos {math.ceil(blocks)} bloques, la semana tiene "
+                    f"{free_blocks} bloques ({free_hours} horas) disponibles",
+                    True,
+                )
+            )
+
+    # Sections with at least n students can only use rooms with at least n
+    # seats: for every size, their blocks must fit in those rooms' weeks.
+    sizes.sort(reverse=True)
+    blocks = 0.0
+    for position, (student_count, need) in enumerate(sizes):
+        blocks += need
+        if position + 1 < len(sizes) and sizes[position + 1][0] == student_count:
+            continue
+        rooms = catalog.count_fitting(student_count)
+        if rooms and math.ceil(blocks) > rooms * weekly_blocks:
+            issues.append(
+                _issue(
+                    "classroom",
+                    student_count,
+                    "rooms_overbooked",
+                    f"Las secciones de {student_count} o más alumnos necesitan al "
+                    f"menos {math.ceil(blocks)} bloques y solo hay {rooms} salas "
+                    f"con esa capacidad ({rooms * weekly_blocks} bloques)",
+                    True,
+                )
+            )
+
+    for student_id, section_ids in snapshot.sections_by_student.items():
+        credits = [
+            snapshot.credits[section_id]
+            for section_id in section_ids
+            if section_id in snapshot.credits
+        ]
+        blocks = math.ceil(sum(block_need(value) for value in credits))
+        if sum(credits) > weekly_hours or blocks > weekly_blocks:
+            issues.append(
+                _issue(
+                    "student",
+                    student_id,
+                    "student_overload",
+                    f"El alumno {student_id} tiene {sum(credits)} horas en "
+                    f"{len(section_ids)} secciones, tendrá topes de horario",
+                    False,
+                )
+            )
+    return issues
@@ -0,0 +1,67 @@
+import hashlib
+import json
+from typing import Optional
+
+# Every table the scheduler and the export read
+INPUT_TABLES = [
+    "course",
+    "course_instance",
+    "section",
+    "professor",
+    "professor_assignment",
+    "student_assignment",
+    "classroom",
+    "professor_unavailability",
+]
+
+
+def _table_counters(table: str) -> str:
+    return (
+        f"(SELECT COUNT(*) FROM {table}) AS {table}_count, "
+        f"(SELECT MAX(id) FROM {table}) AS {table}_last_id"
+    )
+
+
+# Change counters rather than row contents. Inserts and deletes move the row
+# count or the highest id of a table, both read from an index instead of
+# hashing every row. In-place updates move the input version, which the
+# managers bump with bump_input_version. Only one row comes back.
+FINGERPRINT_SQL = "SELECT " + ",\n".join(
+    [_table_counters(table) for table in INPUT_TABLES]
+    + ["(SELECT version FROM schedule_input_version WHERE id = 1) AS input_version"]
+)
+
+BUMP_VERSION_SQL = (
+    "UPDATE schedule_input_version SET version = version + 1 WHERE id = 1"
+)
+
+LAST_RUN_SQL = "SELECT fingerprint FROM schedule_run ORDER BY id DESC LIMIT 1"
+INSERT_RUN_SQL = "INSERT INTO schedule_run (fingerprint) VALUES (%s)"
+FORGET_RUNS_SQL = "DELETE FROM schedule_run"
+
+
+def bump_input_version(cur):
+    """Mark the scheduler inputs as changed by an UPDATE. Run it before the
+    update, in the same transaction, so a rollback undoes both."""
+    cur.execute(BUMP_VERSION_SQL)
+
+
+def input_fingerprint(cur, params: dict) -> str:
+    """Digest of everything a schedule run depends on: the change counters
+    of FINGERPRINT_SQL plus the solver parameters."""
+    cur.execute(FINGERPRINT_SQL)
+    aggregates = cur.fetchone()
+    payload = json.dumps(
+        {
+            "tables": {key: str(value) for key, value in aggregates.items()},
+            "params": params,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def last_fingerprint(cur) -> Optional[str]:
+    cur.execute(LAST_RUN_SQL)
+    row = cur.fetchone()
+    return row["fingerprint"] if row else None
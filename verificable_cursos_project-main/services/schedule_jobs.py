@@ -0,0 +1,147 @@
+import threading
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from db import DatabaseConnection
+from services.schedule_export import ScheduleExportCache
+from services.schedule_report import UNSCHEDULED_REASONS, RunReport
+from services.scheduling_manager import SchedulingManager
+
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+# Finished jobs kept around so late polls still find their result
+JOB_HISTORY = 10
+# Blocking feasibility issues listed in the job status
+ISSUES_SHOWN = 20
+
+
+class ScheduleJob:
+    def __init__(self, params: dict):
+        self.id = uuid.uuid4().hex
+        self.params = params
+        self.status = STATUS_RUNNING
+        self.phase = "queued"
+        self.done = 0
+        self.total = 0
+        self.message = ""
+        self.started_at = datetime.now()
+        self.finished_at: Optional[datetime] = None
+        self.report: Optional[RunReport] = None
+        self._lock = threading.Lock()
+
+    def update(self, phase: str, done: int, total: int):
+        with self._lock:
+            self.phase = phase
+            self.done = done
+            self.total = total
+
+    def finish(self, status: str, message: str):
+        with self._lock:
+            self.status = status
+            self.message = message
+            self.finished_at = datetime.now()
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "id": self.id,
+                "status": self.status,
+                "phase": self.phase,
+                "done": self.done,
+                "total": self.total,
+                "message": self.message,
+                "started_at": self.started_at.isoformat(),
+                "finished_at": (
+                    self.finished_at.isoformat() if self.finished_at else None
+                ),
+                "report_id": self.report.id if self.report else None,
+                "unscheduled": self.report.reason_counts() if self.report else {},
+                "issues": [
+                    issue["message"]
+                    for issue in (self.report.blocking_issues() if self.report else [])
+                ][:ISSUES_SHOWN],
+            }
+
+
+class ScheduleJobManager:
+    """Runs schedule generation in a background thread, one job at a time.
+
+    A submission while a job is running attaches to that job instead of
+    starting a second solve."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._jobs: dict[str, ScheduleJob] = {}
+        self._current: Optional[ScheduleJob] = None
+
+    def submit(self, params: dict, exports: ScheduleExportCache) -> ScheduleJob:
+        with self._lock:
+            if self._current and self._current.status == STATUS_RUNNING:
+                return self._current
+            job = ScheduleJob(params)
+            self._jobs[job.id] = job
+            while len(self._jobs) > JOB_HISTORY:
+                del self._jobs[next(iter(self._jobs))]
+            self._current = job
+
+        thread = threading.Thread(target=self._run, args=(job, exports), daemon=True)
+        thread.start()
+        return job
+
+    def get(self, job_id: str) -> Optional[ScheduleJob]:
+        return self._jobs.get(job_id)
+
+    def current(self) -> Optional[ScheduleJob]:
+        return self._current
+
+    @staticmethod
+    def _failure_message(report: RunReport) -> str:
+        if report.error:
+            return f"Error al generar el horario: {report.error}"
+        reasons = "; ".join(
+            f"{UNSCHEDULED_REASONS[reason]}: {count}"
+            for reason, count in report.reason_counts().items()
+        )
+        return (
+            "Error al generar el horario: No se pudieron programar todas las "
+            f"secciones ({reasons})"
+        )
+
+    def _run(self, job: ScheduleJob, exports: ScheduleExportCache):
+        # The shared connection belongs to the request threads, the job
+        # persists in a transaction of its own
+        database = None
+        try:
+            database = DatabaseConnection.dedicated()
+            scheduler = SchedulingManager(database)
+            report = scheduler.generate_schedule(progress=job.update, **job.params)
+            job.report = report
+            if not report:
+                job.finish(STATUS_FAILED, self._failure_message(report))
+                return
+
+            if report.cached and exports.current():
+                job.finish(
+                    STATUS_DONE, "Sin cambios desde el último horario, se reutilizó"
+                )
+                return
+
+            job.update("export", job.done, job.total)
+            with report.phase("export") as entry:
+                digest, entry["cached"] = exports.export(scheduler.cur)
+            if digest is None:
+                job.finish(STATUS_FAILED, "Error: No se pudo generar el archivo Excel")
+                return
+
+            job.finish(STATUS_DONE, "Horario creado exitosamente")
+        except Exception as e:
+            job.finish(STATUS_FAILED, f"Error al crear el horario: {str(e)}")
+        finally:
+            if database is not None:
+                database.close()
+
+
+schedule_jobs = ScheduleJobManager()
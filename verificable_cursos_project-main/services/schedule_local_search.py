@@ -0,0 +1,261 @@
+import math
+import random
+import time as clock
+from typing import Optional
+
+from services.schedule_occupancy import HOURS_PER_DAY, WEEK_CELLS, mask_cells, slot_mask
+from services.schedule_solver import ScheduleSolver
+
+LUNCH_CELL = 13 - 9
+
+
+class LocalSearch:
+    """Anytime simulated annealing over slot and room moves of a timetable
+    already placed by a ScheduleSolver.
+
+    The cost adds student double bookings, idle hours between a student's
+    classes, an afternoon penalty and rooms used in separate blocks. Every move is scored as a delta over
+    the sections' students, the two room-days and the two slots involved,
+    never over the whole timetable. Moves only pick rooms the section fits
+    in, so capacity needs no cost term."""
+
+    CONFLICT_WEIGHT = 10
+    GAP_WEIGHT = 1
+    AFTERNOON_WEIGHT = 1
+    ROOM_BLOCK_WEIGHT = 2
+
+    START_TEMPERATURE = 5.0
+    END_TEMPERATURE = 0.05
+
+    def __init__(self, solver: ScheduleSolver, seed: Optional[int] = None):
+        self.solver = solver
+        self.snapshot = solver._get_snapshot()
+        self.rng = random.Random(seed)
+        self.sections = list(solver.section_schedule)
+        self.candidates: dict[int, list] = {}
+
+        self.student_cells = [
+            bytearray(WEEK_CELLS) for _ in range(len(self.snapshot.student_index))
+        ]
+        self.room_cells: dict[int, int] = {}
+        for section_id, entry in solver.section_schedule.items():
+            mask = self._mask(entry)
+            self._add_students(section_id, mask, 1)
+            self.room_cells[entry["classroom_id"]] = (
+                self.room_cells.get(entry["classroom_id"], 0) | mask
+            )
+
+    def _mask(self, entry: dict) -> int:
+        return slot_mask(entry["day"], entry["start_time"], entry["end_time"])
+
+    def _students(self, section_id: int) -> list[int]:
+        index = self.snapshot.student_index
+        return [index[student] for student in self.snapshot.get_students(section_id)]
+
+    def _add_students(self, section_id: int, mask: int, step: int):
+        cells = mask_cells(mask)
+        for student in self._students(section_id):
+            row = self.student_cells[student]
+            for cell in cells:
+                row[cell] += step
+
+    def _student_day_cost(self, student: int, day: int) -> int:
+        row = self.student_cells[student]
+        offset = day * HOURS_PER_DAY
+        busy = [hour for hour in range(HOURS_PER_DAY) if row[offset + hour]]
+        if not busy:
+            return 0
+        conflicts = sum(
+            row[offset + hour] - 1 for hour in busy if row[offset + hour] > 1
+        )
+        first, last = busy[0], busy[-1]
+        gaps = last - first + 1 - len(busy)
+        if first < LUNCH_CELL < last:
+            gaps -= 1
+        return self.CONFLICT_WEIGHT * conflicts + self.GAP_WEIGHT * gaps
+
+    def _room_day_cost(self, classroom_id: int, day: int) -> int:
+        """Number of separate blocks of use of a room on a day: rooms filled
+        back to back score better."""
+        cells = self.room_cells.get(classroom_id, 0) >> (day * HOURS_PER_DAY)
+        cells &= (1 << HOURS_PER_DAY) - 1
+        blocks = bin(cells & ~(cells << 1)).count("1")
+        return self.ROOM_BLOCK_WEIGHT * blocks
+
+    def _section_cost(self, section_id: int, entry: dict) -> int:
+        return self.AFTERNOON_WEIGHT if entry["start_time"].hour >= 14 else 0
+
+    def _local_cost(self, section_id: int, entries: list[dict]) -> int:
+        days = {self.solver.DAYS.index(entry["day"]) for entry in entries}
+        rooms = {
+            (entry["classroom_id"], self.solver.DAYS.index(entry["day"]))
+            for entry in entries
+        }
+        cost = sum(
+            self._student_day_cost(student, day)
+            for student in self._students(section_id)
+            for day in days
+        )
+        cost += sum(self._room_day_cost(room, day) for room, day in rooms)
+        return cost
+
+    def total_cost(self) -> int:
+        cost = sum(
+            self._student_day_cost(student, day)
+            for student in range(len(self.student_cells))
+            for day in range(len(self.solver.DAYS))
+        )
+        cost += sum(
+            self._room_day_cost(room, day)
+            for room in self.room_cells
+            for day in range(len(self.solver.DAYS))
+        )
+        cost += sum(
+            self._section_cost(section_id, entry)
+            for section_id, entry in self.solver.section_schedule.items()
+        )
+        return cost
+
+    def _propose(self, section_id: int) -> Optional[dict]:
+        entry = self.solver.section_schedule[section_id]
+        credits = self.snapshot.credits[section_id]
+        if credits not in self.candidates:
+            self.candidates[credits] = self.solver.candidate_slots(credits)
+        day, start_time, end_time, mask = self.rng.choice(self.candidates[credits])
+
+        student_count = len(self.snapshot.get_students(section_id))
+        rooms = self.snapshot.catalog.ids_fitting(student_count)
+        if not rooms:
+            return None
+        if self.rng.random() < 0.5 and entry["classroom_id"] in rooms:
+            classroom_id = entry["classroom_id"]
+        else:
+            classroom_id = self.rng.choice(rooms)
+
+        if (
+            day == entry["day"]
+            and start_time == entry["start_time"]
+            and classroom_id == entry["classroom_id"]
+        ):
+            return None
+        return {
+            "classroom_id": classroom_id,
+            "professor_id": entry["professor_id"],
+            "day": day,
+            "start_time": start_time,
+            "end_time": end_time,
+            "mask": mask,
+        }
+
+    def _is_feasible(self, section_id: int, old: dict, new: dict) -> bool:
+        """Room and professor must be free once the section leaves its
+        current slot, and the student conflict ratio must stay within the
+        solver threshold."""
+        old_mask = self._mask(old)
+        new_mask = new["mask"]
+        room_mask = self.solver.classroom_occupancy.mask(new["classroom_id"])
+        if new["classroom_id"] == old["classroom_id"]:
+            room_mask &= ~old_mask
+        if room_mask & new_mask:
+            return False
+        professor_mask = self.solver.professor_occupancy.mask(new["professor_id"])
+        if professor_mask & ~old_mask & new_mask:
+            return False
+
+        students = self._students(section_id)
+        if not students:
+            return True
+        new_cells = mask_cells(new_mask)
+        old_cells = set(mask_cells(old_mask))
+        conflicts = 0
+        for student in students:
+            row = self.student_cells[student]
+            if any(row[cell] - (cell in old_cells) > 0 for cell in new_cells):
+                conflicts += 1
+        threshold = 0.7 if self.snapshot.credits[section_id] == 2 else 0.5
+        return conflicts / len(students) <= threshold
+
+    def _apply(self, section_id: int, old: dict, new: dict):
+        old_mask = self._mask(old)
+        self._add_students(section_id, old_mask, -1)
+        self._add_students(section_id, new["mask"], 1)
+        self.room_cells[old["classroom_id"]] &= ~old_mask
+        self.room_cells[new["classroom_id"]] = (
+            self.room_cells.get(new["classroom_id"], 0) | new["mask"]
+        )
+        self.solver.classroom_occupancy.release(old["classroom_id"], old_mask)
+        self.solver.classroom_occupancy.book(new["classroom_id"], new["mask"])
+        self.solver.professor_occupancy.release(old["professor_id"], old_mask)
+        self.solver.professor_occupancy.book(new["professor_id"], new["mask"])
+        self.solver.section_schedule[section_id] = {
+            key: value for key, value in new.items() if key != "mask"
+        }
+
+    def move_delta(self, section_id: int, old: dict, new: dict) -> int:
+        entries = [old, new]
+        before = self._local_cost(section_id, entries) + self._section_cost(
+            section_id, old
+        )
+        self._apply(section_id, old, new)
+        after = self._local_cost(section_id, entries) + self._section_cost(
+            section_id, new
+        )
+        return after - before
+
+    def run(self, budget_seconds: float) -> dict:
+        """Improve the solver timetable until the wall-clock budget is spent.
+
+        Annealing accepts worsening moves, so the best timetable seen is
+        what the solver is left with, never worse than the starting one.
+        Returns the cost before and after, and the moves tried and kept."""
+        initial_cost = self.total_cost()
+        stats = {"initial_cost": initial_cost, "moves": 0, "accepted": 0}
+        if not self.sections or budget_seconds <= 0:
+            stats["final_cost"] = initial_cost
+            return stats
+
+        started = clock.monotonic()
+        deadline = started + budget_seconds
+        temperature = self.START_TEMPERATURE
+        cost = best_cost = initial_cost
+        # Copy of the best timetable, taken only when an uphill move leaves
+        # it; None while the current timetable is the best one
+        best: Optional[dict[int, dict]] = None
+        while True:
+            if stats["moves"] % 64 == 0:
+                now = clock.monotonic()
+                if now >= deadline:
+                    break
+                progress = (now - started) / budget_seconds
+                self.solver.report_progress("improvement", int(progress * 100), 100)
+                temperature = (
+                    self.START_TEMPERATURE
+                    * (self.END_TEMPERATURE / self.START_TEMPERATURE) ** progress
+                )
+            stats["moves"] += 1
+
+            section_id = self.rng.choice(self.sections)
+            old = dict(self.solver.section_schedule[section_id])
+            new = self._propose(section_id)
+            if new is None or not self._is_feasible(section_id, old, new):
+                continue
+
+            delta = self.move_delta(section_id, old, new)
+            if delta <= 0 or self.rng.random() < math.exp(-delta / temperature):
+                stats["accepted"] += 1
+                if delta > 0 and best is None:
+                    best = {**self.solver.section_schedule, section_id: old}
+                cost += delta
+                if best is None or cost < best_cost:
+                    best_cost, best = cost, None
+                continue
+
+            old["mask"] = self._mask(old)
+            self._apply(section_id, self.solver.section_schedule[section_id], old)
+
+        stats["final_cost"] = best_cost
+        # Student bitsets cannot be edited in place, rebuild solver state
+        self.solver.load_assignments(
+            best if best is not None else dict(self.solver.section_schedule)
+        )
+        return stats
@@ -0,0 +1,75 @@
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
+
+from services.schedule_snapshot import ScheduleSnapshot
+from services.schedule_solver import ScheduleSolver
+
+# Read-only snapshot of the worker process, installed once by the pool
+# initializer instead of being sent along with every task.
+_snapshot: Optional[ScheduleSnapshot] = None
+
+
+def _init_worker(snapshot: ScheduleSnapshot):
+    global _snapshot
+    _snapshot = snapshot
+
+
+def _solve_seed(strategy: str, seed: Optional[int]) -> dict:
+    solver = ScheduleSolver(_snapshot)
+    unscheduled = solver.solve(strategy, seed=seed)
+    return {
+        "seed": seed,
+        "key": solver.result_key(),
+        "assignments": solver.section_schedule,
+        "unscheduled": [section["section_id"] for section in unscheduled],
+        "counters": dict(solver.counters),
+    }
+
+
+def solve_multistart(
+    snapshot: ScheduleSnapshot,
+    strategy: str = "greedy",
+    runs: int = 4,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    progress: Optional[Callable[[str, int, int], None]] = None,
+) -> dict:
+    """Run `runs` orderings of the same problem across a process pool, or
+    in this process with a single worker, and return the best one according
+    to ScheduleSolver.result_key.
+
+    The first run keeps the strategy's own ordering, so the result is never
+    worse than a single run; the others use seeds seed, seed + 1, ... and
+    can be reproduced exactly."""
+    # Built before the pool starts so forked workers inherit it
+    snapshot.overlap
+    seeds = [None] + list(range(seed, seed + runs - 1))
+    global _snapshot
+    workers = min(runs, workers or os.cpu_count() or 1)
+    results = []
+    if workers > 1:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(snapshot,)
+        ) as pool:
+            for result in pool.map(_solve_seed, [strategy] * runs, seeds):
+                results.append(result)
+                if progress:
+                    progress("multistart", len(results), runs)
+    else:
+        _snapshot = snapshot
+        try:
+            for task_seed in seeds:
+                results.append(_solve_seed(strategy, task_seed))
+                if progress:
+                    progress("multistart", len(results), runs)
+        finally:
+            _snapshot = None
+    # min() keeps the earliest run on ties, i.e. prefers the plain ordering
+    best = min(results, key=lambda result: result["key"])
+    # Work of every run, not only the kept one
+    best["counters"] = sum(
+        (Counter(result["counters"]) for result in results), Counter()
+    )
+    return best
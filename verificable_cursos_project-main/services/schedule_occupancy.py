@@ -0,0 +1,85 @@
+from datetime import time
+from functools import lru_cache
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+FIRST_HOUR = 9
+LAST_HOUR = 18
+HOURS_PER_DAY = LAST_HOUR - FIRST_HOUR
+WEEK_CELLS = len(DAYS) * HOURS_PER_DAY
+
+_DAY_INDEX = {day: index for index, day in enumerate(DAYS)}
+
+
+@lru_cache(maxsize=None)
+def slot_mask(day: str, start_time: time, end_time: time) -> int:
+    """Bitmask of the (day, hour) cells covered by [start_time, end_time).
+
+    Each weekday owns HOURS_PER_DAY consecutive bits, one per hour between
+    FIRST_HOUR and LAST_HOUR, so a whole week fits in WEEK_CELLS bits."""
+    first = max(start_time.hour, FIRST_HOUR)
+    last = min(end_time.hour + (1 if end_time.minute else 0), LAST_HOUR)
+    if last <= first:
+        return 0
+    width = last - first
+    offset = _DAY_INDEX[day] * HOURS_PER_DAY + (first - FIRST_HOUR)
+    return ((1 << width) - 1) << offset
+
+
+@lru_cache(maxsize=None)
+def mask_cells(mask: int) -> tuple[int, ...]:
+    return tuple(cell for cell in range(WEEK_CELLS) if mask >> cell & 1)
+
+
+class OccupancyIndex:
+    """Weekly occupancy of a set of resources (rooms, professors...) stored
+    as one integer bitmask per resource, so conflict tests and bookings are
+    a single bitwise operation."""
+
+    def __init__(self):
+        self._masks: dict[int, int] = {}
+
+    def clear(self):
+        self._masks.clear()
+
+    def mask(self, key: int) -> int:
+        return self._masks.get(key, 0)
+
+    def is_free(self, key: int, mask: int) -> bool:
+        return not self._masks.get(key, 0) & mask
+
+    def book(self, key: int, mask: int):
+        self._masks[key] = self._masks.get(key, 0) | mask
+
+    def release(self, key: int, mask: int):
+        remaining = self._masks.get(key, 0) & ~mask
+        if remaining:
+            self._masks[key] = remaining
+        else:
+            self._masks.pop(key, None)
+
+
+class StudentOccupancy:
+    """Inverted student index: for every (day, hour) cell, the students
+    already booked in it as a bitset over dense student ids.
+
+    Counting how many students of a roster are busy during a slot is then an
+    OR over the slot cells, one AND with the roster and a popcount."""
+
+    def __init__(self):
+        self._cells = [0] * WEEK_CELLS
+
+    def clear(self):
+        self._cells = [0] * WEEK_CELLS
+
+    def book(self, roster: int, mask: int):
+        for cell in mask_cells(mask):
+            self._cells[cell] |= roster
+
+    def busy(self, mask: int) -> int:
+        busy = 0
+        for cell in mask_cells(mask):
+            busy |= self._cells[cell]
+        return busy
+
+    def count_conflicts(self, roster: int, mask: int) -> int:
+        return (self.busy(mask) & roster).bit_count()
@@ -0,0 +1,189 @@
+import cProfile
+import io
+import logging
+import pstats
+import threading
+import time as clock
+import tracemalloc
+import uuid
+from collections import Counter, deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Reports of the most recent runs, newest last
+REPORT_HISTORY = 20
+PROFILE_LINES = 30
+MEMORY_LINES = 10
+
+_reports: deque = deque(maxlen=REPORT_HISTORY)
+_reports_lock = threading.Lock()
+
+UNSCHEDULED_REASONS = {
+    "no_classroom": "Ninguna sala tiene capacidad suficiente",
+    "professor_busy": "El profesor no tiene bloques libres",
+    "student_conflicts": "Demasiados alumnos con tope de horario",
+    "rooms_full": "No quedan salas libres en los bloques posibles",
+}
+
+
+class QueryCountingCursor:
+    """Cursor wrapper counting the statements sent to the database."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.queries = 0
+
+    def execute(self, *args, **kwargs):
+        self.queries += 1
+        return self._cursor.execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        self.queries += 1
+        return self._cursor.executemany(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class RunReport:
+    """Timings, counters and outcome of one schedule generation.
+
+    Truthy when the run succeeded, so it can stand in for the bool that
+    generate_schedule used to return."""
+
+    def __init__(
+        self,
+        params: Optional[dict] = None,
+        cursor: Optional[QueryCountingCursor] = None,
+    ):
+        self.cursor = cursor
+        self.id = uuid.uuid4().hex
+        self.params = params or {}
+        self.started_at = datetime.now()
+        self.finished_at: Optional[datetime] = None
+        self.phases: list[dict] = []
+        self.counters: Counter = Counter()
+        self.unscheduled: dict[int, str] = {}
+        # Findings of the feasibility pre-check
+        self.issues: list[dict] = []
+        # Input fingerprint, and whether the stored result was reused for it
+        self.fingerprint: Optional[str] = None
+        self.cached = False
+        self.success = False
+        self.error: Optional[str] = None
+        self.profile: Optional[str] = None
+        self.memory: Optional[list[str]] = None
+        self._profiler: Optional[cProfile.Profile] = None
+
+    def __bool__(self) -> bool:
+        return self.success
+
+    @contextmanager
+    def phase(self, name: str):
+        cursor = self.cursor
+        queries = cursor.queries if cursor else 0
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        started = clock.perf_counter()
+        entry = {"phase": name}
+        try:
+            yield entry
+        finally:
+            entry["seconds"] = round(clock.perf_counter() - started, 4)
+            entry["queries"] = cursor.queries - queries if cursor else 0
+            if tracemalloc.is_tracing():
+                entry["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 2)
+            self.phases.append(entry)
+            logger.debug("schedule run %s: %s", self.id, entry)
+
+    def start_capture(self, profile: bool = False, trace_memory: bool = False):
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.memory = []
+        if profile:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def stop_capture(self):
+        if self._profiler:
+            self._profiler.disable()
+            output = io.StringIO()
+            pstats.Stats(self._profiler, stream=output).sort_stats(
+                "cumulative"
+            ).print_stats(PROFILE_LINES)
+            self.profile = output.getvalue()
+            self._profiler = None
+        if self.memory is not None and tracemalloc.is_tracing():
+            top = tracemalloc.take_snapshot().statistics("lineno")[:MEMORY_LINES]
+            self.memory = [str(stat) for stat in top]
+            tracemalloc.stop()
+
+    def finish(self, success: bool, error: Optional[str] = None) -> "RunReport":
+        self.success = success
+        self.error = error
+        self.finished_at = datetime.now()
+        record(self)
+        return self
+
+    def seconds(self) -> float:
+        return round(sum(entry["seconds"] for entry in self.phases), 4)
+
+    def blocking_issues(self) -> list[dict]:
+        return [issue for issue in self.issues if issue["blocking"]]
+
+    def reason_counts(self) -> dict[str, int]:
+        return dict(Counter(self.unscheduled.values()))
+
+    def summary(self) -> str:
+        phases = ", ".join(
+            f"{entry['phase']} {entry['seconds']:.3f}s/{entry['queries']}q"
+            for entry in self.phases
+        )
+        outcome = "ok" if self.success else f"failed ({self.error or 'unscheduled'})"
+        if self.cached:
+            outcome = "unchanged, stored result reused"
+        return (
+            f"schedule run {self.id} {outcome} in {self.seconds():.3f}s: {phases}; "
+            f"counters {dict(self.counters)}; unscheduled {self.reason_counts()}; "
+            f"issues {len(self.blocking_issues())} blocking of {len(self.issues)}"
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "params": self.params,
+            "started_at": self.started_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "success": self.success,
+            "error": self.error,
+            "fingerprint": self.fingerprint,
+            "cached": self.cached,
+            "seconds": self.seconds(),
+            "phases": self.phases,
+            "counters": dict(self.counters),
+            "unscheduled": {
+                str(section_id): reason
+                for section_id, reason in self.unscheduled.items()
+            },
+            "issues": self.issues,
+            "profile": self.profile,
+            "memory": self.memory,
+        }
+
+
+def record(report: RunReport):
+    with _reports_lock:
+        if report not in _reports:
+            _reports.append(report)
+    if report.success:
+        logger.info(report.summary())
+    else:
+        logger.warning(report.summary())
+
+
+def recent_reports() -> list[RunReport]:
+    with _reports_lock:
+        return list(_reports)
@@ -0,0 +1,332 @@
+from collections import defaultdict
+from datetime import time, timedelta
+from functools import cached_property
+from typing import Optional
+
+from services.classroom_catalog import ClassroomCatalog
+from services.schedule_occupancy import DAYS, slot_mask
+from services.section_overlap import SectionOverlap
+
+SECTIONS_SQL = """
+    SELECT
+        s.id as section_id,
+        c.credits,
+        pa.professor_id,
+        c.code,
+        s.section_number,
+        c.id as course_id,
+        ci.year,
+        ci.semester
+    FROM section s
+    JOIN course_instance ci ON s.course_instance_id = ci.id
+    JOIN course c ON ci.course_id = c.id
+    JOIN professor_assignment pa ON s.id = pa.section_id
+    {where}
+    ORDER BY c.credits DESC
+"""
+
+ENROLLMENTS_SQL = """
+    SELECT section_id, student_id
+    FROM student_assignment
+    {where}
+    ORDER BY section_id, student_id
+"""
+
+CLASSROOMS_SQL = """
+    SELECT id, capacity
+    FROM classroom
+    ORDER BY capacity ASC, id ASC
+"""
+
+# Terms with at least one section, latest first
+TERMS_SQL = """
+    SELECT DISTINCT ci.year, ci.semester
+    FROM section s
+    JOIN course_instance ci ON s.course_instance_id = ci.id
+    ORDER BY ci.year DESC, ci.semester DESC
+"""
+
+TERM_WHERE = "WHERE ci.year = %s AND ci.semester = %s"
+TERM_ENROLLMENTS_WHERE = (
+    "WHERE section_id IN (SELECT s.id FROM section s "
+    "JOIN course_instance ci ON s.course_instance_id = ci.id "
+    f"{TERM_WHERE})"
+)
+
+UNAVAILABILITY_SQL = """
+    SELECT professor_id, day_of_week, start_time, end_time
+    FROM professor_unavailability
+    ORDER BY professor_id
+"""
+
+PROFESSORS_SQL = """
+    SELECT id, name
+    FROM professor
+    ORDER BY id
+"""
+
+# Layout of the JSON snapshots read by schedule_cli
+SNAPSHOT_VERSION = 1
+SNAPSHOT_FIELDS = {
+    "sections": {"section_id": int, "credits": int, "professor_id": int},
+    "enrollments": {"section_id": int, "student_id": int},
+    "classrooms": {"id": int, "capacity": int},
+    "professors": {"id": int},
+    "unavailability": {
+        "professor_id": int,
+        "day_of_week": str,
+        "start_time": str,
+        "end_time": str,
+    },
+}
+
+
+# A term is a course_instance year and semester, like (2025, "01")
+Term = tuple[int, str]
+
+
+def term_label(term: Term) -> str:
+    year, semester = term
+    return f"{year}-{semester}"
+
+
+def parse_term(text: str) -> Term:
+    """Term from its label, like "2025-01"."""
+    year, _, semester = text.partition("-")
+    if not year.isdigit() or semester not in ("01", "02"):
+        raise ValueError(f"Periodo inválido: {text}")
+    return int(year), semester
+
+
+def as_time(value) -> time:
+    """MySQL returns TIME columns as timedelta, JSON as "HH:MM[:SS]"."""
+    if isinstance(value, timedelta):
+        seconds = int(value.total_seconds())
+        return time(seconds // 3600, seconds % 3600 // 60)
+    if isinstance(value, str):
+        return time.fromisoformat(value)
+    return value
+
+
+class ScheduleSnapshot:
+    """In-memory copy of the data the scheduler reads.
+
+    Loaded once per run with a constant number of bulk queries so the
+    placement loop never goes back to the database."""
+
+    def __init__(
+        self,
+        sections: list[dict],
+        enrollments: list[dict],
+        classrooms: list[dict],
+        catalog: Optional[ClassroomCatalog] = None,
+        unavailability: Optional[list[dict]] = None,
+    ):
+        self.sections = sections
+        self.catalog = catalog or ClassroomCatalog(classrooms)
+        self.classrooms = self.catalog.classrooms
+        self.credits: dict[int, int] = {
+            row["section_id"]: row["credits"] for row in sections
+        }
+        # Snapshots read from JSON may carry no term
+        self.terms: dict[int, Term] = {
+            row["section_id"]: (row.get("year"), row.get("semester"))
+            for row in sections
+        }
+        self.capacities: dict[int, int] = {
+            room["id"]: room["capacity"] for room in classrooms
+        }
+        self.students_by_section: dict[int, list[int]] = defaultdict(list)
+        self.sections_by_student: dict[int, list[int]] = defaultdict(list)
+        for row in enrollments:
+            self.students_by_section[row["section_id"]].append(row["student_id"])
+            self.sections_by_student[row["student_id"]].append(row["section_id"])
+
+        # Dense 0..n-1 positions so each roster can be stored as a bitset
+        self.student_index: dict[int, int] = {
+            student_id: index
+            for index, student_id in enumerate(sorted(self.sections_by_student))
+        }
+        self.roster_masks: dict[int, int] = {
+            section_id: self.students_mask(student_ids)
+            for section_id, student_ids in self.students_by_section.items()
+        }
+
+        # Cells every professor cannot teach in, in the occupancy layout so
+        # the solver books them like any other placement
+        self.unavailability = unavailability or []
+        self.professor_blocked: dict[int, int] = defaultdict(int)
+        for row in self.unavailability:
+            self.professor_blocked[row["professor_id"]] |= slot_mask(
+                row["day_of_week"], as_time(row["start_time"]), as_time(row["end_time"])
+            )
+
+    @classmethod
+    def load(
+        cls,
+        cur,
+        section_ids: Optional[list[int]] = None,
+        catalog: Optional[ClassroomCatalog] = None,
+        term: Optional[Term] = None,
+    ) -> "ScheduleSnapshot":
+        """Load every term, only `term` with its sections and their
+        enrollments, or with `section_ids` only what placing those sections
+        needs: their own rows and every enrollment of their students. A
+        cached `catalog` saves the classroom query."""
+        if section_ids is None and term is not None:
+            cur.execute(SECTIONS_SQL.format(where=TERM_WHERE), term)
+            sections = cur.fetchall()
+            cur.execute(ENROLLMENTS_SQL.format(where=TERM_ENROLLMENTS_WHERE), term)
+            enrollments = cur.fetchall()
+        elif section_ids is None:
+            cur.execute(SECTIONS_SQL.format(where=""))
+            sections = cur.fetchall()
+            cur.execute(ENROLLMENTS_SQL.format(where=""))
+            enrollments = cur.fetchall()
+        else:
+            placeholders = ", ".join(["%s"] * len(section_ids))
+            cur.execute(
+                SECTIONS_SQL.format(where=f"WHERE s.id IN ({placeholders})"),
+                tuple(section_ids),
+            )
+            sections = cur.fetchall()
+            cur.execute(
+                ENROLLMENTS_SQL.format(
+                    where=(
+                        "WHERE student_id IN (SELECT student_id FROM student_assignment "
+                        f"WHERE section_id IN ({placeholders}))"
+                    )
+                ),
+                tuple(section_ids),
+            )
+            enrollments = cur.fetchall()
+        cur.execute(UNAVAILABILITY_SQL)
+        unavailability = cur.fetchall()
+        if catalog is None:
+            cur.execute(CLASSROOMS_SQL)
+            catalog = ClassroomCatalog(cur.fetchall())
+        return cls(sections, enrollments, catalog.classrooms, catalog, unavailability)
+
+    def subset(
+        self, section_ids: list[int], classroom_ids: Optional[list[int]] = None
+    ) -> "ScheduleSnapshot":
+        """Snapshot of `section_ids` and their enrollments only, with all the
+        classrooms or just `classroom_ids`."""
+        wanted = set(section_ids)
+        sections = [row for row in self.sections if row["section_id"] in wanted]
+        enrollments = [
+            {"section_id": section_id, "student_id": student_id}
+            for section_id in dict.fromkeys(section_ids)
+            for student_id in self.get_students(section_id)
+        ]
+        if classroom_ids is None:
+            return ScheduleSnapshot(
+                sections,
+                enrollments,
+                self.classrooms,
+                self.catalog,
+                self.unavailability,
+            )
+        rooms = set(classroom_ids)
+        classrooms = [room for room in self.classrooms if room["id"] in rooms]
+        return ScheduleSnapshot(
+            sections, enrollments, classrooms, unavailability=self.unavailability
+        )
+
+    def to_dict(self, professors: Optional[list[dict]] = None) -> dict:
+        """JSON-ready copy of the snapshot, the input of schedule_cli."""
+        return {
+            "version": SNAPSHOT_VERSION,
+            "sections": self.sections,
+            "enrollments": [
+                {"section_id": section_id, "student_id": student_id}
+                for section_id, student_ids in self.students_by_section.items()
+                for student_id in student_ids
+            ],
+            "classrooms": self.classrooms,
+            "professors": professors or [],
+            "unavailability": [
+                dict(
+                    row,
+                    start_time=as_time(row["start_time"]).strftime("%H:%M"),
+                    end_time=as_time(row["end_time"]).strftime("%H:%M"),
+                )
+                for row in self.unavailability
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ScheduleSnapshot":
+        """Snapshot from the output of to_dict, or a file written by hand.
+
+        Raises ValueError when `data` or one of its lists or rows has the
+        wrong shape, naming the first missing or mistyped field, a section
+        whose professor is not in a non-empty `professors` list, or an
+        unavailability window on an unknown day."""
+        if not isinstance(data, dict):
+            raise ValueError("El snapshot debe ser un objeto JSON")
+        if data.get("version", SNAPSHOT_VERSION) != SNAPSHOT_VERSION:
+            raise ValueError(f"Versión de snapshot no soportada: {data['version']}")
+        for key, fields in SNAPSHOT_FIELDS.items():
+            rows = data.get(key, [])
+            if not isinstance(rows, list):
+                raise ValueError(f"{key} debe ser una lista")
+            for position, row in enumerate(rows):
+                if not isinstance(row, dict):
+                    raise ValueError(f"{key}[{position}] debe ser un objeto")
+                missing = [field for field in fields if field not in row]
+                if missing:
+                    raise ValueError(f"Falta {', '.join(missing)} en {key}[{position}]")
+                for field, kind in fields.items():
+                    # bool is an int subclass, but never a valid id or count
+                    value = row[field]
+                    if not isinstance(value, kind) or isinstance(value, bool):
+                        raise ValueError(
+                            f"{key}[{position}].{field} debe ser "
+                            f"{'un entero' if kind is int else 'un texto'}: {value!r}"
+                        )
+        professor_ids = {row["id"] for row in data.get("professors", [])}
+        for row in data.get("sections", []):
+            if professor_ids and row["professor_id"] not in professor_ids:
+                raise ValueError(
+                    f"La sección {row['section_id']} tiene un profesor "
+                    f"desconocido: {row['professor_id']}"
+                )
+        for position, row in enumerate(data.get("unavailability", [])):
+            if row["day_of_week"] not in DAYS:
+                raise ValueError(
+                    f"Día desconocido en unavailability[{position}]: "
+                    f"{row['day_of_week']}"
+                )
+        return cls(
+            data.get("sections", []),
+            data.get("enrollments", []),
+            data.get("classrooms", []),
+            unavailability=data.get("unavailability", []),
+        )
+
+    def sections_by_term(self) -> dict[Term, list[int]]:
+        """Section ids of every term, latest term first."""
+        groups: dict[Term, list[int]] = defaultdict(list)
+        for section_id, term in self.terms.items():
+            groups[term].append(section_id)
+        return dict(
+            sorted(
+                groups.items(), key=lambda item: tuple(map(str, item[0])), reverse=True
+            )
+        )
+
+    @cached_property
+    def overlap(self) -> SectionOverlap:
+        return SectionOverlap(self.sections_by_student)
+
+    def get_students(self, section_id: int) -> list[int]:
+        return self.students_by_section.get(section_id, [])
+
+    def students_mask(self, student_ids: list[int]) -> int:
+        mask = 0
+        for student_id in student_ids:
+            index = self.student_index.get(student_id)
+            if index is not None:
+                mask |= 1 << index
+        return mask
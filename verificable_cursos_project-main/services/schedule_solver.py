@@ -0,0 +1,889 @@
+import heapq
+import logging
+import random
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from contextlib import nullcontext
+from datetime import datetime, time
+from typing import Callable, Optional
+
+import numpy as np
+
+from services.schedule_occupancy import (
+    OccupancyIndex,
+    StudentOccupancy,
+    mask_cells,
+    slot_mask,
+)
+from services.schedule_report import RunReport
+from services.schedule_snapshot import ScheduleSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduleSolver:
+    """In-memory timetable solver.
+
+    Works only on a ScheduleSnapshot and never touches the database, so it
+    can run in worker processes or outside Flask. SchedulingManager adds
+    loading and persistence on top of it."""
+
+    START_TIME = time(9, 0)  # 9:00
+    END_TIME = time(18, 0)  # 18:00
+    LUNCH_START = time(13, 0)  # 13:00
+    LUNCH_END = time(14, 0)  # 14:00
+    DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+
+    TIME_SLOTS = [
+        time(9, 0),
+        time(10, 0),
+        time(11, 0),
+        time(12, 0),  # Morning
+        time(14, 0),
+        time(15, 0),
+        time(16, 0),
+        time(17, 0),  # Afternoon
+    ]
+
+    STRATEGIES = ("greedy", "dsatur")
+
+    def __init__(self, snapshot: Optional[ScheduleSnapshot] = None):
+        self.section_schedule: dict[int, dict] = {}
+        self.classroom_occupancy = OccupancyIndex()
+        self.professor_occupancy = OccupancyIndex()
+        self.student_occupancy = StudentOccupancy()
+        self.day_usage: Counter = Counter()
+        # Bookings per room, indexed like the snapshot's classroom catalog
+        self.room_usage: Optional[np.ndarray] = None
+        # Section booked in every occupied cell of each room
+        self.room_cells: dict[int, dict[int, int]] = defaultdict(dict)
+        # Room cells this solver may not use, booked again on every reset
+        self.closed_rooms: dict[int, int] = {}
+        # Whether a full slot may be freed by moving a placed section to
+        # another room, see move_to_free_classroom
+        self.move_rooms = True
+        # Room tables by mask and slots known to have no augmenting path,
+        # valid until the next booking changes a room
+        self._room_tables: dict[int, tuple] = {}
+        self._dead_ends: set[tuple[int, frozenset]] = set()
+        self.student_conflicts = 0
+        self.wasted_seats = 0
+        # Work done by the last solve: candidate slots tried, conflict checks
+        self.counters: Counter = Counter()
+        self.snapshot = snapshot
+        self._rng: Optional[random.Random] = None
+        # Called as progress(phase, done, total) while a run advances
+        self.progress: Optional[Callable[[str, int, int], None]] = None
+        # Set while a run is instrumented, solve() then times its phases
+        self.run_report: Optional[RunReport] = None
+
+    def _reset_state(self):
+        self.section_schedule.clear()
+        self.classroom_occupancy.clear()
+        for classroom_id, mask in self.closed_rooms.items():
+            self.classroom_occupancy.book(classroom_id, mask)
+        self.professor_occupancy.clear()
+        # Unavailable hours are booked up front, so every professor check
+        # of the search enforces them at no extra cost
+        if self.snapshot is not None:
+            for professor_id, mask in self.snapshot.professor_blocked.items():
+                self.professor_occupancy.book(professor_id, mask)
+        self.student_occupancy.clear()
+        self.day_usage.clear()
+        self.room_usage = None
+        self.room_cells.clear()
+        self._rooms_changed()
+        self.student_conflicts = 0
+        self.wasted_seats = 0
+
+    def _room_usage(self) -> np.ndarray:
+        size = len(self._get_snapshot().catalog)
+        if self.room_usage is None or len(self.room_usage) != size:
+            self.room_usage = np.zeros(size, dtype=np.int64)
+        return self.room_usage
+
+    def _get_snapshot(self) -> ScheduleSnapshot:
+        if self.snapshot is None:
+            raise ValueError("No hay datos cargados para generar el horario")
+        return self.snapshot
+
+    def solve(self, strategy: str = "greedy", seed: Optional[int] = None) -> list[dict]:
+        """Place every section of the snapshot in memory.
+
+        With a seed the section ordering is randomly perturbed, so several
+        seeded runs explore different orderings. Returns the sections that
+        could not be placed."""
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Estrategia de horario desconocida: {strategy}")
+
+        self._reset_state()
+        self.counters.clear()
+        self._rng = random.Random(seed) if seed is not None else None
+        with self._phase("scoring"):
+            sections = self.prepare_sections(with_flexibility=strategy == "greedy")
+        with self._phase("ordering"):
+            self.order_sections(sections, strategy)
+        with self._phase("placement"):
+            return self.place_sections(sections, strategy)
+
+    def solve_from(
+        self, previous: dict[int, dict], strategy: str = "greedy"
+    ) -> list[dict]:
+        """Place every section of the snapshot starting from the `previous`
+        timetable: each placement that is still valid is kept, biggest
+        sections first, and only the rest is placed around them by
+        `strategy`. Returns the sections that could not be placed."""
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Estrategia de horario desconocida: {strategy}")
+
+        self._reset_state()
+        self.counters.clear()
+        self._rng = None
+        snapshot = self._get_snapshot()
+        with self._phase("warm start"):
+            sections = self.prepare_sections(with_flexibility=False)
+            for section in sorted(sections, key=lambda x: -x["student_count"]):
+                entry = previous.get(section["section_id"])
+                if (
+                    entry is None
+                    or section["section_id"] in self.section_schedule
+                    or not self._fits_current_slot(section, entry)
+                ):
+                    continue
+                self.schedule_section(
+                    section["section_id"],
+                    entry["classroom_id"],
+                    section["professor_id"],
+                    section["student_ids"],
+                    entry["day"],
+                    entry["start_time"],
+                    entry["end_time"],
+                )
+            self.counters["kept"] = len(self.section_schedule)
+        if len(self.section_schedule) == len(snapshot.credits):
+            return []
+
+        with self._phase("scoring"):
+            # Scored against the kept placements
+            pending = self.prepare_sections(
+                with_flexibility=strategy == "greedy",
+                only=set(snapshot.credits) - set(self.section_schedule),
+            )
+        with self._phase("ordering"):
+            self.order_sections(pending, strategy)
+        with self._phase("placement"):
+            return self.place_sections(pending, strategy)
+
+    def _phase(self, name: str):
+        return (
+            self.run_report.phase(name)
+            if self.run_report is not None
+            else nullcontext()
+        )
+
+    def order_sections(self, sections: list[dict], strategy: str):
+        """Sort `sections` in place for strategies with a fixed order.
+        DSATUR picks its next section while placing, so it is left as is."""
+        if strategy != "greedy":
+            return
+        if self._rng:
+            for section in sections:
+                section["flexibility_score"] *= self._jitter()
+
+        # Sort sections by:
+        # 1. Flexibility score (lower first - schedule less flexible sections first)
+        # 2. Conflict score (higher first - schedule sections with more conflicts first)
+        # 3. Credits (higher first)
+        # 4. Student count (higher first)
+        # 5. Conflict degree (more overlapping sections first)
+        sections.sort(
+            key=lambda x: (
+                x["flexibility_score"],
+                -x["conflict_score"],
+                -x["credits"],
+                -x["student_count"],
+                -x["conflict_degree"],
+            )
+        )
+
+    def place_sections(self, sections: list[dict], strategy: str) -> list[dict]:
+        return getattr(self, f"_solve_{strategy}")(sections)
+
+    def unscheduled_reason(self, section: dict) -> str:
+        """Why `section` has no place in the current timetable, one of the
+        keys of schedule_report.UNSCHEDULED_REASONS."""
+        classrooms = self.get_suitable_classrooms(
+            section["section_id"], section["student_count"]
+        )
+        if not classrooms:
+            return "no_classroom"
+        slots = [
+            slot
+            for slot in self.candidate_slots(section["credits"])
+            if self.professor_occupancy.is_free(section["professor_id"], slot[3])
+        ]
+        if not slots:
+            return "professor_busy"
+        slots = [
+            slot
+            for slot in slots
+            if not self.has_student_conflicts(section["section_id"], *slot[:3])
+        ]
+        if not slots:
+            return "student_conflicts"
+        return "rooms_full"
+
+    def prepare_sections(
+        self, with_flexibility: bool = True, only: Optional[set[int]] = None
+    ) -> list[dict]:
+        """Section rows with the scores the strategies sort by, for every
+        section of the snapshot or just the `only` ones."""
+        snapshot = self._get_snapshot()
+        sections = [
+            dict(row)
+            for row in snapshot.sections
+            if only is None or row["section_id"] in only
+        ]
+
+        for section in sections:
+            section["student_ids"] = snapshot.get_students(section["section_id"])
+            section["student_count"] = len(section["student_ids"])
+
+            section["conflict_score"] = self.get_conflict_score(section["section_id"])
+            section["conflict_degree"] = snapshot.overlap.degree(section["section_id"])
+            if not with_flexibility:
+                continue
+
+            # Every suitable room offers the same slots, so count them once
+            possible_slots = 0
+            for day in self.DAYS:
+                for hour in range(9, 18 - section["credits"]):
+                    if hour != 13:  # Skip lunch hour
+                        start_time = time(hour, 0)
+                        end_time = time(hour + section["credits"], 0)
+                        if self.professor_occupancy.is_free(
+                            section["professor_id"],
+                            slot_mask(day, start_time, end_time),
+                        ):
+                            possible_slots += 1
+
+            section["flexibility_score"] = possible_slots * (
+                snapshot.catalog.count_fitting(section["student_count"])
+            )
+
+        return sections
+
+    def load_assignments(self, assignments: dict[int, dict]):
+        """Rebuild the in-memory state from already decided placements, such
+        as the best result of a worker process."""
+        self._reset_state()
+        snapshot = self._get_snapshot()
+        for section_id, entry in assignments.items():
+            self.schedule_section(
+                section_id,
+                entry["classroom_id"],
+                entry["professor_id"],
+                snapshot.get_students(section_id),
+                entry["day"],
+                entry["start_time"],
+                entry["end_time"],
+            )
+
+    def report_progress(self, phase: str, done: int, total: int):
+        if self.progress:
+            self.progress(phase, done, total)
+
+    def result_key(self) -> tuple[int, int, int]:
+        """Ranking of the current solution, lower is better: sections placed,
+        then student conflicts, then seats wasted by oversized rooms."""
+        return (-len(self.section_schedule), self.student_conflicts, self.wasted_seats)
+
+    def _record_error(self, message: str, *args):
+        """Log a failure the search recovers from and count it, so the run
+        report shows it under the `errors` counter."""
+        logger.exception(message, *args)
+        self.counters["errors"] += 1
+
+    def _jitter(self) -> float:
+        return self._rng.uniform(0.75, 1.25) if self._rng else 1
+
+    def _solve_greedy(self, sections: list[dict]) -> list[dict]:
+        unscheduled_sections = []
+        for position, section in enumerate(sections):
+            self.report_progress("placement", position, len(sections))
+            try:
+                suitable_classrooms = self.get_suitable_classrooms(
+                    section["section_id"], section["student_count"]
+                )
+                if not suitable_classrooms:
+                    unscheduled_sections.append(section)
+                    continue
+
+                match = self.find_slot_and_classroom(section, suitable_classrooms)
+                if match is None:
+                    unscheduled_sections.append(section)
+                    continue
+
+                classroom_id, day, start_time, end_time = match
+                self.schedule_section(
+                    section["section_id"],
+                    classroom_id,
+                    section["professor_id"],
+                    section["student_ids"],
+                    day,
+                    start_time,
+                    end_time,
+                )
+            except Exception:
+                self._record_error("Error placing section %s", section["section_id"])
+                unscheduled_sections.append(section)
+
+        return unscheduled_sections
+
+    def find_slot_and_classroom(
+        self, section: dict, suitable_classrooms: list[dict]
+    ) -> Optional[tuple[int, str, time, time]]:
+        """Search the time slots once and match each valid one to the best
+        ranked classroom free for it.
+
+        The first classroom in fit order with a valid slot wins, earliest
+        slot first, the same choice as trying every classroom's slots in
+        turn without repeating the professor and student checks per room.
+        When no fitting room is free in any valid slot, the slot's room
+        matching is augmented instead: see move_to_free_classroom."""
+        best = None
+        valid_slots = []
+        # Every booking counts once for its classroom and once for its
+        # professor, kept up to date by schedule_section.
+        sorted_days = sorted(self.DAYS, key=lambda d: self.day_usage[d])
+        for day in sorted_days:
+            for start_time in self.get_start_times(section["credits"]):
+                end_hour = start_time.hour + section["credits"]
+                if end_hour > 18:
+                    continue
+
+                end_time = time(end_hour)
+                mask = slot_mask(day, start_time, end_time)
+                self.counters["slots_tried"] += 1
+                if not (
+                    self.is_valid_time_slot(start_time, end_time, section["credits"])
+                    and self.professor_occupancy.is_free(section["professor_id"], mask)
+                    and not self.has_student_conflicts(
+                        section["section_id"], day, start_time, end_time
+                    )
+                ):
+                    continue
+
+                valid_slots.append((day, start_time, end_time, mask))
+                # Only a better ranked room than the best so far matters
+                ranked = suitable_classrooms[: best[0] if best else None]
+                for rank, classroom in enumerate(ranked):
+                    if self.classroom_occupancy.is_free(classroom["id"], mask):
+                        best = (rank, classroom["id"], day, start_time, end_time)
+                        break
+                if best and best[0] == 0:
+                    return best[1:]
+
+        if best:
+            return best[1:]
+        moved = self.move_to_free_classroom(valid_slots, suitable_classrooms)
+        if moved is None:
+            return None
+        classroom_id, (day, start_time, end_time, _) = moved
+        return classroom_id, day, start_time, end_time
+
+    def move_to_free_classroom(
+        self, slots: list[tuple[str, time, time, int]], suitable_classrooms: list[dict]
+    ) -> Optional[tuple[int, tuple[str, time, time, int]]]:
+        """Free one of `suitable_classrooms` in one of `slots`, trying the
+        slots in order, by moving placed sections to other rooms at their own
+        times. Returns the freed classroom and its slot.
+
+        For each slot this is a breadth-first search for the shortest
+        augmenting path in the matching of sections to rooms: the section
+        holding a suitable room moves to a room that fits it, which is either
+        free or held by a single section that moves on in turn. A room takes
+        part in a path at most once, and a room held by several sections or
+        by closed cells is a dead end."""
+        if not self.move_rooms:
+            return None
+        rooms = frozenset(classroom["id"] for classroom in suitable_classrooms)
+        first_fitting: dict[int, int] = {}
+        for slot in slots:
+            if (slot[3], rooms) in self._dead_ends:
+                continue
+            path = self._augmenting_path(slot[3], suitable_classrooms, first_fitting)
+            if path is None:
+                self._dead_ends.add((slot[3], rooms))
+                continue
+            classroom_id, moves = path
+            for section_id, target in moves:
+                self.move_section(section_id, target)
+            self.counters["rooms_moved"] += len(moves)
+            return classroom_id, slot
+        return None
+
+    def _room_occupant(self, classroom_id: int, mask: int) -> Optional[int]:
+        """The only section booked in `classroom_id` during `mask`, or None
+        when there are several or a closed cell is in the way."""
+        booked = self.room_cells[classroom_id]
+        occupant = None
+        for cell in mask_cells(self.classroom_occupancy.mask(classroom_id) & mask):
+            section_id = booked.get(cell)
+            # Closed cells are not sections and cannot move
+            if section_id is None or occupant not in (None, section_id):
+                return None
+            occupant = section_id
+        return occupant
+
+    def _rooms_changed(self):
+        self._room_tables.clear()
+        self._dead_ends.clear()
+
+    def _room_table(
+        self, mask: int
+    ) -> tuple[list[int], list[tuple[int, int, int]], dict[int, int]]:
+        """Rooms during `mask`, in catalog order: positions of the free
+        ones, (position, room, section) of those held by a single section,
+        and that section by room."""
+        if mask in self._room_tables:
+            return self._room_tables[mask]
+        free, held = [], []
+        for position, room in enumerate(self._get_snapshot().catalog.classrooms):
+            if self.classroom_occupancy.is_free(room["id"], mask):
+                free.append(position)
+                continue
+            occupant = self._room_occupant(room["id"], mask)
+            if occupant is not None:
+                held.append((position, room["id"], occupant))
+        table = free, held, {room_id: occupant for _, room_id, occupant in held}
+        self._room_tables[mask] = table
+        return table
+
+    def _augmenting_path(
+        self,
+        mask: int,
+        suitable_classrooms: list[dict],
+        first_fitting: dict[int, int],
+    ) -> Optional[tuple[int, list[tuple[int, int]]]]:
+        """Shortest chain of moves freeing one of `suitable_classrooms`
+        during `mask`: the room and its (section, target room) moves, in the
+        order they can be applied."""
+        snapshot = self._get_snapshot()
+        catalog = snapshot.catalog
+        held_by_room = self._room_table(mask)[2]
+        # Search tree: (room, section holding it, index of the parent node)
+        nodes: list[tuple[int, int, Optional[int]]] = []
+        visited = set()
+        for classroom in suitable_classrooms:
+            occupant = held_by_room.get(classroom["id"])
+            if occupant is not None:
+                nodes.append((classroom["id"], occupant, None))
+                visited.add(classroom["id"])
+
+        for index, (_, section_id, _) in enumerate(nodes):
+            entry = self.section_schedule[section_id]
+            section_mask = slot_mask(
+                entry["day"], entry["start_time"], entry["end_time"]
+            )
+            if section_id not in first_fitting:
+                first_fitting[section_id] = catalog.first_fitting(
+                    len(snapshot.get_students(section_id))
+                )
+            first = first_fitting[section_id]
+            free, held, _ = self._room_table(section_mask)
+
+            # The smallest free room that fits ends the path, unless the
+            # path already goes through it
+            candidates = free[bisect_left(free, first) :]
+            if candidates:
+                path_rooms = self._path_rooms(nodes, index)
+                for position in candidates:
+                    target = catalog.classrooms[position]["id"]
+                    if target not in path_rooms:
+                        return self._path_moves(nodes, index, target)
+
+            start = bisect_left(held, (first,))
+            for _, room_id, occupant in held[start:]:
+                if room_id not in visited:
+                    nodes.append((room_id, occupant, index))
+                    visited.add(room_id)
+        return None
+
+    @staticmethod
+    def _path_rooms(
+        nodes: list[tuple[int, int, Optional[int]]], index: Optional[int]
+    ) -> set[int]:
+        rooms = set()
+        while index is not None:
+            classroom_id, _, index = nodes[index]
+            rooms.add(classroom_id)
+        return rooms
+
+    @staticmethod
+    def _path_moves(
+        nodes: list[tuple[int, int, Optional[int]]], index: int, target: int
+    ) -> tuple[int, list[tuple[int, int]]]:
+        """Walk the search tree up from node `index`, whose section moves to
+        the free room `target`; every other section moves into the room the
+        previous move left."""
+        moves = []
+        while index is not None:
+            classroom_id, section_id, index = nodes[index]
+            moves.append((section_id, target))
+            target = classroom_id
+        return target, moves
+
+    def _solve_dsatur(self, sections: list[dict]) -> list[dict]:
+        """DSATUR-style colouring of the section conflict graph.
+
+        Colours are the candidate (day, start, end) slots and two sections are
+        adjacent when they share students or a professor. The next section
+        coloured is always the one whose candidate slots are most blocked by
+        already placed neighbours (its saturation), ties broken by degree.
+        It takes the least conflicting slot that still has a free room."""
+        overlap = self._get_snapshot().overlap
+
+        rows_by_section = defaultdict(list)
+        rows_by_professor = defaultdict(list)
+        for index, section in enumerate(sections):
+            rows_by_section[section["section_id"]].append(index)
+            rows_by_professor[section["professor_id"]].append(index)
+
+        neighbors: list[set[int]] = []
+        candidates: list[list[tuple[str, time, time, int]]] = []
+        for index, section in enumerate(sections):
+            adjacent = set(rows_by_professor[section["professor_id"]])
+            adjacent.update(rows_by_section[section["section_id"]])
+            for other_id in overlap.neighbors(section["section_id"]):
+                adjacent.update(rows_by_section[other_id])
+            adjacent.discard(index)
+            neighbors.append(adjacent)
+            candidates.append(self.candidate_slots(section["credits"]))
+
+        blocked = [0] * len(sections)
+        saturation = [0] * len(sections)
+        placed = [False] * len(sections)
+        degree = [len(adjacent) * self._jitter() for adjacent in neighbors]
+        heap = [
+            (0, -degree[index], -section["student_count"], index)
+            for index, section in enumerate(sections)
+        ]
+        heapq.heapify(heap)
+
+        unscheduled_sections = []
+        done = 0
+        while heap:
+            negative_saturation, _, _, index = heapq.heappop(heap)
+            if placed[index] or -negative_saturation != saturation[index]:
+                continue
+            placed[index] = True
+            done += 1
+            self.report_progress("placement", done, len(sections))
+
+            section = sections[index]
+            mask = self._place_best_slot(section, candidates[index])
+            if mask is None:
+                unscheduled_sections.append(section)
+                continue
+
+            for other in neighbors[index]:
+                if placed[other]:
+                    continue
+                blocked[other] |= mask
+                value = sum(
+                    1 for *_, slot in candidates[other] if slot & blocked[other]
+                )
+                if value != saturation[other]:
+                    saturation[other] = value
+                    heapq.heappush(
+                        heap,
+                        (
+                            -value,
+                            -degree[other],
+                            -sections[other]["student_count"],
+                            other,
+                        ),
+                    )
+
+        return unscheduled_sections
+
+    def _place_best_slot(
+        self, section: dict, candidates: list[tuple[str, time, time, int]]
+    ) -> Optional[int]:
+        suitable_classrooms = self.get_suitable_classrooms(
+            section["section_id"], section["student_count"]
+        )
+        best = None
+        rooms_full = []
+        for day, start_time, end_time, mask in candidates:
+            self.counters["slots_tried"] += 1
+            if not self.professor_occupancy.is_free(section["professor_id"], mask):
+                continue
+            if self.has_student_conflicts(
+                section["section_id"], day, start_time, end_time
+            ):
+                continue
+            classroom = next(
+                (
+                    room
+                    for room in suitable_classrooms
+                    if self.classroom_occupancy.is_free(room["id"], mask)
+                ),
+                None,
+            )
+            if classroom is None:
+                rooms_full.append((day, start_time, end_time, mask))
+                continue
+
+            key = (
+                self.count_student_conflicts(section["section_id"], mask),
+                self.day_usage[day],
+            )
+            if best is None or key < best[0]:
+                best = (key, classroom["id"], day, start_time, end_time, mask)
+
+        if best is None:
+            moved = self.move_to_free_classroom(rooms_full, suitable_classrooms)
+            if moved is None:
+                return None
+            best = (None, moved[0], *moved[1])
+
+        _, classroom_id, day, start_time, end_time, mask = best
+        self.schedule_section(
+            section["section_id"],
+            classroom_id,
+            section["professor_id"],
+            section["student_ids"],
+            day,
+            start_time,
+            end_time,
+        )
+        return mask
+
+    def _fits_current_slot(self, section: dict, entry: dict) -> bool:
+        mask = slot_mask(entry["day"], entry["start_time"], entry["end_time"])
+        return (
+            self.is_valid_time_slot(
+                entry["start_time"], entry["end_time"], section["credits"]
+            )
+            and self._get_snapshot().capacities.get(entry["classroom_id"], 0)
+            >= section["student_count"]
+            and self.classroom_occupancy.is_free(entry["classroom_id"], mask)
+            and self.professor_occupancy.is_free(section["professor_id"], mask)
+            and not self.has_student_conflicts(
+                section["section_id"],
+                entry["day"],
+                entry["start_time"],
+                entry["end_time"],
+            )
+        )
+
+    def get_suitable_classrooms(
+        self, section_id: int, student_count: int
+    ) -> list[dict]:
+        try:
+            snapshot = self._get_snapshot()
+            credits = snapshot.credits[section_id]
+            # Fit score, lower is better: spare seats plus bookings so far
+            return snapshot.catalog.rank(student_count, credits, self._room_usage())
+        except Exception:
+            self._record_error("Error ranking classrooms for section %s", section_id)
+            return []
+
+    def get_start_times(self, credits: int) -> list[time]:
+        if credits == 2:
+            return [
+                time(9),
+                time(10),
+                time(11),
+                time(14),
+                time(15),
+                time(16),
+            ]
+        return [
+            time(9),
+            time(10),
+            time(14),
+            time(15),
+        ]
+
+    def candidate_slots(self, credits: int) -> list[tuple[str, time, time, int]]:
+        """Every valid (day, start, end) slot for a section of `credits`
+        hours, with its occupancy mask."""
+        slots = []
+        for day in self.DAYS:
+            for start_time in self.get_start_times(credits):
+                end_hour = start_time.hour + credits
+                if end_hour > 18:
+                    continue
+                end_time = time(end_hour)
+                if self.is_valid_time_slot(start_time, end_time, credits):
+                    slots.append(
+                        (
+                            day,
+                            start_time,
+                            end_time,
+                            slot_mask(day, start_time, end_time),
+                        )
+                    )
+        return slots
+
+    def is_valid_time_slot(
+        self, start_time: time, end_time: time, credits: int
+    ) -> bool:
+        if start_time < self.START_TIME or end_time > self.END_TIME:
+            return False
+
+        if not (end_time <= self.LUNCH_START or start_time >= self.LUNCH_END):
+            return False
+
+        duration = datetime.combine(datetime.today(), end_time) - datetime.combine(
+            datetime.today(), start_time
+        )
+        if duration.seconds / 3600 != credits:
+            return False
+
+        return True
+
+    def has_classroom_conflict(
+        self, classroom_id: int, day: str, start_time: time, end_time: time
+    ) -> bool:
+        return not self.classroom_occupancy.is_free(
+            classroom_id, slot_mask(day, start_time, end_time)
+        )
+
+    def has_professor_conflict(
+        self, professor_id: int, day: str, start_time: time, end_time: time
+    ) -> bool:
+        return not self.professor_occupancy.is_free(
+            professor_id, slot_mask(day, start_time, end_time)
+        )
+
+    def count_student_conflicts(self, section_id: int, mask: int) -> int:
+        self.counters["conflict_checks"] += 1
+        roster = self._get_snapshot().roster_masks.get(section_id, 0)
+        return self.student_occupancy.count_conflicts(roster, mask)
+
+    def has_student_conflicts(
+        self, section_id: int, day: str, start_time: time, end_time: time
+    ) -> bool:
+        try:
+            snapshot = self._get_snapshot()
+            student_ids = snapshot.get_students(section_id)
+            if not student_ids:
+                return False
+
+            credits = snapshot.credits.get(section_id, 3)
+
+            # For 2-credit courses, we can be more lenient with conflicts
+            conflict_threshold = 0.7 if credits == 2 else 0.5
+
+            conflicts = self.count_student_conflicts(
+                section_id, slot_mask(day, start_time, end_time)
+            )
+            total_students = len(student_ids)
+            conflict_ratio = conflicts / total_students if total_students > 0 else 0
+            return conflict_ratio > conflict_threshold
+
+        except Exception:
+            self._record_error(
+                "Error checking student conflicts of section %s", section_id
+            )
+            return False
+
+    def get_conflict_score(self, section_id: int) -> int:
+        """Calculate a conflict score for a section based on student overlaps.
+        Higher scores mean more potential conflicts."""
+        try:
+            snapshot = self._get_snapshot()
+            credits = snapshot.credits[section_id]
+            overlap_count = snapshot.overlap.max_overlap(section_id)
+
+            # Prioritize 2-credit courses by giving them a lower score
+            if credits == 2:
+                return overlap_count * 0.8  # 20% lower score for 2-credit courses
+            return overlap_count
+
+        except Exception:
+            self._record_error(
+                "Error calculating the conflict score of section %s", section_id
+            )
+            return 0
+
+    def schedule_section(
+        self,
+        section_id: int,
+        classroom_id: int,
+        professor_id: int,
+        student_ids: list[int],
+        day: str,
+        start_time: time,
+        end_time: time,
+    ) -> bool:
+        mask = slot_mask(day, start_time, end_time)
+        snapshot = self._get_snapshot()
+        self.student_conflicts += self.count_student_conflicts(section_id, mask)
+        self.wasted_seats += snapshot.capacities.get(classroom_id, 0) - len(student_ids)
+        self.classroom_occupancy.book(classroom_id, mask)
+        self.professor_occupancy.book(professor_id, mask)
+        self.student_occupancy.book(snapshot.students_mask(student_ids), mask)
+        self.day_usage[day] += 2
+        position = snapshot.catalog.position.get(classroom_id)
+        if position is not None:
+            self._room_usage()[position] += 1
+
+        booked = self.room_cells[classroom_id]
+        for cell in mask_cells(mask):
+            booked[cell] = section_id
+        self._rooms_changed()
+        self.section_schedule[section_id] = {
+            "classroom_id": classroom_id,
+            "professor_id": professor_id,
+            "day": day,
+            "start_time": start_time,
+            "end_time": end_time,
+        }
+        return True
+
+    def move_section(self, section_id: int, classroom_id: int):
+        """Move a placed section to another classroom at the same time."""
+        snapshot = self._get_snapshot()
+        entry = self.section_schedule[section_id]
+        mask = slot_mask(entry["day"], entry["start_time"], entry["end_time"])
+        old_id = entry["classroom_id"]
+
+        self.classroom_occupancy.release(old_id, mask)
+        self.classroom_occupancy.book(classroom_id, mask)
+        old_cells, new_cells = self.room_cells[old_id], self.room_cells[classroom_id]
+        for cell in mask_cells(mask):
+            del old_cells[cell]
+            new_cells[cell] = section_id
+        self._rooms_changed()
+        self.wasted_seats += snapshot.capacities.get(
+            classroom_id, 0
+        ) - snapshot.capacities.get(old_id, 0)
+        usage = self._room_usage()
+        for room_id, change in ((old_id, -1), (classroom_id, 1)):
+            position = snapshot.catalog.position.get(room_id)
+            if position is not None:
+                usage[position] += change
+        self.section_schedule[section_id] = {**entry, "classroom_id": classroom_id}
+
+    def _check_conflicts(
+        self,
+        day: str,
+        start_time: time,
+        end_time: time,
+        classroom_id: int,
+        professor_id: int,
+        student_ids: list[int],
+    ) -> bool:
+        if self.has_classroom_conflict(classroom_id, day, start_time, end_time):
+            return True
+        if self.has_professor_conflict(professor_id, day, start_time, end_time):
+            return True
+        if self.has_student_conflicts(student_ids, day, start_time, end_time):
+            return True
+
+        return False
@@ -0,0 +1,209 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
+
+from services.schedule_components import (
+    PARALLEL_MIN_SECTIONS,
+    conflict_components,
+    solve_components,
+)
+from services.schedule_feasibility import check_feasibility
+from services.schedule_local_search import LocalSearch
+from services.schedule_multistart import solve_multistart
+from services.schedule_report import RunReport
+from services.schedule_snapshot import ScheduleSnapshot, Term, term_label
+from services.schedule_solver import ScheduleSolver
+
+
+def solve_term(
+    solver: ScheduleSolver,
+    report: RunReport,
+    strategy: str = "greedy",
+    runs: int = 1,
+    seed: int = 0,
+    improve_seconds: float = 0,
+    previous: Optional[dict[int, dict]] = None,
+    workers: Optional[int] = None,
+) -> bool:
+    """Everything a schedule run does between loading the snapshot and
+    storing the timetable: feasibility check, placement, reasons for the
+    unscheduled sections and the optional local search, all in memory.
+
+    A `previous` timetable is used as warm start (see
+    ScheduleSolver.solve_from), which is sequential: `runs` and the
+    component split only apply to solves from scratch, across up to
+    `workers` processes. Shared by SchedulingManager and the offline
+    schedule_cli. Returns True when every section was placed; otherwise
+    `report` says why."""
+    snapshot = solver._get_snapshot()
+    if not snapshot.sections:
+        report.error = "No hay secciones para programar"
+        return False
+
+    # Cheap necessary conditions, so an impossible term fails in
+    # milliseconds with the reasons instead of after a full search
+    with report.phase("feasibility"):
+        report.issues = check_feasibility(solver)
+    blocking = report.blocking_issues()
+    if blocking:
+        report.error = (
+            f"El horario no es factible, hay {len(blocking)} problemas por corregir"
+        )
+        return False
+
+    components = conflict_components(snapshot) if runs == 1 and previous is None else []
+    if previous is not None:
+        unscheduled = solver.solve_from(previous, strategy)
+        report.counters.update(solver.counters)
+    elif runs > 1 or len(components) > 1:
+        with report.phase("placement") as entry:
+            if runs > 1:
+                best = solve_multistart(
+                    snapshot,
+                    strategy,
+                    runs=runs,
+                    seed=seed,
+                    workers=workers,
+                    progress=solver.progress,
+                )
+                entry["runs"] = runs
+            else:
+                # Independent parts of the term are solved concurrently
+                best = solve_components(
+                    snapshot,
+                    strategy,
+                    workers=workers,
+                    progress=solver.progress,
+                    components=components,
+                )
+                entry["components"] = best["components"]
+            solver.load_assignments(best["assignments"])
+        report.counters.update(best["counters"])
+        unscheduled_ids = set(best["unscheduled"])
+        unscheduled = [
+            section
+            for section in solver.prepare_sections(with_flexibility=False)
+            if section["section_id"] in unscheduled_ids
+        ]
+    else:
+        unscheduled = solver.solve(strategy)
+        report.counters.update(solver.counters)
+
+    report.counters["sections"] = len(snapshot.sections)
+    report.counters["placed"] = len(solver.section_schedule)
+    report.unscheduled = {
+        section["section_id"]: solver.unscheduled_reason(section)
+        for section in unscheduled
+    }
+    if unscheduled:
+        return False
+
+    if improve_seconds > 0:
+        with report.phase("improvement") as entry:
+            entry.update(LocalSearch(solver, seed=seed).run(improve_seconds))
+    return True
+
+
+def _solve_one_term(
+    snapshot: ScheduleSnapshot,
+    params: dict,
+    previous: Optional[dict[int, dict]],
+    workers: Optional[int] = None,
+) -> dict:
+    report = RunReport(params)
+    solver = ScheduleSolver(snapshot)
+    success = solve_term(
+        solver,
+        report,
+        params["strategy"],
+        params["runs"],
+        params["seed"],
+        params["improve_seconds"],
+        previous,
+        workers,
+    )
+    return {
+        "success": success,
+        "assignments": solver.section_schedule,
+        "report": report,
+    }
+
+
+def solve_terms(
+    snapshots: dict[Term, ScheduleSnapshot],
+    strategy: str = "greedy",
+    runs: int = 1,
+    seed: int = 0,
+    improve_seconds: float = 0,
+    previous: Optional[dict[int, dict]] = None,
+    workers: Optional[int] = None,
+    progress: Optional[Callable[[str, int, int], None]] = None,
+) -> dict[Term, dict]:
+    """Run solve_term on every term, across a process pool when there is
+    more than one worker and enough sections to pay for it.
+
+    Terms share no section, so no room, professor or student booking ties
+    them together. Inside the pool every term is solved in its worker
+    alone, without starting a pool of its own.
+
+    Returns for every term whether all its sections were placed, its
+    assignments and its own RunReport, not recorded."""
+    params = {
+        "strategy": strategy,
+        "runs": runs,
+        "seed": seed,
+        "improve_seconds": improve_seconds,
+    }
+    terms = list(snapshots)
+    tasks = [
+        (
+            snapshots[term],
+            params,
+            (
+                {
+                    section_id: entry
+                    for section_id, entry in previous.items()
+                    if section_id in snapshots[term].credits
+                }
+                if previous is not None
+                else None
+            ),
+        )
+        for term in terms
+    ]
+    workers = min(len(tasks), workers or os.cpu_count() or 1)
+    sections = sum(len(snapshot.sections) for snapshot in snapshots.values())
+
+    results = []
+    if workers > 1 and sections >= PARALLEL_MIN_SECTIONS:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            inner_workers = [1] * len(tasks)
+            for result in pool.map(_solve_one_term, *zip(*tasks), inner_workers):
+                results.append(result)
+                if progress:
+                    progress("terms", len(results), len(tasks))
+    else:
+        for task in tasks:
+            results.append(_solve_one_term(*task))
+            if progress:
+                progress("terms", len(results), len(tasks))
+    return dict(zip(terms, results))
+
+
+def merge_term_results(
+    report: RunReport, results: dict[Term, dict]
+) -> tuple[dict[int, dict], bool]:
+    """Add the per-term reports of solve_terms to `report`. Returns the
+    assignments of all terms and whether every term was placed completely."""
+    assignments: dict[int, dict] = {}
+    success = True
+    for term, result in results.items():
+        term_report = result["report"]
+        report.counters.update(term_report.counters)
+        report.unscheduled.update(term_report.unscheduled)
+        report.issues.extend(term_report.issues)
+        if term_report.error and not report.error:
+            report.error = f"{term_label(term)}: {term_report.error}"
+        success = success and result["success"]
+        assignments.update(result["assignments"])
+    return assignments, success
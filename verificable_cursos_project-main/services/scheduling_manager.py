@@ -1,119 +1,119 @@
+import logging
 from collections import defaultdict
-from datetime import datetime, time
-from typing import Optional
-
-import pandas as pd
+from typing import Callable, Iterable, Optional
 
 from db import DatabaseConnection
-
-
-class SchedulingManager:
-    START_TIME = time(9, 0)  # 9:00
-    END_TIME = time(18, 0)  # 18:00
-    LUNCH_START = time(13, 0)  # 13:00
-    LUNCH_END = time(14, 0)  # 14:00
-    DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
-
-    TIME_SLOTS = [
-        time(9, 0),
-        time(10, 0),
-        time(11, 0),
-        time(12, 0),  # Morning
-        time(14, 0),
-        time(15, 0),
-        time(16, 0),
-        time(17, 0),  # Afternoon
-    ]
-
-    def __init__(self):
-        self.db = DatabaseConnection() # Aca el error documentado
-        self.cur = self.db.connect()
-        self.classroom_schedule: dict[int, list[tuple[str, time, time]]] = {}
-        self.professor_schedule: dict[int, list[tuple[str, time, time]]] = {}
-        self.student_schedule: dict[int, list[tuple[str, time, time]]] = {}
-        self.section_schedule: dict[int, dict] = {}
-
-    def clear_schedule(self):
-        self.cur.execute("DELETE FROM classroom_schedule")
+from services.classroom_catalog import classroom_catalogs
+from services.schedule_calendar import schedule_index
+from services.schedule_export import iter_schedule_rows, write_excel
+from services.schedule_fingerprint import (
+    FORGET_RUNS_SQL,
+    INSERT_RUN_SQL,
+    input_fingerprint,
+    last_fingerprint,
+)
+from services.schedule_report import QueryCountingCursor, RunReport
+from services.schedule_snapshot import (
+    CLASSROOMS_SQL,
+    PROFESSORS_SQL,
+    SECTIONS_SQL,
+    TERM_WHERE,
+    TERMS_SQL,
+    ScheduleSnapshot,
+    Term,
+    as_time,
+    term_label,
+)
+from services.schedule_solver import ScheduleSolver
+from services.schedule_term import merge_term_results, solve_term, solve_terms
+
+PERSISTED_SCHEDULE_SQL = """
+    SELECT
+        cs.section_id,
+        cs.classroom_id,
+        pa.professor_id,
+        cs.day_of_week,
+        cs.start_time,
+        cs.end_time,
+        cs.year,
+        cs.semester
+    FROM classroom_schedule cs
+    LEFT JOIN professor_assignment pa ON cs.section_id = pa.section_id
+    {where}
+"""
+
+logger = logging.getLogger(__name__)
+
+INSERT_SCHEDULE_SQL = """
+    INSERT INTO classroom_schedule (section_id, classroom_id, day_of_week, start_time, end_time, year, semester)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+"""
+
+DELETE_SECTION_ROWS_SQL = """
+    DELETE FROM classroom_schedule
+    WHERE section_id = %s AND year = %s AND semester = %s
+"""
+
+STORED_TERMS_SQL = "SELECT DISTINCT section_id, year, semester FROM classroom_schedule"
+
+SCHEDULE_TERM_WHERE = "WHERE cs.year = %s AND cs.semester = %s"
+
+
+class SchedulingManager(ScheduleSolver):
+    def __init__(self, database=None):
+        super().__init__()
+        # `database` lets benchmarks and tools pass a stand-in connection
+        self.db = database or DatabaseConnection() # Aca el error documentado
+        self.cur = QueryCountingCursor(self.db.connect())
+
+    def clear_schedule(self, term: Optional[Term] = None):
+        self._delete_schedule(term)
+        self.cur.execute(FORGET_RUNS_SQL)
         self.db.commit()
-        self.classroom_schedule.clear()
-        self.professor_schedule.clear()
-        self.student_schedule.clear()
-        self.section_schedule.clear()
-
-    def get_all_sections(self) -> list[dict]:
-        self.cur.execute(
-            """
-            SELECT
-                s.id as section_id,
-                c.credits,
-                pa.professor_id,
-                c.code,
-                s.section_number,
-                c.id as course_id
-            FROM section s
-            JOIN course_instance ci ON s.course_instance_id = ci.id
-            JOIN course c ON ci.course_id = c.id
-            JOIN professor_assignment pa ON s.id = pa.section_id
-            ORDER BY c.credits DESC
-        """
-        )
-        sections = self.cur.fetchall()
-        return sections
+        schedule_index.invalidate()
+        self._reset_state()
 
-    def get_suitable_classrooms(
-        self, section_id: int, student_count: int
-    ) -> list[dict]:
-        try:
+    def _delete_schedule(self, term: Optional[Term] = None):
+        if term is None:
+            self.cur.execute("DELETE FROM classroom_schedule")
+        else:
             self.cur.execute(
-                """
-                SELECT c.credits
-                FROM section s
-                JOIN course_instance ci ON s.course_instance_id = ci.id
-                JOIN course c ON ci.course_id = c.id
-                WHERE s.id = %s
-            """,
-                (section_id,),
+                "DELETE FROM classroom_schedule WHERE year = %s AND semester = %s",
+                term,
             )
-            credits = self.cur.fetchone()["credits"]
 
-            self.cur.execute(
-                """
-                SELECT id, capacity
-                FROM classroom
-                WHERE capacity >= %s
-                ORDER BY capacity ASC
-            """,
-                (student_count,),
-            )
+    def load_snapshot(self, term: Optional[Term] = None) -> ScheduleSnapshot:
+        self.snapshot = ScheduleSnapshot.load(
+            self.cur, catalog=self._catalog(), term=term
+        )
+        return self.snapshot
 
-            classrooms = []
-            for room in self.cur.fetchall():
-                # Calculate fit score - lower is better
-                capacity_diff = room["capacity"] - student_count
-                usage_count = len(self.classroom_schedule.get(room["id"], []))
-
-                # For 2-credit courses, prefer smaller rooms
-                if credits == 2:
-                    fit_score = capacity_diff * 2 + usage_count
-                else:
-                    fit_score = capacity_diff + usage_count
-
-                classrooms.append(
-                    {
-                        "id": room["id"],
-                        "capacity": room["capacity"],
-                        "fit_score": fit_score,
-                    }
-                )
+    def dump_snapshot(self, term: Optional[Term] = None) -> dict:
+        """A term, or every term, as the offline schedule_cli reads it."""
+        snapshot = self.load_snapshot(term)
+        self.cur.execute(PROFESSORS_SQL)
+        return snapshot.to_dict(professors=self.cur.fetchall())
 
-            # Sort by fit score
-            classrooms.sort(key=lambda x: x["fit_score"])
-            return classrooms
+    def _catalog(self):
+        return classroom_catalogs.get(self.db, self.cur, CLASSROOMS_SQL)
 
-        except Exception as e:
-            print(f"Error getting suitable classrooms: {str(e)}")
-            return []
+    def _get_snapshot(self) -> ScheduleSnapshot:
+        if self.snapshot is None:
+            return self.load_snapshot()
+        return self.snapshot
+
+    def get_all_sections(self, term: Optional[Term] = None) -> list[dict]:
+        if term is None:
+            self.cur.execute(SECTIONS_SQL.format(where=""))
+        else:
+            self.cur.execute(SECTIONS_SQL.format(where=TERM_WHERE), term)
+        sections = self.cur.fetchall()
+        return sections
+
+    def terms(self) -> list[Term]:
+        """Terms with sections, latest first."""
+        self.cur.execute(TERMS_SQL)
+        return [(row["year"], row["semester"]) for row in self.cur.fetchall()]
 
     def get_available_classrooms(self) -> list[dict]:
         self.cur.execute(
@@ -122,427 +122,140 @@ class SchedulingManager:
         classrooms = self.cur.fetchall()
         return classrooms
 
-    def get_time_slot_score(
-        self, day: str, start_time: time, end_time: time, classroom_id: int
-    ) -> int:
-        try:
-            score = 0
-            if classroom_id in self.classroom_schedule:
-                for slot_day, slot_start, slot_end in self.classroom_schedule[
-                    classroom_id
-                ]:
-                    if slot_day == day:
-                        if slot_end == start_time or slot_start == end_time:
-                            score -= 2
-                        elif abs((slot_end.hour - start_time.hour)) == 2:
-                            score += 1
-                        elif abs((slot_end.hour - start_time.hour)) > 2:
-                            score += 2
-
-            if start_time.hour >= 14:
-                score += 1
-
-            return score
-        except Exception:
-            return 999
-
-    def find_valid_time_slot(
-        self, section_id: int, classroom_id: int, professor_id: int, credits: int
-    ) -> Optional[tuple[str, time, time]]:
-        if credits == 2:
-            time_slots = [
-                time(9),
-                time(10),
-                time(11),
-                time(14),
-                time(15),
-                time(16),
-            ]
-        else:
-            time_slots = [
-                time(9),
-                time(10),
-                time(14),
-                time(15),
-            ]
-
-        day_usage = defaultdict(int)
-        for schedules in [
-            self.classroom_schedule.values(),
-            self.professor_schedule.values(),
-        ]:
-            for schedule in schedules:
-                for day, _, _ in schedule:
-                    day_usage[day] += 1
-
-        sorted_days = sorted(self.DAYS, key=lambda d: day_usage[d])
-
-        for day in sorted_days:
-            for start_time in time_slots:
-                end_hour = start_time.hour + credits
-                if end_hour > 18:
-                    continue
-
-                end_time = time(end_hour)
-
-                if (
-                    self.is_valid_time_slot(start_time, end_time, credits)
-                    and not self.has_classroom_conflict(
-                        classroom_id, day, start_time, end_time
-                    )
-                    and not self.has_professor_conflict(
-                        professor_id, day, start_time, end_time
-                    )
-                    and not self.has_student_conflicts(
-                        section_id, day, start_time, end_time
-                    )
-                ):
-                    return day, start_time, end_time
-
-        return None
-
-    def generate_schedule(self) -> bool: # aca el error documentado
+    def generate_schedule(
+        self,
+        strategy: str = "greedy",
+        runs: int = 1,
+        seed: int = 0,
+        improve_seconds: float = 0,
+        progress: Optional[Callable[[str, int, int], None]] = None,
+        profile: bool = False,
+        trace_memory: bool = False,
+        force: bool = False,
+        warm_start: bool = False,
+        term: Optional[Term] = None,
+    ) -> RunReport: # aca el error documentado
+        """Solve and store `term`, reading only its sections and enrollments,
+        or every term, each on its own and concurrently.
+
+        Returns the RunReport of the run, truthy when every section was
+        placed and saved. When the inputs and parameters match the last
+        successful run, the stored timetable is kept and the report is
+        marked `cached`, unless `force` or a profiling option is set.
+        `profile` and `trace_memory` attach cProfile and tracemalloc output
+        to that report only. With `warm_start` the stored timetable is kept
+        wherever it is still valid and only the changed rows are written."""
+        self.progress = progress
+        report = RunReport(
+            {
+                "strategy": strategy,
+                "runs": runs,
+                "seed": seed,
+                "improve_seconds": improve_seconds,
+                "warm_start": warm_start,
+                "term": term_label(term) if term else None,
+            },
+            self.cur,
+        )
+        self.run_report = report
+        report.start_capture(profile=profile, trace_memory=trace_memory)
         try:
-            self.classroom_schedule.clear()
-            self.professor_schedule.clear()
-            self.student_schedule.clear()
-            self.section_schedule.clear()
-
-            sections = self.get_all_sections()
-            if not sections:
-                return False
-
-            for section in sections:
-                self.cur.execute(
-                    """
-                    SELECT
-                        COUNT(*) as student_count,
-                        GROUP_CONCAT(student_id) as student_ids
-                    FROM student_assignment
-                    WHERE section_id = %s
-                    GROUP BY section_id
-                """,
-                    (section["section_id"],),
+            with report.phase("fingerprint"):
+                report.fingerprint = input_fingerprint(self.cur, report.params)
+                report.cached = (
+                    not (force or profile or trace_memory)
+                    and last_fingerprint(self.cur) == report.fingerprint
                 )
-                result = self.cur.fetchone()
-                section["student_count"] = result["student_count"] if result else 0
-                section["student_ids"] = (
-                    [int(x) for x in result["student_ids"].split(",")]
-                    if result and result["student_ids"]
-                    else []
+            if report.cached:
+                success = True
+            else:
+                success = self._generate(
+                    report, strategy, runs, seed, improve_seconds, warm_start, term
                 )
-
-                section["conflict_score"] = self.get_conflict_score(
-                    section["section_id"]
-                )
-                possible_slots = 0
-                for classroom in self.get_suitable_classrooms(
-                    section["section_id"], section["student_count"]
-                ):
-                    for day in self.DAYS:
-                        for hour in range(9, 18 - section["credits"]):
-                            if hour != 13:  # Skip lunch hour
-                                start_time = time(hour, 0)
-                                end_time = time(hour + section["credits"], 0)
-                                if not self.has_professor_conflict(
-                                    section["professor_id"], day, start_time, end_time
-                                ):
-                                    possible_slots += 1
-
-                section["flexibility_score"] = possible_slots
-
-            # Sort sections by:
-            # 1. Flexibility score (lower first - schedule less flexible sections first)
-            # 2. Conflict score (higher first - schedule sections with more conflicts first)
-            # 3. Credits (higher first)
-            # 4. Student count (higher first)
-            sections.sort(
-                key=lambda x: (
-                    x["flexibility_score"],
-                    -x["conflict_score"],
-                    -x["credits"],
-                    -x["student_count"],
-                )
-            )
-
-            unscheduled_sections = []
-            for section in sections:
-                try:
-                    scheduled = False
-                    student_ids = section["student_ids"]
-
-                    suitable_classrooms = self.get_suitable_classrooms(
-                        section["section_id"], section["student_count"]
-                    )
-                    if not suitable_classrooms:
-                        unscheduled_sections.append(section)
-                        continue
-
-                    for classroom in suitable_classrooms:
-                        try:
-                            classroom_id = classroom["id"]
-
-                            time_slot = self.find_valid_time_slot(
-                                section["section_id"],
-                                classroom_id,
-                                section["professor_id"],
-                                section["credits"],
-                            )
-
-                            if time_slot:
-                                day, start_time, end_time = time_slot
-                                self.schedule_section(
-                                    section["section_id"],
-                                    classroom_id,
-                                    section["professor_id"],
-                                    student_ids,
-                                    day,
-                                    start_time,
-                                    end_time,
-                                )
-                                scheduled = True
-                                break
-                        except Exception as e:
-                            print(f"Error with classroom {classroom_id}: {str(e)}")
-                            continue
-
-                    if not scheduled:
-                        unscheduled_sections.append(section)
-                except Exception as e:
-                    print(f"Error with section {section['section_id']}: {str(e)}")
-                    continue
-
-            if unscheduled_sections:
-                return False
-
-            return True
-        except Exception:
-            import traceback
-
-            traceback.print_exc()
-            return False
-
-    def export_to_excel(self, filename: str = "horario.xlsx") -> None:
-        self.cur.execute(
-            """
-            SELECT
-                c.code,
-                c.description as course_name,
-                s.section_number,
-                cr.name as classroom,
-                cs.day_of_week,
-                cs.start_time,
-                cs.end_time,
-                p.name as professor
-            FROM classroom_schedule cs
-            JOIN section s ON cs.section_id = s.id
-            JOIN course_instance ci ON s.course_instance_id = ci.id
-            JOIN course c ON ci.course_id = c.id
-            JOIN classroom cr ON cs.classroom_id = cr.id
-            JOIN professor_assignment pa ON s.id = pa.section_id
-            JOIN professor p ON pa.professor_id = p.id
-            ORDER BY cs.day_of_week, cs.start_time
-        """
-        )
-
-        schedule_data = []
-        results = self.cur.fetchall()
-        if not results:
-            return
-
-        for row in results:
-            schedule_data.append(
-                {
-                    "Day": row["day_of_week"],
-                    "Time": f"{row['start_time']} - {row['end_time']}",
-                    "Course": f"{row['code']} - {row['course_name']} (Sección {row['section_number']})",
-                    "Classroom": row["classroom"],
-                    "Professor": row["professor"],
-                }
-            )
-
-        df = pd.DataFrame(schedule_data)
-
-        with pd.ExcelWriter(filename, engine="xlsxwriter") as writer:
-            df.to_excel(writer, index=False, sheet_name="Horario")
-
-            workbook = writer.book
-            worksheet = writer.sheets["Horario"]
-
-            # Set column widths - increased width for Course column
-            column_widths = {
-                "A": 12,  # Day
-                "B": 20,  # Time
-                "C": 50,  # Course (increased to accommodate full name)
-                "D": 15,  # Classroom
-                "E": 25,  # Professor
-            }
-
-            for col, width in column_widths.items():
-                worksheet.set_column(f"{col}:{col}", width)
-
-            header_format = workbook.add_format(
-                {
-                    "bold": True,
-                    "text_wrap": True,
-                    "valign": "top",
-                    "fg_color": "#D7E4BC",
-                    "border": 1,
-                }
-            )
-
-            cell_format = workbook.add_format(
-                {"text_wrap": True, "valign": "top", "border": 1}
-            )
-            for col_num, value in enumerate(df.columns.values):
-                worksheet.write(0, col_num, value, header_format)
-
-            for row_num, row in enumerate(df.values, 1):
-                for col_num, value in enumerate(row):
-                    worksheet.write(row_num, col_num, value, cell_format)
-            worksheet.set_row(0, 30)
-            for row in range(1, len(df) + 1):
-                worksheet.set_row(row, 45)
-
-    def is_valid_time_slot(
-        self, start_time: time, end_time: time, credits: int
-    ) -> bool:
-        if start_time < self.START_TIME or end_time > self.END_TIME:
-            return False
-
-        if not (end_time <= self.LUNCH_START or start_time >= self.LUNCH_END):
-            return False
-
-        duration = datetime.combine(datetime.today(), end_time) - datetime.combine(
-            datetime.today(), start_time
-        )
-        if duration.seconds / 3600 != credits:
-            return False
-
-        return True
-
-    def has_classroom_conflict(
-        self, classroom_id: int, day: str, start_time: time, end_time: time
-    ) -> bool:
-        if classroom_id not in self.classroom_schedule:
-            return False
-
-        for slot in self.classroom_schedule[classroom_id]:
-            if slot[0] == day:
-                slot_start = slot[1]
-                slot_end = slot[2]
-                if start_time < slot_end and end_time > slot_start:
-                    return True
-        return False
-
-    def has_professor_conflict(
-        self, professor_id: int, day: str, start_time: time, end_time: time
-    ) -> bool:
-        if professor_id not in self.professor_schedule:
-            return False
-
-        for slot in self.professor_schedule[professor_id]:
-            if slot[0] == day:
-                slot_start = slot[1]
-                slot_end = slot[2]
-                if start_time < slot_end and end_time > slot_start:
-                    return True
-        return False
-
-    def has_student_conflicts(
-        self, section_id: int, day: str, start_time: time, end_time: time
+            error = report.error
+        except Exception as e:
+            logger.exception("Error generating schedule")
+            success, error = False, str(e)
+        finally:
+            report.stop_capture()
+            self.run_report = None
+        return report.finish(success, error)
+
+    def _generate(
+        self,
+        report: RunReport,
+        strategy: str,
+        runs: int,
+        seed: int,
+        improve_seconds: float,
+        warm_start: bool = False,
+        term: Optional[Term] = None,
     ) -> bool:
-        try:
-            self.cur.execute(
-                """
-                SELECT student_id, c.credits
-                FROM student_assignment sa
-                JOIN section s ON sa.section_id = s.id
-                JOIN course_instance ci ON s.course_instance_id = ci.id
-                JOIN course c ON ci.course_id = c.id
-                WHERE section_id = %s
-            """,
-                (section_id,),
+        self.report_progress("loading", 0, 0)
+        with report.phase("load"):
+            snapshot = self.load_snapshot(term)
+            previous = self.stored_assignments(term) if warm_start else None
+        terms = snapshot.sections_by_term()
+        if len(terms) > 1:
+            assignments = self._solve_terms(
+                report, terms, strategy, runs, seed, improve_seconds, previous
             )
-
-            student_info = self.cur.fetchall()
-            if not student_info:
+            if assignments is None:
                 return False
-
-            student_ids = [s["student_id"] for s in student_info]
-            credits = student_info[0]["credits"] if student_info else 3
-
-            # For 2-credit courses, we can be more lenient with conflicts
-            conflict_threshold = 0.7 if credits == 2 else 0.5
-
-            conflicts = 0
-            total_students = len(student_ids)
-            for student_id in student_ids:
-                if student_id in self.student_schedule:
-                    for (
-                        scheduled_day,
-                        scheduled_start,
-                        scheduled_end,
-                    ) in self.student_schedule[student_id]:
-                        if scheduled_day == day and not (
-                            end_time <= scheduled_start or start_time >= scheduled_end
-                        ):
-                            conflicts += 1
-                            break
-
-            conflict_ratio = conflicts / total_students if total_students > 0 else 0
-            return conflict_ratio > conflict_threshold
-
-        except Exception as e:
-            print(f"Error checking student conflicts: {str(e)}")
+        elif solve_term(self, report, strategy, runs, seed, improve_seconds, previous):
+            assignments = self.section_schedule
+        else:
             return False
 
-    def get_conflict_score(self, section_id: int) -> int:
-        """Calculate a conflict score for a section based on student overlaps.
-        Higher scores mean more potential conflicts."""
-        try:
-            self.cur.execute(
-                """
-                SELECT c.credits
-                FROM section s
-                JOIN course_instance ci ON s.course_instance_id = ci.id
-                JOIN course c ON ci.course_id = c.id
-                WHERE s.id = %s
-            """,
-                (section_id,),
-            )
-            credits = self.cur.fetchone()["credits"]
-
-            self.cur.execute(
-                """
-                WITH section_students AS (
-                    SELECT student_id 
-                    FROM student_assignment 
-                    WHERE section_id = %s
+        placed = len(assignments)
+        self.report_progress("saving", placed, placed)
+        with report.phase("persist") as entry:
+            if previous is None:
+                saved = self.persist_schedule(report.fingerprint, term, assignments)
+            else:
+                changes = self.persist_changes(
+                    previous, report.fingerprint, term, assignments
                 )
-                SELECT 
-                    COUNT(DISTINCT sa.student_id) as overlap_count
-                FROM section_students ss
-                JOIN student_assignment sa ON sa.student_id = ss.student_id
-                WHERE sa.section_id != %s
-                GROUP BY sa.section_id
-                ORDER BY overlap_count DESC
-                LIMIT 1
-            """,
-                (section_id, section_id),
-            )
-
-            result = self.cur.fetchone()
-            overlap_count = result["overlap_count"] if result else 0
+                saved = changes is not None
+                entry.update(changes or {})
+            if not saved:
+                report.error = "Error al guardar el horario"
+                return False
+        return True
 
-            # Prioritize 2-credit courses by giving them a lower score
-            if credits == 2:
-                return overlap_count * 0.8  # 20% lower score for 2-credit courses
-            return overlap_count
+    def _solve_terms(
+        self,
+        report: RunReport,
+        terms: dict[Term, list[int]],
+        strategy: str,
+        runs: int,
+        seed: int,
+        improve_seconds: float,
+        previous: Optional[dict[int, dict]],
+    ) -> Optional[dict[int, dict]]:
+        """Solve every term of the loaded snapshot with solve_terms and merge
+        their reports into `report`. Returns the assignments of all terms,
+        or None when one of them could not be placed completely."""
+        snapshots = {
+            term: self.snapshot.subset(section_ids)
+            for term, section_ids in terms.items()
+        }
+        with report.phase("placement") as entry:
+            results = solve_terms(
+                snapshots,
+                strategy,
+                runs,
+                seed,
+                improve_seconds,
+                previous,
+                progress=self.progress,
+            )
+            entry["terms"] = len(results)
+        assignments, success = merge_term_results(report, results)
+        return assignments if success else None
 
-        except Exception as e:
-            print(f"Error calculating conflict score: {str(e)}")
-            return 0
+    def export_to_excel(self, filename: str = "horario.xlsx") -> int:
+        return write_excel(iter_schedule_rows(self.cur), filename)
 
     def get_classroom_capacity(self, classroom_id: int) -> int:
         self.cur.execute(
@@ -559,78 +272,319 @@ class SchedulingManager:
         result = self.cur.fetchone()
         return result["count"] if result else 0
 
-    def schedule_section(
+    def _schedule_rows(
+        self, section_ids: Iterable[int], assignments: Optional[dict] = None
+    ) -> list[tuple]:
+        """Rows of INSERT_SCHEDULE_SQL for `section_ids`, from `assignments`
+        or the in-memory timetable, in the term of the loaded snapshot."""
+        if assignments is None:
+            assignments = self.section_schedule
+        terms = self._get_snapshot().terms
+        return [
+            (
+                section_id,
+                assignments[section_id]["classroom_id"],
+                assignments[section_id]["day"],
+                assignments[section_id]["start_time"],
+                assignments[section_id]["end_time"],
+                *terms[section_id],
+            )
+            for section_id in section_ids
+            if section_id in assignments
+        ]
+
+    def persist_schedule(
         self,
-        section_id: int,
-        classroom_id: int,
-        professor_id: int,
-        student_ids: list[int],
-        day: str,
-        start_time: time,
-        end_time: time,
+        fingerprint: Optional[str] = None,
+        term: Optional[Term] = None,
+        assignments: Optional[dict[int, dict]] = None,
     ) -> bool:
+        """Replace the stored timetable of `term`, or of every term, with
+        `assignments` or the in-memory one in a single transaction, so a
+        failed write leaves the previous schedule intact. Rows the sections
+        of `term` still have in another term are deleted too.
+
+        `fingerprint` records the inputs the timetable was solved from."""
+        if assignments is None:
+            assignments = self.section_schedule
+        rows = self._schedule_rows(assignments, assignments)
         try:
-            if classroom_id not in self.classroom_schedule:
-                self.classroom_schedule[classroom_id] = []
-            self.classroom_schedule[classroom_id].append((day, start_time, end_time))
-
-            if professor_id not in self.professor_schedule:
-                self.professor_schedule[professor_id] = []
-            self.professor_schedule[professor_id].append((day, start_time, end_time))
-            for student_id in student_ids:
-                if student_id not in self.student_schedule:
-                    self.student_schedule[student_id] = []
-                self.student_schedule[student_id].append((day, start_time, end_time))
-
-            self.section_schedule[section_id] = {
-                "classroom_id": classroom_id,
-                "professor_id": professor_id,
-                "day": day,
-                "start_time": start_time,
-                "end_time": end_time,
-            }
-
-            self.cur.execute(
-                """
-                INSERT INTO classroom_schedule (section_id, classroom_id, day_of_week, start_time, end_time)
-                VALUES (%s, %s, %s, %s, %s)
-            """,
-                (section_id, classroom_id, day, start_time, end_time),
-            )
-
+            self._delete_schedule(term)
+            stale = [] if term is None else self._stale_rows(self._stored_terms())
+            if stale:
+                self.cur.executemany(DELETE_SECTION_ROWS_SQL, stale)
+            if rows:
+                self.cur.executemany(INSERT_SCHEDULE_SQL, rows)
+            self.cur.execute(FORGET_RUNS_SQL)
+            if fingerprint:
+                self.cur.execute(INSERT_RUN_SQL, (fingerprint,))
             self.db.commit()
+            schedule_index.invalidate()
             return True
-
-        except Exception as e:
-            print(f"Error scheduling section: {str(e)}")
+        except Exception:
+            logger.exception("Error saving schedule")
             self.db.rollback()
-
-            if classroom_id in self.classroom_schedule:
-                self.classroom_schedule[classroom_id].pop()
-            if professor_id in self.professor_schedule:
-                self.professor_schedule[professor_id].pop()
-            for student_id in student_ids:
-                if student_id in self.student_schedule:
-                    self.student_schedule[student_id].pop()
-            if section_id in self.section_schedule:
-                del self.section_schedule[section_id]
-
             return False
 
-    def _check_conflicts(
+    def persist_changes(
         self,
-        day: str,
-        start_time: time,
-        end_time: time,
-        classroom_id: int,
-        professor_id: int,
-        student_ids: list[int],
-    ) -> bool:
-        if self.has_classroom_conflict(classroom_id, day, start_time, end_time):
-            return True
-        if self.has_professor_conflict(professor_id, day, start_time, end_time):
-            return True
-        if self.has_student_conflicts(student_ids, day, start_time, end_time):
-            return True
+        previous: dict[int, dict],
+        fingerprint: Optional[str] = None,
+        term: Optional[Term] = None,
+        assignments: Optional[dict[int, dict]] = None,
+    ) -> Optional[dict]:
+        """Write only the difference between the `previous` stored timetable
+        of `term`, or of every term, and `assignments` or the in-memory one,
+        in a single transaction.
+
+        Returns the rows inserted, updated and deleted, or None when the
+        write failed and was rolled back."""
+        if assignments is None:
+            assignments = self.section_schedule
+        stored = self._stored_terms()
+        stale = self._stale_rows(stored)
+        # A row left in another term may be the one in `previous`
+        relocated = {section_id for section_id, _, _ in stale}
+        inserts, updates = [], []
+        for row in self._schedule_rows(assignments, assignments):
+            section_id, *placement, _, _ = row
+            old = previous.get(section_id)
+            if old is None:
+                inserts.append(row)
+            elif section_id in relocated or placement != [
+                old["classroom_id"],
+                old["day"],
+                old["start_time"],
+                old["end_time"],
+            ]:
+                updates.append(row)
+        deletes = [
+            section_id for section_id in previous if section_id not in assignments
+        ]
+        # Moved rows are deleted and inserted again: updated one at a time,
+        # two sections trading slots would break the unique (room, slot) key
+        for section_id in deletes + [row[0] for row in updates]:
+            for year, semester in [term] if term else stored[section_id]:
+                stale.append((section_id, year, semester))
+        try:
+            if stale:
+                self.cur.executemany(
+                    DELETE_SECTION_ROWS_SQL, list(dict.fromkeys(stale))
+                )
+            if inserts or updates:
+                self.cur.executemany(INSERT_SCHEDULE_SQL, updates + inserts)
+            self.cur.execute(FORGET_RUNS_SQL)
+            if fingerprint:
+                self.cur.execute(INSERT_RUN_SQL, (fingerprint,))
+            self.db.commit()
+            schedule_index.invalidate()
+        except Exception:
+            logger.exception("Error saving schedule")
+            self.db.rollback()
+            return None
+        return {
+            "inserted": len(inserts),
+            "updated": len(updates),
+            "deleted": len(deletes),
+        }
+
+    def has_stored_schedule(self) -> bool:
+        self.cur.execute("SELECT COUNT(*) as count FROM classroom_schedule")
+        return self.cur.fetchone()["count"] > 0
+
+    def _stored_terms(self) -> dict[int, set[Term]]:
+        """Terms each section has stored rows in."""
+        self.cur.execute(STORED_TERMS_SQL)
+        stored = defaultdict(set)
+        for row in self.cur.fetchall():
+            stored[row["section_id"]].add((row["year"], row["semester"]))
+        return stored
+
+    def _stale_rows(self, stored: dict[int, set[Term]]) -> list[tuple]:
+        """(section, year, semester) of the rows the sections of the loaded
+        snapshot still have in another term after their course instance
+        changed term."""
+        return [
+            (section_id, *other)
+            for section_id, term in self._get_snapshot().terms.items()
+            for other in stored.get(section_id, ())
+            if other != term
+        ]
+
+    def _stored_rows(self, term: Optional[Term] = None) -> list[dict]:
+        if term is None:
+            self.cur.execute(PERSISTED_SCHEDULE_SQL.format(where=""))
+        else:
+            self.cur.execute(
+                PERSISTED_SCHEDULE_SQL.format(where=SCHEDULE_TERM_WHERE), term
+            )
+        return self.cur.fetchall()
+
+    @staticmethod
+    def _stored_entry(row: dict) -> dict:
+        return {
+            "classroom_id": row["classroom_id"],
+            "professor_id": row["professor_id"],
+            "day": row["day_of_week"],
+            "start_time": as_time(row["start_time"]),
+            "end_time": as_time(row["end_time"]),
+        }
+
+    def stored_assignments(self, term: Optional[Term] = None) -> dict[int, dict]:
+        """The stored timetable of `term`, or of every term, in the
+        section_schedule layout."""
+        return {
+            row["section_id"]: self._stored_entry(row)
+            for row in self._stored_rows(term)
+        }
+
+    def load_persisted_schedule(
+        self, exclude: Iterable[int] = (), terms: Optional[Iterable[Term]] = None
+    ) -> dict[int, dict]:
+        """Book the stored timetable, or only its rows in `terms`, into the
+        in-memory state.
+
+        Rows of the `exclude` sections are returned instead of booked, so the
+        caller decides whether they can stay where they are. With `terms`
+        only their rows are read, so a row an `exclude` section left in
+        another term is never offered back."""
+        self._reset_state()
+        snapshot = self._get_snapshot()
+        exclude = set(exclude)
+        if terms is None:
+            rows = self._stored_rows()
+        else:
+            rows = [row for term in terms for row in self._stored_rows(term)]
+        held = {}
+        for row in rows:
+            section_id, entry = row["section_id"], self._stored_entry(row)
+            if section_id in exclude:
+                held[section_id] = entry
+                continue
+            self.schedule_section(
+                section_id,
+                entry["classroom_id"],
+                entry["professor_id"],
+                snapshot.get_students(section_id),
+                entry["day"],
+                entry["start_time"],
+                entry["end_time"],
+            )
+        return held
 
-        return False
+    def reschedule_sections(self, section_ids: list[int]) -> dict:
+        """Place, keep or move only `section_ids` against the stored timetable.
+
+        Every other section stays where it is, and a target section keeps its
+        current slot while it is still valid, so only the rows of sections
+        that actually moved are rewritten. Each term of the target sections
+        is handled on its own, against the stored rows of that term only."""
+        try:
+            if not section_ids or not self.has_stored_schedule():
+                return {"status": "ok", "moved": [], "unscheduled": []}
+
+            self.snapshot = ScheduleSnapshot.load(
+                self.cur, section_ids, catalog=self._catalog()
+            )
+            terms = self.snapshot.sections_by_term()
+            stored = self._stored_terms()
+            # Only the target rows are rewritten, so the stored sections may
+            # not change rooms to make space for them
+            self.move_rooms = False
+            moved, unscheduled, rows = [], [], []
+            deletes = self._stale_rows(stored)
+            for term in terms:
+                held = self.load_persisted_schedule(exclude=section_ids, terms=[term])
+                term_moved, term_unscheduled = self._keep_or_move(
+                    [
+                        section_id
+                        for section_id in section_ids
+                        if self.snapshot.terms.get(section_id) == term
+                    ],
+                    held,
+                )
+                moved += term_moved
+                unscheduled += term_unscheduled
+                rows += self._schedule_rows(term_moved)
+                deletes += [(section_id, *term) for section_id in term_moved]
+            # Rows of sections gone from the snapshot are only deleted
+            for section_id in section_ids:
+                if section_id not in self.snapshot.terms and section_id in stored:
+                    moved.append(section_id)
+                    deletes += [(section_id, *term) for term in stored[section_id]]
+
+            if deletes:
+                self.cur.executemany(
+                    DELETE_SECTION_ROWS_SQL, list(dict.fromkeys(deletes))
+                )
+                if rows:
+                    self.cur.executemany(INSERT_SCHEDULE_SQL, rows)
+                # The stored timetable no longer is a full solve's result
+                self.cur.execute(FORGET_RUNS_SQL)
+                self.db.commit()
+            # Called after enrollment changes too, so rosters may differ
+            schedule_index.invalidate()
+            return {"status": "ok", "moved": moved, "unscheduled": unscheduled}
+        except Exception as e:
+            self.db.rollback()
+            return {"status": "error", "message": str(e)}
+
+    def _keep_or_move(
+        self, section_ids: list[int], held: dict[int, dict]
+    ) -> tuple[list[int], list[int]]:
+        """Keep every section of `section_ids` in its `held` slot while it is
+        still valid and place the rest, against the booked timetable.
+
+        Returns the sections that moved and those left unscheduled."""
+        sections = {
+            section["section_id"]: section
+            for section in self.prepare_sections(
+                with_flexibility=False, only=set(section_ids)
+            )
+        }
+        moved, pending = [], []
+        for section_id in section_ids:
+            section = sections[section_id]
+            entry = held.get(section_id)
+            if entry and self._fits_current_slot(section, entry):
+                self.schedule_section(
+                    section_id,
+                    entry["classroom_id"],
+                    section["professor_id"],
+                    section["student_ids"],
+                    entry["day"],
+                    entry["start_time"],
+                    entry["end_time"],
+                )
+            else:
+                pending.append(section)
+
+        unscheduled = []
+        for section in sorted(pending, key=lambda x: -x["student_count"]):
+            candidates = self.candidate_slots(section["credits"])
+            if self._place_best_slot(section, candidates) is None:
+                unscheduled.append(section["section_id"])
+            moved.append(section["section_id"])
+        return moved, unscheduled
+
+    def place_section(self, section_id: int) -> dict:
+        return self.reschedule_sections([section_id])
+
+    def remove_section(self, section_id: int, term: Optional[Term] = None) -> dict:
+        """Take the section out of the stored timetable of `term`, or of
+        every term it has rows in, leaving every other row where it is."""
+        try:
+            terms = [term] if term else self._stored_terms().get(section_id, ())
+            if terms:
+                self.cur.executemany(
+                    DELETE_SECTION_ROWS_SQL,
+                    [(section_id, year, semester) for year, semester in terms],
+                )
+            self.cur.execute(FORGET_RUNS_SQL)
+            self.db.commit()
+            schedule_index.invalidate()
+            self.section_schedule.pop(section_id, None)
+            return {"status": "ok"}
+        except Exception as e:
+            self.db.rollback()
+            return {"status": "error", "message": str(e)}
@@ -1,6 +1,8 @@
 from mysql.connector import IntegrityError
 
 from db import DatabaseConnection
+from services.schedule_calendar import schedule_index
+from services.schedule_fingerprint import bump_input_version
 from settings import STATUS_ERROR
 
 
@@ -86,6 +88,7 @@ class SectionManager:
             return {"status": "error", "message": "Sección no encontrada"}
 
         old_scheme = row["evaluation_scheme"]
+        bump_input_version(self.cur)
         res = self._execute(
             "UPDATE section SET course_instance_id = %s, section_number = %s, evaluation_scheme = %s WHERE id = %s",
             (course_instance_id, section_number, evaluation_scheme, section_id),
@@ -172,6 +175,7 @@ class SectionManager:
             )
             self.cur.execute("DELETE FROM section WHERE id = %s", (section_id,))
             self.db.commit()
+            schedule_index.invalidate()
             return {"status": "ok"}
         except Exception as e:
             self.db.rollback()
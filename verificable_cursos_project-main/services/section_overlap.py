@@ -0,0 +1,34 @@
+from collections import defaultdict
+
+
+class SectionOverlap:
+    """Sparse, symmetric section x section matrix of shared-student counts.
+
+    It is the product A·Aᵀ of the section/student incidence matrix,
+    accumulated one student row at a time so only the non-zero pairs are
+    stored. The diagonal (a section with itself) is left out."""
+
+    def __init__(self, sections_by_student: dict[int, list[int]]):
+        self._rows: dict[int, dict[int, int]] = defaultdict(dict)
+        for sections in sections_by_student.values():
+            unique = sorted(set(sections))
+            for position, section_id in enumerate(unique):
+                row = self._rows[section_id]
+                for other in unique[position + 1 :]:
+                    row[other] = row.get(other, 0) + 1
+                    self._rows[other][section_id] = row[other]
+
+    def weight(self, section_id: int, other_id: int) -> int:
+        return self._rows.get(section_id, {}).get(other_id, 0)
+
+    def neighbors(self, section_id: int) -> dict[int, int]:
+        return self._rows.get(section_id, {})
+
+    def degree(self, section_id: int) -> int:
+        return len(self.neighbors(section_id))
+
+    def max_overlap(self, section_id: int) -> int:
+        return max(self.neighbors(section_id).values(), default=0)
+
+    def total_overlap(self, section_id: int) -> int:
+        return sum(self.neighbors(section_id).values())
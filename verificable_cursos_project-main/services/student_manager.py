@@ -3,6 +3,7 @@ from datetime import date
 from mysql.connector import IntegrityError
 
 from db import DatabaseConnection
+from services.schedule_calendar import schedule_index
 
 
 class StudentManager:
@@ -64,7 +65,10 @@ class StudentManager:
 
     def delete_student(self, student_id: int) -> dict:
         try:
-            return self._execute("DELETE FROM student WHERE id = %s", (student_id,))
+            result = self._execute("DELETE FROM student WHERE id = %s", (student_id,))
+            if result["status"] == "ok":
+                schedule_index.invalidate()
+            return result
         except Exception as e:
             self.db.rollback()
             return {"status": "error", "message": str(e)}
@@ -33,6 +33,15 @@ HOME_PAGE = "home/home.html"
 # Error
 ERROR_PAGE = "error/404.html"
 
+# Límites de la generación de horario
+SCHEDULE_MAX_RUNS = 64
+SCHEDULE_MAX_IMPROVE_SECONDS = 300
+
+# Calendarios de horario (ICS)
+SCHEDULE_TERM_WEEKS = 16
+# Primer día de clases de cada semestre, como (mes, día)
+SCHEDULE_TERM_STARTS = {"01": (3, 1), "02": (8, 1)}
+
 # Configuración general
 VIEW_BASE_URL = "templates"
 STATIC_BASE_URL = "static"
@@ -0,0 +1,50 @@
+import numpy as np
+
+from services.classroom_catalog import ClassroomCatalog, ClassroomCatalogCache
+
+CLASSROOMS = [
+    {"id": 3, "capacity": 60},
+    {"id": 1, "capacity": 20},
+    {"id": 2, "capacity": 40},
+    {"id": 4, "capacity": 40},
+]
+
+
+def test_rank_returns_fitting_rooms_best_fit_first():
+    catalog = ClassroomCatalog(CLASSROOMS)
+    usage = np.zeros(len(catalog), dtype=np.int64)
+
+    assert catalog.count_fitting(30) == 3
+    assert [room["id"] for room in catalog.rank(30, 3, usage)] == [2, 4, 3]
+
+    usage[catalog.position[2]] = 5
+    assert [room["id"] for room in catalog.rank(30, 3, usage)] == [4, 2, 3]
+    assert catalog.rank(61, 3, usage) == []
+
+
+class FakeCursor:
+    def __init__(self):
+        self.queries = 0
+
+    def execute(self, sql):
+        self.queries += 1
+
+    def fetchall(self):
+        return CLASSROOMS
+
+
+class FakeDatabase:
+    pass
+
+
+def test_catalog_cache_reloads_after_invalidate():
+    cache = ClassroomCatalogCache()
+    database, cur = FakeDatabase(), FakeCursor()
+
+    first = cache.get(database, cur, "SELECT")
+    assert cache.get(database, cur, "SELECT") is first
+    assert cur.queries == 1
+
+    cache.invalidate()
+    assert cache.get(database, cur, "SELECT") is not first
+    assert cur.queries == 2
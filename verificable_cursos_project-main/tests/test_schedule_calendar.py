@@ -0,0 +1,66 @@
+from services.schedule_calendar import ScheduleIndex, to_ics
+
+
+def entry(section_id, professor_id, day, start, end):
+    return {
+        "section_id": section_id,
+        "course_code": f"INF{section_id}",
+        "course_name": "Programación, avanzada",
+        "section_number": 1,
+        "classroom_id": 1,
+        "classroom": "Sala 1",
+        "professor_id": professor_id,
+        "professor": "Ana",
+        "day_of_week": day,
+        "start_time": start,
+        "end_time": end,
+        "year": 2025,
+        "semester": "01",
+    }
+
+
+ENTRIES = [
+    entry(1, 10, "Wednesday", "14:00:00", "16:00:00"),
+    entry(2, 10, "Monday", "09:00:00", "12:00:00"),
+]
+ENROLLMENTS = [
+    {"section_id": 1, "student_id": 100},
+    {"section_id": 2, "student_id": 100},
+    {"section_id": 3, "student_id": 100},  # Not scheduled
+]
+
+
+def test_index_returns_week_ordered_feeds():
+    index = ScheduleIndex(ENTRIES, ENROLLMENTS)
+
+    assert [record["section_id"] for record in index.for_student(100)] == [2, 1]
+    assert [record["section_id"] for record in index.for_professor(10)] == [2, 1]
+    assert index.for_student(999) == []
+
+
+def test_feeds_are_scoped_to_a_term():
+    entries = ENTRIES + [
+        dict(entry(4, 10, "Friday", "09:00:00", "11:00:00"), semester="02")
+    ]
+    enrollments = ENROLLMENTS + [{"section_id": 4, "student_id": 100}]
+    index = ScheduleIndex(entries, enrollments)
+
+    assert index.latest_term() == (2025, "02")
+    assert [r["section_id"] for r in index.for_student(100, (2025, "01"))] == [2, 1]
+    assert [r["section_id"] for r in index.for_professor(10, (2025, "02"))] == [4]
+    assert ScheduleIndex([], []).latest_term() is None
+
+
+def test_ics_repeats_each_section_weekly_from_term_start():
+    index = ScheduleIndex(ENTRIES, ENROLLMENTS)
+
+    ics = to_ics(index.for_student(100), "Horario", 16)
+
+    assert ics.count("BEGIN:VEVENT") == 2
+    assert "DTSTART:20250303T090000" in ics
+    assert "DTSTART:20250305T140000" in ics
+    assert "RRULE:FREQ=WEEKLY;BYDAY=WE;COUNT=16" in ics
+    assert "Programación\\, avanzada" in ics
+
+    second_term = dict(index.for_student(100)[0], semester="02")
+    assert "DTSTART:20250804T090000" in to_ics([second_term], "Horario", 16)
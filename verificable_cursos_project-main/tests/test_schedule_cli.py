@@ -0,0 +1,84 @@
+import json
+
+import pytest
+
+import schedule_cli
+from benchmarks.synthetic_term import TermSpec, generate_term
+from services.schedule_snapshot import ScheduleSnapshot
+from services.scheduling_manager import SchedulingManager
+
+
+def test_dumped_term_solves_offline(tmp_path):
+    database = generate_term(
+        TermSpec(sections=30, students=150, students_per_section=10, rooms=8)
+    )
+    snapshot_path = tmp_path / "term.json"
+    snapshot_path.write_text(json.dumps(SchedulingManager(database).dump_snapshot()))
+    output_path = tmp_path / "horario.json"
+
+    exit_code = schedule_cli.main(
+        ["solve", str(snapshot_path), "--output", str(output_path)]
+    )
+
+    result = json.loads(output_path.read_text())
+    assert exit_code == 0
+    assert len(result["timetable"]) == 30
+    assert result["timetable"][0]["start_time"] == "09:00"
+    assert result["report"]["success"]
+    assert all(phase["queries"] == 0 for phase in result["report"]["phases"])
+
+
+def test_terms_of_a_snapshot_are_solved_apart(tmp_path):
+    database = generate_term(
+        TermSpec(sections=40, students=200, students_per_section=10, rooms=4, terms=2)
+    )
+    snapshot_path = tmp_path / "terms.json"
+    snapshot_path.write_text(json.dumps(SchedulingManager(database).dump_snapshot()))
+    output_path = tmp_path / "horario.json"
+
+    exit_code = schedule_cli.main(
+        ["solve", str(snapshot_path), "--output", str(output_path)]
+    )
+
+    result = json.loads(output_path.read_text())
+    placement = next(
+        phase for phase in result["report"]["phases"] if phase["phase"] == "placement"
+    )
+    assert exit_code == 0
+    assert placement["terms"] == 2
+    assert len(result["timetable"]) == 40
+
+
+def test_unreadable_input_exits_with_usage_error(tmp_path, capsys):
+    broken = tmp_path / "term.json"
+    broken.write_text("{")
+
+    assert schedule_cli.main(["solve", str(broken)]) == 2
+    assert schedule_cli.main(["solve", str(tmp_path / "missing.json")]) == 2
+    assert capsys.readouterr().err.count("error:") == 2
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        [{"id": 1, "capacity": 30}],
+        {"classrooms": [{"id": 1, "capacity": None}]},
+        {"classrooms": [{"id": 1, "capacity": "30"}]},
+        {"classrooms": [{"id": 1, "capacity": [1]}]},
+    ],
+)
+def test_malformed_snapshot_exits_with_usage_error(tmp_path, capsys, data):
+    snapshot_path = tmp_path / "term.json"
+    snapshot_path.write_text(json.dumps(data))
+
+    assert schedule_cli.main(["solve", str(snapshot_path)]) == 2
+    assert capsys.readouterr().err.startswith("error:")
+
+
+def test_snapshot_rejects_unknown_professor():
+    data = {
+        "sections": [{"section_id": 1, "credits": 3, "professor_id": 7}],
+        "professors": [{"id": 1, "name": "Ana"}],
+    }
+    with pytest.raises(ValueError, match="profesor desconocido"):
+        ScheduleSnapshot.from_dict(data)
@@ -0,0 +1,64 @@
+from benchmarks.synthetic_term import TermSpec, generate_term
+from services.schedule_components import (
+    allocate_rooms,
+    conflict_components,
+    solve_components,
+)
+from services.schedule_occupancy import OccupancyIndex, slot_mask
+from services.schedule_snapshot import ScheduleSnapshot
+from services.scheduling_manager import SchedulingManager
+
+
+def test_components_join_shared_students_and_professors():
+    sections = [
+        {"section_id": 1, "credits": 3, "professor_id": 1},
+        {"section_id": 2, "credits": 3, "professor_id": 1},
+        {"section_id": 3, "credits": 2, "professor_id": 2},
+        {"section_id": 4, "credits": 2, "professor_id": 3},
+    ]
+    enrollments = [
+        {"section_id": 3, "student_id": 10},
+        {"section_id": 4, "student_id": 10},
+        {"section_id": 1, "student_id": 11},
+    ]
+    snapshot = ScheduleSnapshot(sections, enrollments, [{"id": 1, "capacity": 30}])
+
+    assert sorted(map(sorted, conflict_components(snapshot))) == [[1, 2], [3, 4]]
+
+
+def test_component_solves_merge_without_double_booking_rooms():
+    database = generate_term(
+        TermSpec(sections=60, students=300, students_per_section=10, faculties=3)
+    )
+    snapshot = SchedulingManager(database).load_snapshot()
+    components = conflict_components(snapshot)
+    # Faculties never share students or professors
+    assert len(components) >= 3
+
+    shares = allocate_rooms(snapshot, components)
+    for rooms in shares:
+        for other in shares:
+            if other is not rooms:
+                assert not any(
+                    mask & other.get(room_id, 0) for room_id, mask in rooms.items()
+                )
+
+    result = solve_components(snapshot, "dsatur")
+    occupancy = OccupancyIndex()
+    for entry in result["assignments"].values():
+        mask = slot_mask(entry["day"], entry["start_time"], entry["end_time"])
+        assert occupancy.is_free(entry["classroom_id"], mask)
+        occupancy.book(entry["classroom_id"], mask)
+    assert result["components"] == len(components)
+    assert not result["unscheduled"]
+
+
+def test_generate_schedule_solves_independent_faculties_apart():
+    database = generate_term(
+        TermSpec(sections=40, students=200, students_per_section=10, faculties=2)
+    )
+    report = SchedulingManager(database).generate_schedule(strategy="dsatur")
+
+    placement = next(phase for phase in report.phases if phase["phase"] == "placement")
+    assert report
+    assert placement["components"] >= 2
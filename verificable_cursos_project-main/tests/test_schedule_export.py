@@ -0,0 +1,100 @@
+import json
+import zipfile
+
+from services.schedule_export import (
+    ScheduleExportCache,
+    iter_csv,
+    iter_json,
+    iter_ndjson,
+    write_excel,
+)
+
+ROW = {
+    "code": "INF101",
+    "course_name": "Programación",
+    "section_number": 1,
+    "classroom": "Sala 1",
+    "day_of_week": "Monday",
+    "start_time": "9:00:00",
+    "end_time": "12:00:00",
+    "professor": "Ana",
+    "year": 2025,
+    "semester": "01",
+}
+DATA_ROW = dict(
+    ROW,
+    section_id=7,
+    course_code="INF101",
+    classroom_id=1,
+    professor_id=3,
+    start_time="09:00:00",
+)
+
+
+def test_write_excel_streams_rows(tmp_path):
+    filename = tmp_path / "horario.xlsx"
+
+    assert write_excel(iter([ROW, dict(ROW, day_of_week="Friday")]), filename) == 2
+
+    sheet = zipfile.ZipFile(filename).read("xl/worksheets/sheet1.xml").decode()
+    assert "INF101 - Programación (Sección 1)" in sheet
+    assert "9:00:00 - 12:00:00" in sheet
+
+
+def test_write_excel_skips_empty_timetable(tmp_path):
+    filename = tmp_path / "horario.xlsx"
+
+    assert write_excel(iter([]), filename) == 0
+    assert not filename.exists()
+
+
+class RowsCursor:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def execute(self, sql):
+        self.pending = list(self.rows)
+
+    def fetchmany(self, size):
+        batch, self.pending = self.pending[:size], self.pending[size:]
+        return batch
+
+
+def test_export_cache_reuses_file_for_same_timetable(tmp_path):
+    exports = ScheduleExportCache(str(tmp_path))
+    cur = RowsCursor([ROW])
+
+    digest, reused = exports.export(cur)
+    assert not reused
+    assert exports.current() == digest
+    assert exports.export(cur) == (digest, True)
+
+    cur.rows = [dict(ROW, classroom="Sala 2")]
+    other, reused = exports.export(cur)
+    assert other != digest and not reused
+    assert exports.current() == other
+
+    cur.rows = []
+    assert exports.export(cur) == (None, False)
+    assert exports.current() is None
+
+
+def test_stream_formats_encode_the_same_rows():
+    rows = [DATA_ROW, dict(DATA_ROW, section_id=8)]
+
+    records = json.loads("".join(iter_json(iter(rows))))
+    assert [record["section_id"] for record in records] == [7, 8]
+    assert records[0]["start_time"] == "09:00"
+    assert records[0]["end_time"] == "12:00"
+
+    lines = "".join(iter_ndjson(iter(rows))).splitlines()
+    assert [json.loads(line) for line in lines] == records
+
+    csv_lines = "".join(iter_csv(iter(rows))).splitlines()
+    assert csv_lines[0].startswith("section_id,course_code")
+    assert len(csv_lines) == 3
+
+
+def test_stream_formats_handle_empty_timetable():
+    assert json.loads("".join(iter_json(iter([])))) == []
+    assert "".join(iter_csv(iter([]))).startswith("section_id,")
@@ -0,0 +1,77 @@
+from services.schedule_feasibility import block_need, check_feasibility
+from services.schedule_snapshot import ScheduleSnapshot
+from services.schedule_solver import ScheduleSolver
+
+
+def solver_for(sections, enrollments, classrooms):
+    return ScheduleSolver(ScheduleSnapshot(sections, enrollments, classrooms))
+
+
+def test_block_need_packs_two_credit_sections_in_pairs():
+    assert block_need(3) == 1
+    assert block_need(2) == 0.5
+    assert block_need(1) == 0
+
+
+def test_reports_sections_without_room_and_overloaded_professor():
+    sections = [
+        {"section_id": section_id, "credits": 3, "professor_id": 1}
+        for section_id in range(1, 12)
+    ]
+    enrollments = [{"section_id": 1, "student_id": student} for student in range(3)]
+    solver = solver_for(sections, enrollments, [{"id": 1, "capacity": 2}])
+
+    issues = {(issue["entity"], issue["reason"]) for issue in check_feasibility(solver)}
+
+    assert ("section", "no_classroom") in issues
+    assert ("professor", "professor_overload") in issues
+    assert ("classroom", "rooms_overbooked") in issues
+
+
+def test_feasible_term_has_no_blocking_issues():
+    sections = [
+        {"section_id": 1, "credits": 3, "professor_id": 1},
+        {"section_id": 2, "credits": 2, "professor_id": 2},
+    ]
+    enrollments = [{"section_id": 1, "student_id": 100}]
+    solver = solver_for(sections, enrollments, [{"id": 1, "capacity": 30}])
+
+    assert not [issue for issue in check_feasibility(solver) if issue["blocking"]]
+
+
+def test_reports_sections_their_professor_cannot_teach():
+    sections = [
+        {"section_id": 1, "credits": 3, "professor_id": 1},
+        {"section_id": 2, "credits": 2, "professor_id": 1},
+    ]
+    # Only two free hours left in the week
+    unavailability = [
+        {
+            "professor_id": 1,
+            "day_of_week": day,
+            "start_time": "09:00",
+            "end_time": "18:00",
+        }
+        for day in ("Monday", "Tuesday", "Wednesday", "Thursday")
+    ]
+    unavailability.append(
+        {
+            "professor_id": 1,
+            "day_of_week": "Friday",
+            "start_time": "09:00",
+            "end_time": "16:00",
+        }
+    )
+    solver = ScheduleSolver(
+        ScheduleSnapshot(
+            sections, [], [{"id": 1, "capacity": 30}], unavailability=unavailability
+        )
+    )
+
+    issues = {
+        (issue["id"], issue["reason"])
+        for issue in check_feasibility(solver)
+        if issue["blocking"]
+    }
+
+    assert issues == {(1, "professor_unavailable"), (1, "professor_overload")}
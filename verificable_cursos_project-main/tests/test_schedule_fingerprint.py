@@ -0,0 +1,33 @@
+from benchmarks.synthetic_term import TermSpec, generate_term
+from services.schedule_fingerprint import bump_input_version
+from services.scheduling_manager import SchedulingManager
+
+
+def test_unchanged_inputs_reuse_the_stored_schedule():
+    database = generate_term(
+        TermSpec(sections=20, students=100, students_per_section=10, rooms=6)
+    )
+    first = SchedulingManager(database).generate_schedule(strategy="dsatur")
+    second = SchedulingManager(database).generate_schedule(strategy="dsatur")
+
+    assert first and not first.cached
+    assert second and second.cached
+    assert [phase["phase"] for phase in second.phases] == ["fingerprint"]
+    assert second.fingerprint == first.fingerprint
+
+    other_params = SchedulingManager(database).generate_schedule(strategy="greedy")
+    assert other_params and not other_params.cached
+
+    manager = SchedulingManager(database)
+    manager.cur.execute("INSERT INTO classroom (name, capacity) VALUES ('Nueva', 40)")
+    database.commit()
+    added = manager.generate_schedule(strategy="greedy")
+    assert added and not added.cached
+
+    manager = SchedulingManager(database)
+    bump_input_version(manager.cur)
+    manager.cur.execute("UPDATE classroom SET capacity = capacity + 1")
+    database.commit()
+    changed = manager.generate_schedule(strategy="greedy")
+    assert changed and not changed.cached
+    assert SchedulingManager(database).generate_schedule(strategy="greedy").cached
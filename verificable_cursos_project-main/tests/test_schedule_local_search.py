@@ -0,0 +1,45 @@
+from benchmarks.synthetic_term import TermSpec, generate_term
+from services.schedule_local_search import LocalSearch
+from services.scheduling_manager import SchedulingManager
+
+
+def solved_term() -> SchedulingManager:
+    database = generate_term(
+        TermSpec(sections=120, students=600, students_per_section=15, rooms=12)
+    )
+    manager = SchedulingManager(database)
+    manager.load_snapshot()
+    manager.solve("greedy")
+    return manager
+
+
+def test_move_delta_is_the_change_in_total_cost():
+    manager = solved_term()
+    search = LocalSearch(manager, seed=0)
+    checked = 0
+    for _ in range(1000):
+        section_id = search.rng.choice(search.sections)
+        old = dict(manager.section_schedule[section_id])
+        new = search._propose(section_id)
+        if new is None or not search._is_feasible(section_id, old, new):
+            continue
+        before = search.total_cost()
+        delta = search.move_delta(section_id, old, new)
+        assert search.total_cost() - before == delta
+        checked += 1
+
+    assert checked > 20
+
+
+def test_run_keeps_the_best_timetable_seen():
+    manager = solved_term()
+    LocalSearch(manager, seed=0).run(0.1)
+
+    # Hot enough to accept nearly every worsening move
+    search = LocalSearch(manager, seed=1)
+    search.START_TEMPERATURE = search.END_TEMPERATURE = 1000
+    stats = search.run(0.02)
+
+    assert stats["accepted"] > 0
+    assert stats["final_cost"] <= stats["initial_cost"]
+    assert LocalSearch(manager).total_cost() == stats["final_cost"]
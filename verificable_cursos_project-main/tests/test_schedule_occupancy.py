@@ -0,0 +1,44 @@
+from datetime import time
+
+from services.schedule_occupancy import OccupancyIndex, StudentOccupancy, slot_mask
+
+
+def test_slot_mask_overlap_matches_interval_overlap():
+    morning = slot_mask("Monday", time(9), time(11))
+    late_morning = slot_mask("Monday", time(10), time(12))
+    after = slot_mask("Monday", time(11), time(13))
+    tuesday = slot_mask("Tuesday", time(9), time(11))
+
+    assert morning & late_morning
+    assert not morning & after
+    assert not morning & tuesday
+
+
+def test_occupancy_book_and_release():
+    index = OccupancyIndex()
+    mask = slot_mask("Friday", time(14), time(17))
+
+    assert index.is_free(1, mask)
+    index.book(1, mask)
+    assert not index.is_free(1, slot_mask("Friday", time(16), time(18)))
+    assert index.is_free(2, mask)
+
+    index.release(1, mask)
+    assert index.is_free(1, mask)
+
+
+def test_student_occupancy_counts_busy_roster_members():
+    students = StudentOccupancy()
+    students.book(0b0011, slot_mask("Monday", time(9), time(11)))
+    students.book(0b0100, slot_mask("Monday", time(14), time(16)))
+
+    roster = 0b0111
+    assert (
+        students.count_conflicts(roster, slot_mask("Monday", time(10), time(12))) == 2
+    )
+    assert (
+        students.count_conflicts(roster, slot_mask("Monday", time(15), time(17))) == 1
+    )
+    assert (
+        students.count_conflicts(roster, slot_mask("Monday", time(11), time(13))) == 0
+    )
@@ -0,0 +1,37 @@
+from services.schedule_report import RunReport
+from services.schedule_snapshot import ScheduleSnapshot
+from services.schedule_solver import ScheduleSolver
+
+SECTIONS = [
+    {"section_id": 1, "credits": 3, "professor_id": 10},
+    {"section_id": 2, "credits": 2, "professor_id": 11},
+]
+ENROLLMENTS = [
+    {"section_id": 1, "student_id": 100},
+    {"section_id": 2, "student_id": 100},
+    {"section_id": 2, "student_id": 101},
+]
+CLASSROOMS = [{"id": 1, "capacity": 1}]
+
+
+def test_solve_records_phases_counters_and_reasons():
+    solver = ScheduleSolver(ScheduleSnapshot(SECTIONS, ENROLLMENTS, CLASSROOMS))
+    report = RunReport()
+    solver.run_report = report
+
+    unscheduled = solver.solve("dsatur")
+
+    assert [entry["phase"] for entry in report.phases] == [
+        "scoring",
+        "ordering",
+        "placement",
+    ]
+    assert solver.counters["slots_tried"] > 0
+    assert [section["section_id"] for section in unscheduled] == [2]
+    assert solver.unscheduled_reason(unscheduled[0]) == "no_classroom"
+
+
+def test_report_is_truthy_only_on_success():
+    report = RunReport()
+    assert not report
+    assert report.finish(True)
@@ -0,0 +1,76 @@
+from benchmarks.synthetic_term import LocalDatabase
+from services.scheduling_manager import SchedulingManager
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+
+
+def two_section_term() -> LocalDatabase:
+    """Section 1 (5 students) stored in the big room on Monday 9-12, and
+    section 2 (20 students) whose professor is only free at that time."""
+    database = LocalDatabase()
+    conn = database.conn
+    conn.execute("INSERT INTO course VALUES (1, 'INF1', 'Curso', 3)")
+    conn.execute("INSERT INTO course_instance VALUES (1, 1, '01', 2025)")
+    conn.executemany("INSERT INTO section VALUES (?, 1, ?)", [(1, "1"), (2, "2")])
+    conn.executemany(
+        "INSERT INTO professor VALUES (?, ?, ?)",
+        [(1, "Ana", "ana@uni.cl"), (2, "Luis", "luis@uni.cl")],
+    )
+    conn.executemany(
+        "INSERT INTO professor_assignment (professor_id, course_instance_id, "
+        "section_id) VALUES (?, 1, ?)",
+        [(1, 1), (2, 2)],
+    )
+    conn.executemany(
+        "INSERT INTO student_assignment (student_id, course_instance_id, "
+        "section_id) VALUES (?, 1, ?)",
+        [(student, 1) for student in range(5)]
+        + [(student, 2) for student in range(100, 120)],
+    )
+    conn.executemany(
+        "INSERT INTO classroom VALUES (?, ?, ?)",
+        [(1, "Sala chica", 10), (2, "Sala grande", 30)],
+    )
+    conn.execute(
+        "INSERT INTO classroom_schedule (classroom_id, section_id, day_of_week, "
+        "start_time, end_time, year, semester) "
+        "VALUES (2, 1, 'Monday', '09:00:00', '12:00:00', 2025, '01')"
+    )
+    blocked = [("Monday", "14:00:00", "18:00:00")] + [
+        (day, start, end)
+        for day in WEEKDAYS[1:]
+        for start, end in (("09:00:00", "13:00:00"), ("14:00:00", "18:00:00"))
+    ]
+    conn.executemany(
+        "INSERT INTO professor_unavailability (professor_id, day_of_week, "
+        "start_time, end_time) VALUES (2, ?, ?, ?)",
+        blocked,
+    )
+    conn.commit()
+    return database
+
+
+def test_placing_a_section_leaves_the_stored_ones_in_their_rooms():
+    database = two_section_term()
+
+    result = SchedulingManager(database).place_section(2)
+
+    # Freeing the big room would move section 1, whose row is not rewritten
+    assert result == {"status": "ok", "moved": [2], "unscheduled": [2]}
+    assert database.conn.execute(
+        "SELECT section_id, classroom_id, day_of_week FROM classroom_schedule"
+    ).fetchall() == [(1, 2, "Monday")]
+
+
+def test_removing_a_section_deletes_only_its_row():
+    database = two_section_term()
+    database.conn.execute(
+        "INSERT INTO classroom_schedule (classroom_id, section_id, day_of_week, "
+        "start_time, end_time, year, semester) "
+        "VALUES (1, 2, 'Monday', '09:00:00', '12:00:00', 2025, '01')"
+    )
+
+    assert SchedulingManager(database).remove_section(1) == {"status": "ok"}
+    assert database.conn.execute(
+        "SELECT section_id FROM classroom_schedule"
+    ).fetchall() == [(2,)]
@@ -0,0 +1,34 @@
+from services.schedule_snapshot import ScheduleSnapshot
+
+SECTIONS = [
+    {"section_id": 1, "credits": 3, "professor_id": 10},
+    {"section_id": 2, "credits": 2, "professor_id": 11},
+    {"section_id": 3, "credits": 3, "professor_id": 10},
+]
+ENROLLMENTS = [
+    {"section_id": 1, "student_id": 100},
+    {"section_id": 1, "student_id": 101},
+    {"section_id": 2, "student_id": 100},
+    {"section_id": 2, "student_id": 101},
+    {"section_id": 3, "student_id": 101},
+]
+CLASSROOMS = [{"id": 1, "capacity": 30}]
+
+
+def test_snapshot_rosters_are_dense_bitsets():
+    snapshot = ScheduleSnapshot(SECTIONS, ENROLLMENTS, CLASSROOMS)
+
+    assert snapshot.get_students(1) == [100, 101]
+    assert snapshot.get_students(4) == []
+    assert snapshot.roster_masks[1] == 0b11
+    assert snapshot.roster_masks[3] == 0b10
+
+
+def test_overlap_matrix_counts_shared_students():
+    overlap = ScheduleSnapshot(SECTIONS, ENROLLMENTS, CLASSROOMS).overlap
+
+    assert overlap.weight(1, 2) == overlap.weight(2, 1) == 2
+    assert overlap.weight(1, 3) == 1
+    assert overlap.max_overlap(3) == 1
+    assert overlap.degree(1) == 2
+    assert overlap.neighbors(4) == {}
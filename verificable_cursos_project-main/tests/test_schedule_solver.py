@@ -0,0 +1,152 @@
+from datetime import time
+
+from services.schedule_occupancy import WEEK_CELLS, slot_mask
+from services.schedule_snapshot import ScheduleSnapshot
+from services.schedule_solver import ScheduleSolver
+
+
+def test_full_slot_frees_a_fitting_room_by_moving_a_smaller_section():
+    sections = [
+        {"section_id": 1, "credits": 3, "professor_id": 1},
+        {"section_id": 2, "credits": 3, "professor_id": 2},
+    ]
+    enrollments = [{"section_id": 1, "student_id": student} for student in range(5)]
+    enrollments += [
+        {"section_id": 2, "student_id": student} for student in range(100, 120)
+    ]
+    classrooms = [{"id": 1, "capacity": 10}, {"id": 2, "capacity": 30}]
+    solver = ScheduleSolver(ScheduleSnapshot(sections, enrollments, classrooms))
+    solver.solve("greedy")
+    monday = ("Monday", time(9), time(12))
+    solver.load_assignments(
+        {
+            1: {
+                "classroom_id": 2,
+                "professor_id": 1,
+                "day": monday[0],
+                "start_time": monday[1],
+                "end_time": monday[2],
+            }
+        }
+    )
+    # Section 2's professor is only free on Monday morning
+    solver.professor_occupancy.book(2, ~slot_mask(*monday) & ((1 << WEEK_CELLS) - 1))
+    section = next(
+        section for section in solver.prepare_sections() if section["section_id"] == 2
+    )
+
+    match = solver.find_slot_and_classroom(
+        section, solver.get_suitable_classrooms(2, 20)
+    )
+
+    assert match == (2, *monday)
+    assert solver.section_schedule[1]["classroom_id"] == 1
+    assert solver.counters["rooms_moved"] == 1
+    assert solver.wasted_seats == 10 - 5
+
+
+def test_full_slot_is_freed_along_a_longer_chain_of_moves():
+    sections = [
+        {"section_id": section_id, "credits": 3, "professor_id": section_id}
+        for section_id in (1, 2, 3)
+    ]
+    sizes = {1: 25, 2: 8, 3: 45}
+    enrollments = [
+        {"section_id": section_id, "student_id": section_id * 100 + student}
+        for section_id, size in sizes.items()
+        for student in range(size)
+    ]
+    classrooms = [
+        {"id": 10, "capacity": 10},
+        {"id": 30, "capacity": 30},
+        {"id": 50, "capacity": 50},
+    ]
+    solver = ScheduleSolver(ScheduleSnapshot(sections, enrollments, classrooms))
+    monday = ("Monday", time(9), time(12))
+    solver.load_assignments(
+        {
+            section_id: {
+                "classroom_id": classroom_id,
+                "professor_id": section_id,
+                "day": monday[0],
+                "start_time": monday[1],
+                "end_time": monday[2],
+            }
+            for section_id, classroom_id in ((1, 50), (2, 30))
+        }
+    )
+    # Only the 10-seat room is free, and only on Monday morning
+    solver.professor_occupancy.book(3, ~slot_mask(*monday) & ((1 << WEEK_CELLS) - 1))
+    section = next(
+        section for section in solver.prepare_sections() if section["section_id"] == 3
+    )
+
+    match = solver.find_slot_and_classroom(
+        section, solver.get_suitable_classrooms(3, 45)
+    )
+
+    assert match == (50, *monday)
+    assert solver.section_schedule[1]["classroom_id"] == 30
+    assert solver.section_schedule[2]["classroom_id"] == 10
+    assert solver.counters["rooms_moved"] == 2
+
+
+def test_unavailable_hours_are_never_booked():
+    sections = [
+        {"section_id": section_id, "credits": 2, "professor_id": 1}
+        for section_id in (1, 2)
+    ]
+    # Free on Tuesday afternoon only
+    unavailability = [
+        {
+            "professor_id": 1,
+            "day_of_week": day,
+            "start_time": "09:00",
+            "end_time": "18:00",
+        }
+        for day in ("Monday", "Wednesday", "Thursday", "Friday")
+    ]
+    unavailability.append(
+        {
+            "professor_id": 1,
+            "day_of_week": "Tuesday",
+            "start_time": "09:00",
+            "end_time": "13:00",
+        }
+    )
+    snapshot = ScheduleSnapshot(
+        sections, [], [{"id": 1, "capacity": 10}], unavailability=unavailability
+    )
+
+    for strategy in ScheduleSolver.STRATEGIES:
+        solver = ScheduleSolver(snapshot)
+        assert solver.solve(strategy) == []
+        assert {
+            (entry["day"], entry["start_time"].hour)
+            for entry in solver.section_schedule.values()
+        } == {("Tuesday", 14), ("Tuesday", 16)}
+
+
+def test_recovered_errors_are_counted_and_leave_the_section_unscheduled(
+    monkeypatch, caplog
+):
+    sections = [
+        {"section_id": section_id, "credits": 2, "professor_id": section_id}
+        for section_id in (1, 2)
+    ]
+    solver = ScheduleSolver(ScheduleSnapshot(sections, [], [{"id": 1, "capacity": 10}]))
+    place = solver.find_slot_and_classroom
+
+    def failing_place(section, classrooms):
+        if section["section_id"] == 2:
+            raise RuntimeError("broken section")
+        return place(section, classrooms)
+
+    monkeypatch.setattr(solver, "find_slot_and_classroom", failing_place)
+
+    unscheduled = solver.solve("greedy")
+
+    assert [section["section_id"] for section in unscheduled] == [2]
+    assert list(solver.section_schedule) == [1]
+    assert solver.counters["errors"] == 1
+    assert "Error placing section 2" in caplog.text
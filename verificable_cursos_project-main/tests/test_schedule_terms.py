@@ -0,0 +1,99 @@
+from benchmarks.synthetic_term import TermSpec, generate_term
+from services.schedule_term import solve_terms
+from services.scheduling_manager import SchedulingManager
+
+SPEC = TermSpec(sections=80, students=400, students_per_section=10, rooms=10, terms=2)
+
+
+def stored_terms(database) -> dict[tuple, int]:
+    rows = database.conn.execute(
+        "SELECT year, semester, COUNT(*) FROM classroom_schedule GROUP BY year, semester"
+    ).fetchall()
+    return {(year, semester): count for year, semester, count in rows}
+
+
+def test_term_run_reads_and_replaces_only_its_term():
+    database = generate_term(SPEC)
+    assert SchedulingManager(database).generate_schedule(strategy="dsatur")
+    assert stored_terms(database) == {(2025, "01"): 40, (2025, "02"): 40}
+    other = SchedulingManager(database).stored_assignments((2025, "02"))
+
+    manager = SchedulingManager(database)
+    report = manager.generate_schedule(strategy="greedy", term=(2025, "01"))
+
+    assert report
+    assert report.counters["sections"] == 40
+    assert set(manager.snapshot.terms.values()) == {(2025, "01")}
+    assert set(manager.snapshot.sections_by_student) <= {
+        row[0]
+        for row in database.conn.execute(
+            "SELECT student_id FROM student_assignment WHERE section_id <= 40"
+        )
+    }
+    assert stored_terms(database) == {(2025, "01"): 40, (2025, "02"): 40}
+    assert manager.stored_assignments((2025, "02")) == other
+
+
+def test_rows_follow_a_section_into_its_new_term():
+    database = generate_term(SPEC)
+    assert SchedulingManager(database).generate_schedule(strategy="dsatur")
+    database.conn.execute(
+        "UPDATE course_instance SET semester = '02' "
+        "WHERE id = (SELECT course_instance_id FROM section WHERE id = 1)"
+    )
+    moved = {
+        row[0]
+        for row in database.conn.execute(
+            "SELECT id FROM section WHERE course_instance_id = "
+            "(SELECT course_instance_id FROM section WHERE id = 1)"
+        )
+    }
+    first = {
+        section_id: entry
+        for section_id, entry in SchedulingManager(database)
+        .stored_assignments((2025, "01"))
+        .items()
+        if section_id not in moved
+    }
+
+    manager = SchedulingManager(database)
+    assert manager.generate_schedule(term=(2025, "02"), warm_start=True)
+
+    assert manager.stored_assignments((2025, "01")) == first
+    assert moved <= set(manager.stored_assignments((2025, "02")))
+
+
+def test_terms_are_solved_apart_in_a_process_pool(monkeypatch):
+    monkeypatch.setattr("services.schedule_term.PARALLEL_MIN_SECTIONS", 0)
+    database = generate_term(SPEC)
+    snapshot = SchedulingManager(database).load_snapshot()
+    snapshots = {
+        term: snapshot.subset(section_ids)
+        for term, section_ids in snapshot.sections_by_term().items()
+    }
+
+    sequential = solve_terms(snapshots, "dsatur", workers=1)
+    pooled = solve_terms(snapshots, "dsatur", workers=2)
+
+    assert list(sequential) == [(2025, "02"), (2025, "01")]
+    for term, result in sequential.items():
+        assert result["success"]
+        assert result["assignments"] == pooled[term]["assignments"]
+
+
+def test_pooled_terms_do_not_start_pools_of_their_own(monkeypatch):
+    def nested_pool(*args, **kwargs):
+        raise AssertionError("pool started inside a term worker")
+
+    monkeypatch.setattr("services.schedule_term.PARALLEL_MIN_SECTIONS", 0)
+    # Forked term workers inherit the patched modules
+    monkeypatch.setattr("services.schedule_multistart.ProcessPoolExecutor", nested_pool)
+    snapshot = SchedulingManager(generate_term(SPEC)).load_snapshot()
+    snapshots = {
+        term: snapshot.subset(section_ids)
+        for term, section_ids in snapshot.sections_by_term().items()
+    }
+
+    results = solve_terms(snapshots, "dsatur", runs=2, workers=2)
+
+    assert all(result["success"] for result in results.values())
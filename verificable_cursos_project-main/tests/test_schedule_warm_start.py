@@ -0,0 +1,32 @@
+from benchmarks.synthetic_term import TermSpec, generate_term
+from services.classroom_catalog import classroom_catalogs
+from services.scheduling_manager import SchedulingManager
+
+
+def test_warm_start_keeps_valid_placements_and_writes_the_difference():
+    database = generate_term(
+        TermSpec(sections=40, students=200, students_per_section=10, rooms=10)
+    )
+    assert SchedulingManager(database).generate_schedule(strategy="dsatur")
+    before = SchedulingManager(database).stored_assignments()
+
+    database.conn.execute("DELETE FROM classroom WHERE id = 1")
+    database.conn.commit()
+    classroom_catalogs.invalidate()
+    manager = SchedulingManager(database)
+    queries = database.queries
+    report = manager.generate_schedule(strategy="dsatur", warm_start=True)
+
+    after = manager.stored_assignments()
+    persist = next(phase for phase in report.phases if phase["phase"] == "persist")
+    lost = {
+        section_id for section_id, entry in before.items() if entry["classroom_id"] == 1
+    }
+    assert report
+    assert report.counters["kept"] == len(before) - len(lost)
+    assert persist["updated"] == len(lost)
+    assert persist["inserted"] == persist["deleted"] == 0
+    assert all(
+        after[section_id] == before[section_id] for section_id in before.keys() - lost
+    )
+    assert database.queries - queries < 15
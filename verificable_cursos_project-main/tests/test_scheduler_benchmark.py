@@ -0,0 +1,21 @@
+from benchmarks.scheduler_benchmark import run_benchmark
+from benchmarks.synthetic_term import TermSpec
+
+
+def test_benchmark_reports_every_phase_against_local_database():
+    spec = TermSpec(sections=30, students=150, students_per_section=10, rooms=8)
+    report = run_benchmark(spec, strategy="dsatur")
+
+    phases = {phase["phase"]: phase for phase in report["phases"]}
+    assert list(phases) == [
+        "load",
+        "feasibility",
+        "prepare",
+        "ordering",
+        "placement",
+        "persist",
+        "export",
+    ]
+    assert phases["load"]["queries"] == 4
+    assert phases["placement"]["queries"] == 0
+    assert phases["persist"]["placed"] == phases["placement"]["placed"] > 0